@@ -0,0 +1,269 @@
+import json
+import os
+import sqlite3
+import warnings
+from typing import Dict, List, Optional
+
+import scipy.stats as stats
+from extra_ds_tools.decorators.stats import (
+    FunctionStats,
+    StatsRegistry,
+    default_registry,
+)
+
+# file extensions of baselines stored in a SQLite database, others are JSON
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+# the metrics a baseline can be compared on
+METRICS = ("mean", "p50", "p95", "p99")
+
+
+class PerformanceRegressionWarning(UserWarning):
+    """Warns that functions got slower than their baseline."""
+
+
+class PerformanceRegressionError(RuntimeError):
+    """Raised when functions got slower than their baseline."""
+
+
+def save_baseline(path: str, registry: Optional[StatsRegistry] = None) -> None:
+    """Saves the latency statistics of functions as a baseline for later runs.
+
+    The statistics of every function with timed calls replace those in the
+    baseline, the baseline of other functions is kept. Functions decorated by
+    :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`
+    with ``size_param`` also have statistics per input-size bucket.
+
+    Parameters
+    ----------
+    path : str
+        A JSON file or, with an extension in :data:`SQLITE_EXTENSIONS`, a SQLite
+        database, created if it doesn't exist.
+    registry : Optional[StatsRegistry], optional
+        The statistics to save, by default those of timeit_arg_info_dec
+
+    Examples
+    --------
+    >>> @timeit_arg_info_dec(print_output=False, param_info=False)
+    >>> def nightly_job():
+    >>>     ...
+    >>>
+    >>> nightly_job()
+    >>> save_baseline('baseline.json')
+
+    See Also
+    --------
+    Used by:
+    :func:`compare_to_baseline`
+    """  # noqa
+    registry = registry if registry is not None else default_registry
+    baseline = {
+        name: registry.get(name).to_dict()
+        for name, summary in registry.snapshot().items()
+        if summary["sampled"]
+    }
+    if path.endswith(SQLITE_EXTENSIONS):
+        with sqlite3.connect(path) as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS baselines "
+                "(function TEXT PRIMARY KEY, stats TEXT NOT NULL)"
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO baselines VALUES (?, ?)",
+                [(name, json.dumps(data)) for name, data in baseline.items()],
+            )
+        connection.close()
+        return
+    data = {}
+    if os.path.exists(path):
+        with open(path) as file:
+            data = json.load(file)
+    data.update(baseline)
+    with open(path, "w") as file:
+        json.dump(data, file, indent=1)
+
+
+def load_baseline(path: str) -> Dict[str, FunctionStats]:
+    """Loads a baseline saved by :func:`save_baseline`.
+
+    Parameters
+    ----------
+    path : str
+        The JSON file or SQLite database of the baseline.
+
+    Returns
+    -------
+    Dict[str, FunctionStats]
+        Per function name its statistics in the baseline.
+    """
+    if path.endswith(SQLITE_EXTENSIONS):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        with sqlite3.connect(path) as connection:
+            rows = connection.execute(
+                "SELECT function, stats FROM baselines"
+            ).fetchall()
+        connection.close()
+        data = {name: json.loads(item) for name, item in rows}
+    else:
+        with open(path) as file:
+            data = json.load(file)
+    return {name: FunctionStats.from_dict(item) for name, item in data.items()}
+
+
+def compare_to_baseline(
+    path: str,
+    metric: str = "mean",
+    tolerance: float = 0.1,
+    alpha: float = 0.01,
+    min_calls: int = 10,
+    on_regression: str = "warn",
+    registry: Optional[StatsRegistry] = None,
+) -> List[dict]:
+    """Compares the latency of functions to their baseline and warns or \
+        fails when they regressed.
+
+    A function regressed when its metric is more than ``tolerance`` slower than
+    in the baseline. For the mean the slowdown must also be statistically
+    significant according to a one-sided Welch's t-test at level ``alpha``.
+    Percentiles are compared on the latency histograms, without a test.
+
+    Parameters
+    ----------
+    path : str
+        The JSON file or SQLite database of the baseline.
+    metric : str, optional
+        One of :data:`METRICS`, by default "mean"
+    tolerance : float, optional
+        The allowed relative slowdown, by default 0.1
+    alpha : float, optional
+        The significance level of the test of the mean, by default 0.01
+    min_calls : int, optional
+        Functions with fewer timed calls, now or in the baseline, aren't
+        compared, by default 10
+    on_regression : str, optional
+        "warn" to warn with a :class:`PerformanceRegressionWarning`, "raise"
+        to raise a :class:`PerformanceRegressionError` or "ignore", by default
+        "warn"
+    registry : Optional[StatsRegistry], optional
+        The current statistics, by default those of timeit_arg_info_dec
+
+    Returns
+    -------
+    List[dict]
+        The regressions, with the function, metric, baseline and current value
+        in seconds, their ratio and the p-value of the test of the mean.
+
+    Raises
+    ------
+    ValueError
+        If the metric or on_regression is unknown.
+    PerformanceRegressionError
+        If on_regression is "raise" and a function regressed.
+
+    Examples
+    --------
+    >>> nightly_job()
+    >>> compare_to_baseline('baseline.json', tolerance=0.2, on_regression='raise')
+    PerformanceRegressionError: 1 function(s) regressed:
+    __main__.nightly_job: mean 2.41 s vs 1.83 s in the baseline (x1.32, p=1.2e-09)
+    """  # noqa
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {METRICS}, got {metric!r}")
+    if on_regression not in ("warn", "raise", "ignore"):
+        raise ValueError(
+            "on_regression must be 'warn', 'raise' or 'ignore', "
+            f"got {on_regression!r}"
+        )
+    registry = registry if registry is not None else default_registry
+    baseline = load_baseline(path)
+    regressions = []
+    for name in registry.snapshot():
+        if name not in baseline:
+            continue
+        regression = _compare(
+            registry.get(name),
+            baseline[name],
+            metric,
+            tolerance,
+            alpha,
+            min_calls,
+        )
+        if regression is not None:
+            regressions.append(regression)
+
+    if regressions and on_regression != "ignore":
+        message = f"{len(regressions)} function(s) regressed:\n" + "\n".join(
+            _describe(regression) for regression in regressions
+        )
+        if on_regression == "raise":
+            raise PerformanceRegressionError(message)
+        warnings.warn(message, PerformanceRegressionWarning, stacklevel=2)
+    return regressions
+
+
+def _compare(
+    current: FunctionStats,
+    baseline: FunctionStats,
+    metric: str,
+    tolerance: float,
+    alpha: float,
+    min_calls: int,
+) -> Optional[dict]:
+    """Returns the regression of a function, None if it didn't regress."""
+    if min(current.sampled_calls, baseline.sampled_calls) < min_calls:
+        return None
+    p_value = None
+    if metric == "mean":
+        current_ns = current.total_ns / current.sampled_calls
+        baseline_ns = baseline.total_ns / baseline.sampled_calls
+    else:
+        percentile = float(metric[1:])
+        current_ns = current.percentile_ns(percentile)
+        baseline_ns = baseline.percentile_ns(percentile)
+    if current_ns <= baseline_ns * (1 + tolerance):
+        return None
+    if metric == "mean":
+        p_value = _welch_p_value(current, baseline)
+        if p_value >= alpha:
+            return None
+    return {
+        "function": current.name,
+        "metric": metric,
+        "baseline_s": baseline_ns / 1e9,
+        "current_s": current_ns / 1e9,
+        "ratio": current_ns / baseline_ns if baseline_ns else float("inf"),
+        "p_value": p_value,
+    }
+
+
+def _welch_p_value(current: FunctionStats, baseline: FunctionStats) -> float:
+    """Returns the p-value of a one-sided Welch's t-test that the current \
+        mean duration is higher than in the baseline."""
+    current_std, baseline_std = current.std_ns(), baseline.std_ns()
+    if current_std == 0 and baseline_std == 0:
+        # without variation any slowdown is significant
+        return 0.0
+    result = stats.ttest_ind_from_stats(
+        current.total_ns / current.sampled_calls,
+        current_std,
+        current.sampled_calls,
+        baseline.total_ns / baseline.sampled_calls,
+        baseline_std,
+        baseline.sampled_calls,
+        equal_var=False,
+        alternative="greater",
+    )
+    return float(result.pvalue)
+
+
+def _describe(regression: dict) -> str:
+    """Returns a regression as a line of text."""
+    description = (
+        f"{regression['function']}: {regression['metric']} "
+        f"{regression['current_s']:.3g} s vs {regression['baseline_s']:.3g} s "
+        f"in the baseline (x{regression['ratio']:.2f}"
+    )
+    if regression["p_value"] is not None:
+        description += f", p={regression['p_value']:.2g}"
+    return description + ")"
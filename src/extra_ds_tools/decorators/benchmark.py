@@ -0,0 +1,258 @@
+import gc
+import inspect
+from functools import partial
+from time import perf_counter_ns
+from types import MethodType
+from typing import Any, Callable, Optional, Tuple
+
+import numpy as np
+from extra_ds_tools.decorators.report import CallReport
+from extra_ds_tools.format import ArgBinder
+
+# the number of timed runs when neither repeats nor time_budget is given
+DEFAULT_REPEATS = 10
+
+
+def benchmark(
+    func: Callable,
+    *args,
+    warmup: int = 3,
+    repeats: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    disable_gc: bool = False,
+    confidence: float = 0.95,
+    n_resamples: int = 1000,
+    print_output: bool = True,
+    **kwargs,
+) -> dict:
+    """Runs a function repeatedly and prints the distribution of its \
+        runtime with bootstrap confidence intervals, and information on its \
+            parameters and arguments.
+
+    The function first runs ``warmup`` times untimed, e.g. to fill caches,
+    and then runs ``repeats`` times, or until ``time_budget`` seconds of
+    runtime are spent, whichever comes first. A function decorated by
+    :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec` is
+    benchmarked without that decorator, but with any other, e.g.
+    :func:`functools.lru_cache`. The options of benchmark can't be
+    passed on as keyword arguments of the function, but a
+    :func:`functools.partial` of the function with its arguments can be
+    benchmarked instead, and is reported as a call of the function. Functions
+    without a signature, like some builtins, are reported without argument
+    table.
+
+    Parameters
+    ----------
+    func : Callable
+        The function to benchmark.
+    *args
+        The positional arguments of every call.
+    warmup : int, optional
+        The number of untimed runs, by default 3
+    repeats : Optional[int], optional
+        The maximum number of timed runs, by default :data:`DEFAULT_REPEATS`
+        if time_budget isn't set and unlimited otherwise
+    time_budget : Optional[float], optional
+        If set runs are repeated until their total runtime is at least this
+        many seconds, by default None
+    disable_gc : bool, optional
+        If True the garbage collector is disabled during the timed runs, after
+        a collection, by default False
+    confidence : float, optional
+        The confidence level of the intervals, by default 0.95
+    n_resamples : int, optional
+        The number of bootstrap resamples, by default 1000
+    print_output : bool, optional
+        If True prints the output of the last run, by default True
+    **kwargs
+        The keyword arguments of every call.
+
+    Returns
+    -------
+    dict
+        The number of timed runs, the minimum, median, mean and standard
+        deviation in seconds, the confidence intervals of the median and the
+        mean, the runtime of every timed run and the output of the last run.
+
+    Raises
+    ------
+    ValueError
+        If warmup < 0, repeats < 1, time_budget <= 0, confidence isn't in
+        (0, 1) or n_resamples < 1.
+
+    Examples
+    --------
+    >>> def multiply_text(text: str, n: int = 1):
+    >>>     return text * n
+    >>>
+    >>> results = benchmark(multiply_text, 'hello', n=2, repeats=1000, print_output=False)
+    multiply_text()
+    -----------------------------------------------------------------------------
+        param    type_hint    default_value    arg_type    arg_value    arg_len
+    --  -------  -----------  ---------------  ----------  -----------  ---------
+     0  text     str                           str         hello        5
+     1  n        int          1                int         2
+
+    multiply_text() took 1.68e-07 seconds to run.
+    runs: 1000 (3 warmup)
+    min: 1.5e-07 seconds
+    median: 1.68e-07 seconds (95% CI 1.67e-07 - 1.7e-07)
+    mean: 2.01e-07 seconds (95% CI 1.84e-07 - 2.33e-07)
+    std: 2.96e-07 seconds
+    -----------------------------------------------------------------------------
+
+    See Also
+    --------
+    Uses:
+    :class:`~extra_ds_tools.format.ArgBinder`
+    :class:`~extra_ds_tools.decorators.report.CallReport`
+    """  # noqa
+    _check_options(warmup, repeats, time_budget, confidence, n_resamples)
+    if repeats is None and time_budget is None:
+        repeats = DEFAULT_REPEATS
+    func = _undecorated(func)
+    # a partial is reported as a call of its function with all its arguments
+    target, all_args, all_kwargs = func, args, kwargs
+    if isinstance(func, partial):
+        target = _undecorated(func.func)
+        all_args, all_kwargs = (*func.args, *args), {**func.keywords, **kwargs}
+        func = partial(target, *func.args, **func.keywords)
+    # callable objects have no name, which is resolved before any run
+    name = getattr(target, "__name__", repr(target))
+    # the arguments are captured before the first run may mutate them, with
+    # the signature of the innermost function, as decorators like
+    # lru_cache have none
+    try:
+        records = ArgBinder(inspect.unwrap(target))(*all_args, **all_kwargs)
+    except ValueError:
+        # functions without a signature, e.g. some builtins, have no table
+        records = None
+
+    for _ in range(warmup):
+        func(*args, **kwargs)
+    times_ns, result = _timed_runs(
+        func, args, kwargs, repeats, time_budget, disable_gc
+    )
+
+    times = np.array(times_ns) / 1e9
+    median_ci = _bootstrap_ci(times, np.median, confidence, n_resamples)
+    mean_ci = _bootstrap_ci(times, np.mean, confidence, n_resamples)
+    results = {
+        "runs": len(times),
+        "min_s": float(times.min()),
+        "median_s": float(np.median(times)),
+        "mean_s": float(times.mean()),
+        "std_s": float(times.std(ddof=1)) if len(times) > 1 else 0.0,
+        "median_ci_s": median_ci,
+        "mean_ci_s": mean_ci,
+        "times_s": times.tolist(),
+        "result": result,
+    }
+    level = f"{confidence:.0%} CI"
+    details = {
+        "runs": f"{results['runs']} ({warmup} warmup)",
+        "min": f"{results['min_s']:.3g} seconds",
+        "median": f"{results['median_s']:.3g} seconds "
+        f"({level} {median_ci[0]:.3g} - {median_ci[1]:.3g})",
+        "mean": f"{results['mean_s']:.3g} seconds "
+        f"({level} {mean_ci[0]:.3g} - {mean_ci[1]:.3g})",
+        "std": f"{results['std_s']:.3g} seconds",
+    }
+    print(
+        CallReport(
+            name,
+            records,
+            results["median_s"],
+            result,
+            print_output,
+            details,
+        )
+    )
+    return results
+
+
+def _undecorated(func: Callable) -> Callable:
+    """Returns a function without the decorator of \
+        :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec` \
+            but with any other decorator, e.g. a cache."""  # noqa
+    # imported here, as func_decorators imports this module through capture
+    from extra_ds_tools.decorators.func_decorators import _TimedFunction
+
+    if isinstance(func, MethodType) and isinstance(
+        func.__func__, _TimedFunction
+    ):
+        return MethodType(_undecorated(func.__func__), func.__self__)
+    while isinstance(func, _TimedFunction):
+        func = func.__wrapped__
+    return func
+
+
+def _check_options(
+    warmup: int,
+    repeats: Optional[int],
+    time_budget: Optional[float],
+    confidence: float,
+    n_resamples: int,
+) -> None:
+    """Raises a ValueError for invalid options of :func:`benchmark`."""
+    if warmup < 0:
+        raise ValueError(f"warmup must be >= 0, got {warmup}")
+    if repeats is not None and repeats < 1:
+        raise ValueError(f"repeats must be >= 1, got {repeats}")
+    if time_budget is not None and time_budget <= 0:
+        raise ValueError(f"time_budget must be > 0, got {time_budget}")
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be in (0, 1), got {confidence}")
+    if n_resamples < 1:
+        raise ValueError(f"n_resamples must be >= 1, got {n_resamples}")
+
+
+def _timed_runs(
+    func: Callable,
+    args: tuple,
+    kwargs: dict,
+    repeats: Optional[int],
+    time_budget: Optional[float],
+    disable_gc: bool,
+) -> Tuple[list, Any]:
+    """Times runs of a function until the repeats or time budget are spent \
+        and returns their runtimes in nanoseconds and the last output."""
+    budget_ns = time_budget * 1e9 if time_budget is not None else None
+    gc_was_enabled = gc.isenabled()
+    if disable_gc:
+        gc.collect()
+        gc.disable()
+    times_ns: list = []
+    total_ns = 0
+    try:
+        while True:
+            start_time = perf_counter_ns()
+            result = func(*args, **kwargs)
+            duration_ns = perf_counter_ns() - start_time
+            times_ns.append(duration_ns)
+            total_ns += duration_ns
+            if repeats is not None and len(times_ns) >= repeats:
+                break
+            if budget_ns is not None and total_ns >= budget_ns:
+                break
+    finally:
+        if disable_gc and gc_was_enabled:
+            gc.enable()
+    return times_ns, result
+
+
+def _bootstrap_ci(
+    times: np.ndarray,
+    statistic: Callable,
+    confidence: float,
+    n_resamples: int,
+) -> Tuple[float, float]:
+    """Returns the bootstrap percentile confidence interval of a statistic \
+        of the runtimes."""
+    rng = np.random.default_rng(0)
+    estimates = np.empty(n_resamples)
+    for index in range(n_resamples):
+        estimates[index] = statistic(rng.choice(times, size=len(times)))
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(estimates, [tail, 100 - tail])
+    return float(low), float(high)
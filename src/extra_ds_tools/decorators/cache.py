@@ -0,0 +1,434 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from extra_ds_tools.format import memory_footprint
+
+
+def content_hash(*values: Any) -> str:
+    """Returns a fingerprint of the content of values, so equal values \
+        have the same fingerprint, also in another process.
+
+    NumPy arrays are hashed from their buffer, without copying when they're
+    contiguous in C or Fortran order. pandas objects are hashed per block of
+    columns with the same dtype, including their index, column names and
+    dtypes, and categoricals with their categories. Arrays and indexes of
+    objects other than strings are hashed per element. Lists, tuples,
+    dictionaries and sets are hashed per item, sets regardless of their
+    order, and other values are pickled. Equal arrays in C and Fortran order
+    and equal frames with their columns in different blocks, e.g. after
+    adding columns, can have different fingerprints.
+
+    Parameters
+    ----------
+    *values
+        The values to fingerprint.
+
+    Returns
+    -------
+    str
+        A 32 character hexadecimal BLAKE2 digest.
+
+    Raises
+    ------
+    TypeError
+        If a value can't be pickled.
+
+    Examples
+    --------
+    >>> frame = pd.DataFrame({'a': [1, 2], 'b': [0.5, 1.5]})
+    >>> content_hash(frame) == content_hash(frame.copy())
+    True
+    >>> content_hash(frame) == content_hash(frame.set_index('a'))
+    False
+
+    See Also
+    --------
+    Used by:
+    :func:`~extra_ds_tools.decorators.func_decorators.memoize_dec`
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    for value in values:
+        _update(hasher, value)
+    return hasher.hexdigest()
+
+
+def _update(hasher: Any, value: Any) -> None:
+    """Adds the type and content of a value to a hash."""
+    hasher.update(type(value).__qualname__.encode())
+    if isinstance(value, np.ndarray):
+        _update_array(hasher, value)
+    elif isinstance(value, pd.DataFrame):
+        _update_frame(hasher, value)
+    elif isinstance(value, pd.Series):
+        _update_index(hasher, value.index)
+        hasher.update(repr((value.name, str(value.dtype))).encode())
+        _update_array(hasher, value.array)
+    elif isinstance(value, pd.Index):
+        _update_index(hasher, value)
+    elif isinstance(value, (list, tuple, dict, set, frozenset)):
+        _update_items(hasher, value)
+    else:
+        try:
+            hasher.update(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        except (pickle.PicklingError, AttributeError) as error:
+            raise TypeError(f"Can't fingerprint {value!r}: {error}") from None
+
+
+def _update_items(
+    hasher: Any, value: Union[list, tuple, dict, set, frozenset]
+) -> None:
+    """Adds the number of items and every item of a container to a hash."""
+    hasher.update(str(len(value)).encode())
+    if isinstance(value, (set, frozenset)):
+        # the order of a set depends on the hash seed of the process
+        for digest in sorted(content_hash(item) for item in value):
+            hasher.update(digest.encode())
+        return
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _update(hasher, key)
+            _update(hasher, item)
+        return
+    for item in value:
+        _update(hasher, item)
+
+
+def _update_array(hasher: Any, values: Any) -> None:
+    """Adds the dtype, shape and values of an array or pandas extension \
+        array to a hash."""
+    hasher.update(repr((str(values.dtype), values.shape)).encode())
+    if isinstance(values, pd.Categorical):
+        # the codes are positions in the categories
+        _update_index(hasher, values.categories)
+        hasher.update(repr(values.ordered).encode())
+    # the NumPy array of pandas' arrays like PandasArray and DatetimeArray,
+    # and the codes of a Categorical
+    values = getattr(values, "_ndarray", values)
+    if isinstance(values, np.ndarray) and not values.dtype.hasobject:
+        if values.flags.f_contiguous and not values.flags.c_contiguous:
+            # hashed in Fortran order, e.g. the blocks of a frame created
+            # from a 2-D array, as the C order would be a copy
+            hasher.update(b"F")
+            values = values.T
+        hasher.update(np.ascontiguousarray(values).view(np.uint8))
+        return
+    if isinstance(values, np.ndarray):
+        _update_objects(hasher, values.ravel(order="K"))
+        return
+    # extension arrays are hashed per element by pandas
+    hasher.update(pd.util.hash_array(values))
+
+
+def _update_objects(hasher: Any, values: np.ndarray) -> None:
+    """Adds the elements of a 1-D object array to a hash."""
+    if pd.api.types.infer_dtype(values, skipna=False) == "string":
+        # pandas hashes strings by their content, but other objects by their
+        # string, e.g. 1 like '1', and lists not at all
+        hasher.update(pd.util.hash_array(values))
+        return
+    for value in values:
+        _update(hasher, value)
+
+
+def _update_frame(hasher: Any, frame: pd.DataFrame) -> None:
+    """Adds the index, columns and blocks of a DataFrame to a hash."""
+    _update_index(hasher, frame.index)
+    _update_index(hasher, frame.columns)
+    blocks = getattr(frame._mgr, "blocks", None)
+    if blocks is None:
+        # not a BlockManager, e.g. pandas' ArrayManager
+        for position in range(frame.shape[1]):
+            _update_array(hasher, frame.iloc[:, position].array)
+        return
+    for block in blocks:
+        hasher.update(block.mgr_locs.as_array.tobytes())
+        _update_array(hasher, block.values)
+
+
+def _update_index(hasher: Any, index: pd.Index) -> None:
+    """Adds the names, dtype and labels of an index to a hash."""
+    hasher.update(repr((index.names, str(index.dtype))).encode())
+    if isinstance(index, pd.RangeIndex):
+        hasher.update(repr((index.start, index.stop, index.step)).encode())
+        return
+    if index.dtype == object:
+        _update_objects(hasher, index.to_numpy())
+        return
+    hasher.update(pd.util.hash_pandas_object(index).to_numpy())
+
+
+def deep_memory_footprint(value: Any, _seen: Optional[Set[int]] = None) -> int:
+    """Returns the memory footprint of a value in bytes, including the \
+        items of lists, tuples, dictionaries and sets.
+
+    Items are counted once, also when they occur more than once, e.g. the
+    same array in two tuples.
+
+    Parameters
+    ----------
+    value : Any
+        Any value.
+
+    Returns
+    -------
+    int
+        The :func:`~extra_ds_tools.format.memory_footprint` of the value and
+        of its items.
+
+    Examples
+    --------
+    >>> X = np.zeros((1000, 10))
+    >>> deep_memory_footprint((X, X[:500]))
+    120056
+
+    See Also
+    --------
+    Used by:
+    :func:`~extra_ds_tools.decorators.func_decorators.memoize_dec`
+    """
+    seen = _seen if _seen is not None else set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    nbytes = memory_footprint(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            nbytes += deep_memory_footprint(key, seen)
+            nbytes += deep_memory_footprint(item, seen)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            nbytes += deep_memory_footprint(item, seen)
+    return nbytes
+
+
+class MemoryCache:
+    """A thread-safe least recently used cache that keeps values up to a \
+        total number of bytes.
+
+    Parameters
+    ----------
+    max_bytes : int
+        The maximum total memory footprint of the kept values.
+
+    Raises
+    ------
+    ValueError
+        If max_bytes < 0.
+
+    Examples
+    --------
+    >>> cache = MemoryCache(max_bytes=16_000)
+    >>> cache.put('a', np.zeros(1000), 8000)
+    >>> cache.put('b', np.ones(1000), 8000)
+    >>> cache.lookup('a')[0]
+    True
+    >>> cache.put('c', np.ones(1000), 8000)
+    >>> cache.lookup('b')
+    (False, None)
+
+    See Also
+    --------
+    Used by:
+    :func:`~extra_ds_tools.decorators.func_decorators.memoize_dec`
+    """
+
+    def __init__(self, max_bytes: int):
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes must be >= 0, got {max_bytes}")
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        # key -> (value, number of bytes), least recently used first
+        self._items: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def lookup(self, key: str) -> Tuple[bool, Any]:
+        """Returns whether a key is kept and its value.
+
+        Parameters
+        ----------
+        key : str
+            The key of the value.
+
+        Returns
+        -------
+        Tuple[bool, Any]
+            True and the value if the key is kept, else False and None.
+        """
+        with self._lock:
+            try:
+                value, _ = self._items[key]
+            except KeyError:
+                return False, None
+            self._items.move_to_end(key)
+        return True, value
+
+    def put(self, key: str, value: Any, nbytes: int) -> None:
+        """Keeps a value, forgetting the least recently used values when the \
+            total number of bytes exceeds the maximum.
+
+        A value larger than the maximum isn't kept.
+
+        Parameters
+        ----------
+        key : str
+            The key of the value.
+        value : Any
+            The value to keep.
+        nbytes : int
+            The memory footprint of the value.
+        """
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._items:
+                self.nbytes -= self._items.pop(key)[1]
+            self._items[key] = (value, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted_nbytes) = self._items.popitem(last=False)
+                self.nbytes -= evicted_nbytes
+
+    def clear(self) -> None:
+        """Forgets all kept values."""
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+
+class DiskCache:
+    """A least recently used cache of pickled values in a directory, which \
+        keeps files up to a total number of bytes.
+
+    The modification time of a file is its last use, so the directory can be
+    shared by processes and kept between runs.
+
+    Parameters
+    ----------
+    directory : str
+        The directory of the files, created if it doesn't exist.
+    max_bytes : int
+        The maximum total size of the files.
+
+    Raises
+    ------
+    ValueError
+        If max_bytes < 0.
+
+    See Also
+    --------
+    Used by:
+    :func:`~extra_ds_tools.decorators.func_decorators.memoize_dec`
+    """
+
+    SUFFIX = ".pkl"
+
+    def __init__(self, directory: str, max_bytes: int):
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes must be >= 0, got {max_bytes}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def lookup(self, key: str) -> Tuple[bool, Any]:
+        """Returns whether a key is stored and its value.
+
+        Parameters
+        ----------
+        key : str
+            The key of the value.
+
+        Returns
+        -------
+        Tuple[bool, Any]
+            True and the value if the key is stored, else False and None.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                value = pickle.load(file)
+        except FileNotFoundError:
+            return False, None
+        except (EOFError, pickle.UnpicklingError):
+            # a file that was evicted while it was read
+            return False, None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return True, value
+
+    def put(self, key: str, value: Any) -> None:
+        """Stores a value, deleting the least recently used files when the \
+            total size exceeds the maximum.
+
+        Parameters
+        ----------
+        key : str
+            The key of the value.
+        value : Any
+            The value to store.
+
+        Raises
+        ------
+        TypeError
+            If the value can't be pickled.
+        """
+        try:
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, AttributeError) as error:
+            raise TypeError(f"Can't pickle {value!r}: {error}") from None
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        # written under another name first, so files are read complete
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(data)
+        os.replace(temporary_path, path)
+        self._evict()
+
+    def clear(self) -> None:
+        """Deletes all stored files."""
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.SUFFIX):
+                _remove(entry.path)
+
+    def _path(self, key: str) -> str:
+        """Returns the path of the file of a key."""
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def _evict(self) -> None:
+        """Deletes the least recently used files until the total size is at \
+            most the maximum."""
+        files = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(self.SUFFIX):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+        total_bytes = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total_bytes <= self.max_bytes:
+                break
+            _remove(path)
+            total_bytes -= size
+
+
+def _remove(path: str) -> None:
+    """Deletes a file, unless another process deleted it first."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,327 @@
+import importlib
+import json
+import logging
+import os
+import pickle
+import re
+import shutil
+import threading
+from functools import partial
+from time import time, time_ns
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from extra_ds_tools.decorators.benchmark import benchmark
+from extra_ds_tools.decorators.report import render_table
+from extra_ds_tools.format import ArgBinder
+
+# the file of a capture with the function, its arguments and their files
+CALL_FILE = "call.json"
+
+# the file of a capture with the argument table of the call
+ARGUMENTS_FILE = "arguments.txt"
+
+_logger = logging.getLogger(__name__)
+
+
+class CallCapturer:
+    """Writes the inputs of slow calls of a function to a directory, so \
+        they can be rerun in isolation with :func:`replay`.
+
+    Every captured call gets its own subdirectory, with NumPy arrays as
+    ``.npy`` files, DataFrames as Parquet files when pandas can write them,
+    i.e. with pyarrow or fastparquet installed and string column names, and
+    other arguments pickled. The arguments are pickled in memory before the
+    call with :meth:`snapshot`, so a function that mutates its arguments is
+    captured with the arguments it was called with, and only written when
+    the call turns out to be slow. A call whose arguments can't be pickled
+    or written is logged and not captured.
+
+    Parameters
+    ----------
+    func : Callable
+        The function whose calls are captured.
+    directory : str
+        The directory of the captures, created if it doesn't exist.
+    threshold : float, optional
+        The number of seconds above which a call is captured, by default 0.0
+    max_captures : int, optional
+        The maximum number of captured calls per process, by default 10
+
+    Raises
+    ------
+    ValueError
+        If threshold < 0 or max_captures < 1.
+
+    See Also
+    --------
+    Used by:
+    :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        directory: str,
+        threshold: float = 0.0,
+        max_captures: int = 10,
+    ):
+        if threshold < 0:
+            raise ValueError(f"threshold must be >= 0, got {threshold}")
+        if max_captures < 1:
+            raise ValueError(f"max_captures must be >= 1, got {max_captures}")
+        self.func = func
+        self.directory = directory
+        self.threshold_ns = threshold * 1e9
+        self.max_captures = max_captures
+        self.captures = 0
+        self._binder = ArgBinder(func)
+        self._lock = threading.Lock()
+
+    def snapshot(
+        self, args: tuple, kwargs: dict, records: Optional[List[dict]] = None
+    ) -> Optional[tuple]:
+        """Copies the inputs of a call before it may mutate them.
+
+        Parameters
+        ----------
+        args : tuple
+            The positional arguments of the call.
+        kwargs : dict
+            The keyword arguments of the call.
+        records : Optional[List[dict]], optional
+            The argument records of the call, by default bound from the
+            arguments
+
+        Returns
+        -------
+        Optional[tuple]
+            The snapshot to pass to :meth:`capture`, None if no more calls
+            are captured or the arguments can't be pickled.
+        """
+        if self.captures >= self.max_captures:
+            return None
+        try:
+            data = pickle.dumps((args, kwargs), pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            _logger.exception(
+                "Failed to capture a call of %s", self.func.__qualname__
+            )
+            return None
+        if records is None:
+            records = self._binder(*args, **kwargs)
+        return data, records
+
+    def capture(self, snapshot: tuple, exec_time_ns: int) -> Optional[str]:
+        """Writes the inputs of a call if it's slow enough.
+
+        Parameters
+        ----------
+        snapshot : tuple
+            The inputs of the call, taken by :meth:`snapshot`.
+        exec_time_ns : int
+            The duration of the call in nanoseconds.
+
+        Returns
+        -------
+        Optional[str]
+            The directory of the capture, None if the call isn't captured.
+        """
+        if exec_time_ns < self.threshold_ns:
+            return None
+        with self._lock:
+            if self.captures >= self.max_captures:
+                return None
+            self.captures += 1
+        name = re.sub(
+            r"[^\w.-]", "_", f"{self.func.__module__}.{self.func.__qualname__}"
+        )
+        path = os.path.join(
+            self.directory, f"{name}-{time_ns()}-{os.getpid()}"
+        )
+        data, records = snapshot
+        try:
+            args, kwargs = pickle.loads(data)
+            os.makedirs(path)
+            self._write(path, args, kwargs, records, exec_time_ns)
+        except Exception:
+            _logger.exception("Failed to capture a call of %s", name)
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        return path
+
+    def _write(
+        self,
+        path: str,
+        args: tuple,
+        kwargs: dict,
+        records: List[dict],
+        exec_time_ns: int,
+    ) -> None:
+        """Writes the arguments, argument table and description of a call."""
+        call = {
+            "module": self.func.__module__,
+            "qualname": self.func.__qualname__,
+            "timestamp": time(),
+            "exec_time_s": exec_time_ns / 1e9,
+            "args": [
+                _save_value(arg, os.path.join(path, f"arg_{index}"))
+                for index, arg in enumerate(args)
+            ],
+            "kwargs": {
+                key: _save_value(arg, os.path.join(path, f"kwarg_{index}"))
+                for index, (key, arg) in enumerate(kwargs.items())
+            },
+            "arguments": records,
+        }
+        with open(os.path.join(path, ARGUMENTS_FILE), "w") as file:
+            file.write(render_table(records) + "\n")
+        with open(os.path.join(path, CALL_FILE), "w") as file:
+            json.dump(call, file, indent=1, default=str)
+
+
+def _save_value(value: Any, stem: str) -> Dict[str, str]:
+    """Writes an argument to a file and returns its file name and format."""
+    if isinstance(value, np.ndarray) and not value.dtype.hasobject:
+        np.save(f"{stem}.npy", value, allow_pickle=False)
+        return {"file": os.path.basename(stem) + ".npy", "format": "npy"}
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        file_format = "parquet" if isinstance(value, pd.DataFrame) else None
+        frame = value
+        if isinstance(value, pd.Series) and isinstance(value.name, str):
+            file_format, frame = "parquet_series", value.to_frame()
+        if file_format is not None:
+            try:
+                frame.to_parquet(f"{stem}.parquet")
+                return {
+                    "file": os.path.basename(stem) + ".parquet",
+                    "format": file_format,
+                }
+            except (ImportError, ValueError, TypeError):
+                # no Parquet engine or not representable in Parquet
+                if os.path.exists(f"{stem}.parquet"):
+                    os.remove(f"{stem}.parquet")
+    with open(f"{stem}.pkl", "wb") as file:
+        pickle.dump(value, file, pickle.HIGHEST_PROTOCOL)
+    return {"file": os.path.basename(stem) + ".pkl", "format": "pickle"}
+
+
+def _load_value(path: str, saved: Dict[str, str]) -> Any:
+    """Reads an argument written by :func:`_save_value`."""
+    file_path = os.path.join(path, saved["file"])
+    if saved["format"] == "npy":
+        return np.load(file_path, allow_pickle=False)
+    if saved["format"] == "parquet":
+        return pd.read_parquet(file_path)
+    if saved["format"] == "parquet_series":
+        return pd.read_parquet(file_path).iloc[:, 0]
+    with open(file_path, "rb") as file:
+        return pickle.load(file)
+
+
+def load_call(path: str) -> Tuple[Callable, tuple, dict]:
+    """Reads a call captured by :class:`CallCapturer`.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the capture.
+
+    Returns
+    -------
+    Tuple[Callable, tuple, dict]
+        The function, imported by its module and qualified name, and the
+        positional and keyword arguments of the call.
+
+    Raises
+    ------
+    ImportError
+        If the function can't be imported, e.g. when it was defined in
+        another function or in a script that isn't importable.
+
+    See Also
+    --------
+    Used by:
+    :func:`replay`
+    """
+    with open(os.path.join(path, CALL_FILE)) as file:
+        call = json.load(file)
+    args = tuple(_load_value(path, saved) for saved in call["args"])
+    kwargs = {
+        key: _load_value(path, saved) for key, saved in call["kwargs"].items()
+    }
+    return _import_function(call["module"], call["qualname"]), args, kwargs
+
+
+def _import_function(module: str, qualname: str) -> Callable:
+    """Imports a function by its module and qualified name."""
+    if "<locals>" in qualname:
+        raise ImportError(
+            f"Can't import {qualname}, which is defined in a function"
+        )
+    target: Any = importlib.import_module(module)
+    try:
+        for name in qualname.split("."):
+            target = getattr(target, name)
+    except AttributeError:
+        raise ImportError(f"Can't import {qualname} from {module}") from None
+    return target
+
+
+def replay(path: str, func: Optional[Callable] = None, **options) -> dict:
+    """Reruns a call captured by \
+        :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec` \
+            with ``capture_if_slower_than`` as a benchmark.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the capture.
+    func : Optional[Callable], optional
+        The function to run, e.g. a new version of the captured function, by
+        default the captured function imported by its name
+    **options
+        The options of :func:`~extra_ds_tools.decorators.benchmark.benchmark`,
+        like ``repeats`` or ``print_output``.
+
+    Returns
+    -------
+    dict
+        The output of :func:`~extra_ds_tools.decorators.benchmark.benchmark`.
+
+    Examples
+    --------
+    >>> @timeit_arg_info_dec(capture_if_slower_than=60, capture_dir='captured_calls', print_output=False)
+    >>> def build_features(df: pd.DataFrame, window: int):
+    >>>     ...
+    >>>
+    >>> # later, e.g. on another machine with the captures copied to it
+    >>> results = replay('captured_calls/features.build_features-1700000000000000000-4242', repeats=3, print_output=False)
+    build_features()
+    -----------------------------------------------------------------------------------------------------------------
+        param    type_hint                    default_value    arg_type                     arg_value    arg_len
+    --  -------  ---------------------------  ---------------  ---------------------------  -----------  ------------
+     0  df       pandas.core.frame.DataFrame                   pandas.core.frame.DataFrame               (1000000, 2)
+     1  window   int                                           int                          28
+
+    build_features() took 61.18203675 seconds to run.
+    runs: 3 (3 warmup)
+    min: 60.9 seconds
+    median: 61.2 seconds (95% CI 60.9 - 61.5)
+    mean: 61.2 seconds (95% CI 60.9 - 61.5)
+    std: 0.3 seconds
+    -----------------------------------------------------------------------------------------------------------------
+
+    See Also
+    --------
+    Uses:
+    :func:`load_call`
+    :func:`~extra_ds_tools.decorators.benchmark.benchmark`
+    """  # noqa
+    captured_func, args, kwargs = load_call(path)
+    # the captured arguments are bound apart from the options of benchmark,
+    # so captured keywords like repeats are passed on to the function
+    return benchmark(
+        partial(func or captured_func, *args, **kwargs), **options
+    )
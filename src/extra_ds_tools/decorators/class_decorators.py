@@ -0,0 +1,246 @@
+import copy
+import inspect
+import threading
+import types
+import weakref
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from extra_ds_tools.decorators.func_decorators import (
+    _timed,
+    timeit_arg_info_dec,
+    timeit_is_enabled,
+)
+from extra_ds_tools.decorators.stats import FunctionStats
+
+# the methods of estimators and transformers that are timed by default
+DEFAULT_METHODS = ("fit", "transform", "predict", "fit_transform")
+
+# the maximum number of live instances per decorated class whose calls are
+# collected with per_instance, calls of other instances are only collected
+# per class
+MAX_INSTANCES = 1000
+
+# decorated class -> the statistics of its instances, with per_instance
+_instance_stats_by_class: weakref.WeakKeyDictionary = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def timeit_methods_dec(
+    cls: Optional[type] = None,
+    methods: Sequence[str] = DEFAULT_METHODS,
+    per_instance: bool = False,
+    **options,
+) -> Any:
+    """Class decorator that times methods of a class, by default those of scikit-learn \
+        estimators, with :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`.
+
+    The statistics of a method are collected per class, e.g. as ``module.Class.fit``, also
+    for a method it inherits. The instance isn't part of the argument table, so it's never
+    rendered. With ``per_instance`` the timed calls are also collected per instance, apart
+    from the statistics of timeit_arg_info_dec, see :func:`instance_stats`. Those are
+    forgotten with their instance, which makes them suited to e.g. compare the fitted
+    estimators of a search, and kept for at most :data:`MAX_INSTANCES` live instances.
+    Instances aren't changed, so ``get_params``, ``set_params`` and ``clone`` of
+    scikit-learn work as before.
+
+    The class is changed in place, so decorating an imported class times its methods
+    everywhere. Subclass it first to only time the subclass. Methods that the class doesn't
+    have are skipped, and so are static methods, class methods and properties.
+
+    Parameters
+    ----------
+    cls : Optional[type], optional
+        For using the decorator without options and should otherwise be None, by default None
+    methods : Sequence[str], optional
+        The names of the methods to time, by default :data:`DEFAULT_METHODS`
+    per_instance : bool, optional
+        If True the duration of calls is also collected per instance, by default False
+    **options
+        The options of :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`.
+
+    Returns
+    -------
+    Any
+        The decorated class, or the class itself when the timing decorators are disabled.
+
+    Examples
+    --------
+    >>> @timeit_methods_dec(param_info=False, print_output=False)
+    >>> class Scaler(TransformerMixin, BaseEstimator):
+    >>>     def __init__(self, factor=2):
+    >>>         self.factor = factor
+    >>>
+    >>>     def fit(self, X, y=None):
+    >>>         return self
+    >>>
+    >>>     def transform(self, X):
+    >>>         return X * self.factor
+    >>>
+    >>> X_scaled = Scaler().fit_transform(np.ones((1000, 3)))
+
+    fit() took 1.2e-06 seconds to run.
+
+    transform() took 9.1e-06 seconds to run.
+
+    fit_transform() took 2.81e-05 seconds to run.
+    >>> print_stats()
+        function                       calls    sampled    total_s    mean_s      p50_s      p95_s      p99_s      max_s
+    --  ---------------------------  -------  ---------  ---------  --------  ---------  ---------  ---------  ---------
+     0  __main__.Scaler.fit_transform      1          1   2.81e-05  2.81e-05  2.81e-05   2.81e-05   2.81e-05   2.81e-05
+     1  __main__.Scaler.transform          1          1   9.1e-06   9.1e-06   9.1e-06    9.1e-06    9.1e-06    9.1e-06
+     2  __main__.Scaler.fit                1          1   1.2e-06   1.2e-06   1.2e-06    1.2e-06    1.2e-06    1.2e-06
+
+    See Also
+    --------
+    Uses:
+    :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`
+    """  # noqa
+
+    def _timeit_methods(cls):
+        if not timeit_is_enabled():
+            return cls
+        instances = None
+        if per_instance:
+            instances = _instance_stats_by_class.setdefault(
+                cls, _InstanceStats()
+            )
+        for name in methods:
+            try:
+                attribute = inspect.getattr_static(cls, name)
+            except AttributeError:
+                continue
+            if inspect.isfunction(attribute):
+                setattr(
+                    cls,
+                    name,
+                    _timed_method(cls, name, attribute, instances, options),
+                )
+            elif inspect.isfunction(getattr(attribute, "fn", None)):
+                # a method of scikit-learn that's only available if the
+                # estimator has it, like Pipeline.predict
+                attribute = copy.copy(attribute)
+                attribute.fn = _timed_method(
+                    cls, name, attribute.fn, instances, options
+                )
+                setattr(cls, name, attribute)
+        return cls
+
+    if cls is not None:
+        return _timeit_methods(cls)
+    return _timeit_methods
+
+
+def instance_stats(instance: Any) -> Dict[str, dict]:
+    """Returns the latency statistics of the methods of an instance of a \
+        class decorated by :func:`timeit_methods_dec` with ``per_instance``.
+
+    Parameters
+    ----------
+    instance : Any
+        An instance of the decorated class.
+
+    Returns
+    -------
+    Dict[str, dict]
+        Per qualified method name the output of
+        :meth:`~extra_ds_tools.decorators.stats.FunctionStats.summary`, empty
+        if the instance's calls aren't collected.
+
+    Examples
+    --------
+    >>> @timeit_methods_dec(per_instance=True, param_info=False, print_output=False)
+    >>> class Scaler(TransformerMixin, BaseEstimator):
+    >>>     ...
+    >>>
+    >>> scaler = Scaler().fit(X)
+    >>> instance_stats(scaler)['__main__.Scaler.fit']['calls']
+    1
+    """  # noqa
+    summaries = {}
+    # the class and its base classes can be decorated
+    for cls in type(instance).__mro__:
+        instances = _instance_stats_by_class.get(cls)
+        if instances is None:
+            continue
+        for name, stats in instances.methods(instance).items():
+            if stats.calls:
+                summaries[name] = stats.summary()
+    return summaries
+
+
+def _timed_method(
+    cls: type,
+    name: str,
+    function: Callable,
+    instances: Optional["_InstanceStats"],
+    options: dict,
+) -> Callable:
+    """Returns a method of a class timed by timeit_arg_info_dec, under the \
+        name of the class and optionally also per instance."""
+    # a copy collected under the decorated class, also for an inherited
+    # method, without another call in between
+    method = types.FunctionType(
+        function.__code__,
+        function.__globals__,
+        function.__name__,
+        function.__defaults__,
+        function.__closure__,
+    )
+    method.__kwdefaults__ = copy.copy(function.__kwdefaults__)
+    method.__dict__.update(function.__dict__)
+    method.__doc__ = function.__doc__
+    method.__annotations__ = dict(function.__annotations__)
+    method.__module__ = cls.__module__
+    method.__qualname__ = f"{cls.__qualname__}.{name}"
+    # all options of timeit_arg_info_dec, which raises for unknown ones
+    bound = inspect.signature(timeit_arg_info_dec).bind(**options)
+    bound.apply_defaults()
+    all_options = dict(bound.arguments)
+    del all_options["function"]
+    if instances is None:
+        return _timed(method, all_options, method=True)
+    method_name = f"{cls.__module__}.{cls.__qualname__}.{name}"
+
+    def call_stats(args: tuple) -> Optional[FunctionStats]:
+        # the instance is the first argument of a method
+        return instances.get(args[0], method_name) if args else None
+
+    return _timed(method, all_options, method=True, call_stats=call_stats)
+
+
+class _InstanceStats:
+    """The statistics of the methods of the live instances of a class, kept \
+        for at most :data:`MAX_INSTANCES` instances without changing them."""
+
+    def __init__(self):
+        # instance -> method name -> statistics
+        self._stats: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self, instance: Any, name: str) -> Optional[FunctionStats]:
+        """Returns the statistics of a method of an instance, created if not \
+            present, None if the instance isn't collected."""
+        try:
+            stats = self._stats[instance]
+        except KeyError:
+            with self._lock:
+                if len(self._stats) >= MAX_INSTANCES:
+                    return None
+                stats = self._stats.setdefault(instance, {})
+        except TypeError:
+            # an instance that can't be weakly referenced or hashed
+            return None
+        try:
+            return stats[name]
+        except KeyError:
+            with self._lock:
+                return stats.setdefault(name, FunctionStats(name))
+
+    def methods(self, instance: Any) -> Dict[str, FunctionStats]:
+        """Returns the statistics of the methods of an instance, empty if \
+            the instance isn't collected."""
+        try:
+            return dict(self._stats.get(instance, {}))
+        except TypeError:
+            return {}
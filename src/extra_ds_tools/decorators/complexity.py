@@ -0,0 +1,302 @@
+import threading
+from random import Random
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from extra_ds_tools.decorators.report import render_table
+
+# the scaling classes that are fitted, from simplest to most complex
+MODELS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "O(1)": lambda n: np.zeros_like(n),
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * np.log2(np.maximum(n, 2)),
+    "O(n^2)": lambda n: n * n,
+}
+
+# a more complex scaling class must reduce the error of a simpler one by this
+# fraction to be preferred
+MIN_IMPROVEMENT = 0.1
+
+
+class ComplexityEstimator:
+    """Estimates how the runtime of a function scales with the size of its \
+        input, from the sizes and durations of its calls.
+
+    Every scaling class in :data:`MODELS` is fitted as
+    ``time = a + b * f(n)`` with b >= 0, weighted by the relative error of
+    every call, and the simplest class whose error isn't reduced by
+    :data:`MIN_IMPROVEMENT` by a more complex class fits best. At most
+    ``max_samples`` calls are kept, by reservoir sampling.
+
+    Parameters
+    ----------
+    name : str
+        The qualified name of the function.
+    max_samples : int, optional
+        The maximum number of calls kept, by default 1000
+
+    Examples
+    --------
+    >>> estimator = ComplexityEstimator('module.sort')
+    >>> for n in [1_000, 10_000, 100_000, 1_000_000]:
+    >>>     estimator.add(n, int(50 * n * np.log2(n)))
+    >>> estimator.estimate()
+    {'function': 'module.sort',
+    'calls': 4,
+    'min_n': 1000,
+    'max_n': 1000000,
+    'scaling': 'O(n log n)',
+    'items_per_s': 1354635.0,
+    'time_at_2x_max_n_s': 2.09}
+    """
+
+    def __init__(self, name: str, max_samples: int = 1000):
+        self.name = name
+        self.max_samples = max_samples
+        self.calls = 0
+        self._sizes: List[int] = []
+        self._durations: List[int] = []
+        self._random = Random(0)
+        self._lock = threading.Lock()
+
+    def add(self, size: int, duration_ns: int) -> None:
+        """Adds the input size and duration of a call.
+
+        Parameters
+        ----------
+        size : int
+            The size of the input of the call.
+        duration_ns : int
+            The duration of the call in nanoseconds.
+        """
+        with self._lock:
+            self.calls += 1
+            if len(self._sizes) < self.max_samples:
+                self._sizes.append(size)
+                self._durations.append(duration_ns)
+                return
+            index = self._random.randrange(self.calls)
+            if index < self.max_samples:
+                self._sizes[index] = size
+                self._durations[index] = duration_ns
+
+    def reset(self) -> None:
+        """Forgets all added calls."""
+        with self._lock:
+            self.calls = 0
+            self._sizes = []
+            self._durations = []
+
+    def estimate(self) -> dict:
+        """Returns the best fitting scaling class and the throughput.
+
+        The scaling class is "unknown" when the kept calls don't have at
+        least 3 different input sizes, with the largest at least 4 times the
+        smallest.
+
+        Returns
+        -------
+        dict
+            The number of calls, the smallest and largest input size, the
+            scaling class, the median number of input items per second and
+            the predicted seconds of a call with twice the largest input.
+        """
+        with self._lock:
+            sizes = np.array(self._sizes, dtype=float)
+            durations = np.array(self._durations, dtype=float) / 1e9
+            calls = self.calls
+        estimate = {"function": self.name, "calls": calls}
+        if not calls:
+            return estimate
+        estimate["min_n"] = int(sizes.min())
+        estimate["max_n"] = int(sizes.max())
+        scaling, prediction = "unknown", None
+        if len(np.unique(sizes)) >= 3 and sizes.max() >= 4 * max(
+            sizes.min(), 1
+        ):
+            scaling, model = _best_model(sizes, durations)
+            prediction = float(model(np.array([2 * sizes.max()]))[0])
+        estimate["scaling"] = scaling
+        positive = durations > 0
+        estimate["items_per_s"] = (
+            float(np.median(sizes[positive] / durations[positive]))
+            if positive.any()
+            else 0.0
+        )
+        estimate["time_at_2x_max_n_s"] = prediction
+        return estimate
+
+
+def _best_model(sizes: np.ndarray, durations: np.ndarray) -> tuple:
+    """Returns the name and fitted function of the best fitting model."""
+    # relative errors, so short and long calls weigh the same
+    weights = 1 / np.maximum(durations, 1e-9)
+    best_name, best_error, best_model = None, np.inf, None
+    for name, scale in MODELS.items():
+        features = scale(sizes)
+        design = np.column_stack([np.ones_like(sizes), features])
+        coefficients = np.linalg.lstsq(
+            design * weights[:, None], durations * weights, rcond=None
+        )[0]
+        if coefficients[1] < 0:
+            # runtime doesn't decrease with the input size
+            coefficients = np.array(
+                [np.average(durations, weights=weights**2), 0]
+            )
+        error = float(
+            np.sum(((design @ coefficients - durations) * weights) ** 2)
+        )
+        if best_name is None or error < best_error * (1 - MIN_IMPROVEMENT):
+            best_name, best_error = name, error
+            best_model = _fitted(scale, coefficients)
+    return best_name, best_model
+
+
+def _fitted(scale: Callable, coefficients: np.ndarray) -> Callable:
+    """Returns a fitted model as a function of the input size."""
+    return lambda n: coefficients[0] + coefficients[1] * scale(n)
+
+
+def input_size(args: tuple, kwargs: dict) -> Optional[int]:
+    """Returns the size of the largest argument of a call, i.e. its \
+        length, such as the number of rows of a DataFrame or array.
+
+    Parameters
+    ----------
+    args : tuple
+        The positional arguments of the call.
+    kwargs : dict
+        The keyword arguments of the call.
+
+    Returns
+    -------
+    Optional[int]
+        The largest length of an argument, None if no argument has a length.
+
+    Examples
+    --------
+    >>> input_size((pd.DataFrame({'a': range(10)}), 'a'), {'n': 3})
+    10
+    """
+    largest = None
+    for arg in (*args, *kwargs.values()):
+        try:
+            size = len(arg)
+        except TypeError:
+            continue
+        if largest is None or size > largest:
+            largest = size
+    return largest
+
+
+class ComplexityRegistry:
+    """A collection of :class:`ComplexityEstimator` by function name."""
+
+    def __init__(self):
+        self._estimators: Dict[str, ComplexityEstimator] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> ComplexityEstimator:
+        """Returns the estimator of a function, created if not present.
+
+        Parameters
+        ----------
+        name : str
+            The qualified name of the function.
+
+        Returns
+        -------
+        ComplexityEstimator
+            The estimator of the function.
+        """
+        try:
+            return self._estimators[name]
+        except KeyError:
+            with self._lock:
+                return self._estimators.setdefault(
+                    name, ComplexityEstimator(name)
+                )
+
+    def estimate(self) -> Dict[str, dict]:
+        """Returns the estimate of every function with calls.
+
+        Returns
+        -------
+        Dict[str, dict]
+            Per function name the output of
+            :meth:`ComplexityEstimator.estimate`.
+        """
+        estimates = (
+            estimator.estimate()
+            for estimator in list(self._estimators.values())
+        )
+        return {
+            estimate["function"]: estimate
+            for estimate in estimates
+            if estimate["calls"]
+        }
+
+    def reset(self) -> None:
+        """Forgets the calls of every function."""
+        for estimator in list(self._estimators.values()):
+            estimator.reset()
+
+    def render(self) -> str:
+        """Renders a table of the estimates.
+
+        Returns
+        -------
+        str
+            The estimates as a table.
+        """
+        return render_table(list(self.estimate().values()))
+
+
+# the registry that collects the calls of timeit_arg_info_dec
+default_complexity_registry = ComplexityRegistry()
+
+
+def estimate_complexity() -> Dict[str, dict]:
+    """Returns the estimated scaling and throughput of all functions \
+        decorated by \
+            :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec` \
+                with ``complexity=True``.
+
+    Returns
+    -------
+    Dict[str, dict]
+        Per qualified function name its number of calls, smallest and largest
+        input size, best fitting scaling class, median items per second and
+        the predicted seconds of a call with twice the largest input.
+    """  # noqa
+    return default_complexity_registry.estimate()
+
+
+def reset_complexity() -> None:
+    """Forgets the calls of all functions decorated by \
+        :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec` \
+            with ``complexity=True``.
+    """  # noqa
+    default_complexity_registry.reset()
+
+
+def print_complexity() -> None:
+    """Prints a table with the estimated scaling and throughput of all \
+        functions decorated by \
+            :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec` \
+                with ``complexity=True``.
+
+    Examples
+    --------
+    >>> @timeit_arg_info_dec(complexity=True, print_output=False, param_info=False)
+    >>> def sort(values):
+    >>>     return sorted(values)
+    >>>
+    >>> for n in [1_000, 10_000, 100_000, 1_000_000]:
+    >>>     sort(np.random.rand(n).tolist())
+    >>> print_complexity()
+        function          calls    min_n    max_n  scaling       items_per_s    time_at_2x_max_n_s
+    --  --------------  -------  -------  -------  ----------  -------------  --------------------
+     0  __main__.sort         4     1000  1000000  O(n log n)    1.20514e+07              0.181237
+    """  # noqa
+    print(default_complexity_registry.render())
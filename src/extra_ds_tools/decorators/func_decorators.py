@@ -1,10 +1,91 @@
-from functools import wraps
-from time import time
-from typing import Callable, Optional
+import inspect
+import os
+import sys
+from functools import update_wrapper, wraps
+from time import perf_counter_ns
+from types import MethodType
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
 
-import pandas as pd
-from extra_ds_tools.format import args_and_kwargs_repr
-from tabulate import tabulate
+from extra_ds_tools.decorators.cache import (
+    DiskCache,
+    MemoryCache,
+    content_hash,
+    deep_memory_footprint,
+)
+from extra_ds_tools.decorators.capture import CallCapturer
+from extra_ds_tools.decorators.complexity import (
+    default_complexity_registry,
+    input_size,
+)
+from extra_ds_tools.decorators.probes import (
+    MemoryProbe,
+    ProfileProbe,
+    ResourceProbe,
+    StackSamplingProbe,
+)
+from extra_ds_tools.decorators.repeats import (
+    RepeatDetector,
+    default_repeat_registry,
+)
+from extra_ds_tools.decorators.report import CallReport
+from extra_ds_tools.decorators.sampling import CallSampler
+from extra_ds_tools.decorators.spans import SpanProbe
+from extra_ds_tools.decorators.stats import FunctionStats, default_registry
+from extra_ds_tools.decorators.thresholds import SlowCallFilter
+from extra_ds_tools.decorators.trace import ChromeTraceWriter
+from extra_ds_tools.format import ArgBinder
+
+# setting this environment variable to 1, true or yes disables the timing
+# decorators, e.g. to leave them on hot functions in production
+DISABLE_ENV_VAR = "EXTRA_DS_TOOLS_DISABLE_TIMEIT"
+
+_timeit_enabled = True
+
+
+def set_timeit_enabled(enabled: bool) -> None:
+    """Globally enables or disables :func:`timeit_arg_info_dec`.
+
+    A disabled decorator returns the decorated function unchanged, so it adds
+    no overhead at all. The switch applies to functions decorated after it was
+    set, functions that were already decorated keep their behaviour.
+
+    Parameters
+    ----------
+    enabled : bool
+        Whether functions decorated from now on are timed.
+
+    Examples
+    --------
+    >>> set_timeit_enabled(False)
+    >>>
+    >>> @timeit_arg_info_dec
+    >>> def add(a, b):
+    >>>     return a + b
+    >>>
+    >>> add(1, 2)
+    3
+
+    See Also
+    --------
+    Used by:
+    :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`
+    """
+    global _timeit_enabled
+    _timeit_enabled = enabled
+
+
+def timeit_is_enabled() -> bool:
+    """Returns whether :func:`timeit_arg_info_dec` is enabled, i.e. it's not \
+        disabled by :func:`set_timeit_enabled` nor by the \
+            ``EXTRA_DS_TOOLS_DISABLE_TIMEIT`` environment variable.
+
+    Returns
+    -------
+    bool
+        Whether functions decorated now are timed.
+    """
+    disabled_by_env = os.environ.get(DISABLE_ENV_VAR, "").strip().lower()
+    return _timeit_enabled and disabled_by_env not in ("1", "true", "yes")
 
 
 def timeit_arg_info_dec(
@@ -12,10 +93,43 @@ def timeit_arg_info_dec(
     print_output: bool = True,
     param_info: bool = True,
     round_seconds: Optional[int] = None,
+    sample_every: Optional[int] = None,
+    sample_rate: Optional[float] = None,
+    overhead_budget: Optional[float] = None,
+    memory_info: bool = False,
+    resource_info: bool = False,
+    sink: Optional[Any] = None,
+    call_tree: bool = False,
+    trace: Optional[ChromeTraceWriter] = None,
+    profile: bool = False,
+    profile_if_slower_than: Optional[float] = None,
+    profile_top_n: int = 10,
+    profile_dir: Optional[str] = None,
+    stack_sample_interval: Optional[float] = None,
+    stack_sample_dir: Optional[str] = None,
+    report_if_slower_than: Union[float, str, None] = None,
+    max_reports_per_second: Optional[float] = None,
+    size_param: Optional[str] = None,
+    complexity: bool = False,
+    detect_repeats: Union[bool, str] = False,
+    capture_if_slower_than: Optional[float] = None,
+    capture_dir: str = "captured_calls",
 ) -> Callable:
     """Decorator that prints the time a function took to execute, and information on its \
         parameters and arguments.
 
+    The duration of every call is also collected per function, see
+    :func:`~extra_ds_tools.decorators.stats.print_stats`. When calls are sampled the
+    statistics are extrapolated from the sampled calls.
+
+    Coroutine functions are timed until their result is awaited. Generators and async
+    generators are timed from their first until their last item, and their report also
+    shows the time to the first item, the number of items and the items per second.
+
+    Decorated functions can be pickled, e.g. to run them in a process pool, and the
+    workers can send their statistics back to the parent process, see
+    :func:`~extra_ds_tools.decorators.processes.share_stats`.
+
     Parameters
     ----------
     function : None, optional
@@ -26,11 +140,88 @@ def timeit_arg_info_dec(
         If true prints information about parameters and their arguments, by default True
     round_seconds : Optional[int], optional
         If set rounds the amount of seconds it took the decorated func to exectute, by default None
+    sample_every : Optional[int], optional
+        If set only every n-th call is timed and printed, the other calls are only counted, by default None
+    sample_rate : Optional[float], optional
+        If set calls are timed and printed with this probability, the other calls are only counted,
+        by default None
+    overhead_budget : Optional[float], optional
+        If set calls are only timed and printed while the time spent on doing so is at most this
+        fraction of the estimated time spent in the decorated function, by default None
+    memory_info : bool, optional
+        If True also prints the peak and retained memory allocated by python during a call,
+        the change of the resident set size of the process and the memory footprint of
+        every argument, by default False
+    resource_info : bool, optional
+        If True also prints the CPU time of the process and thread during a call, its page faults,
+        context switches and garbage collections with their pause time, which are also added to
+        the collected statistics, by default False
+    sink : Optional[Any], optional
+        If set the report of every call is passed to the ``emit`` method of this sink instead of
+        printed, e.g. a :class:`~extra_ds_tools.decorators.sinks.BackgroundWriter` to write them
+        without blocking the decorated function, by default None
+    call_tree : bool, optional
+        If True calls are placed in a tree of calls between decorated functions with this option,
+        with their inclusive and exclusive time aggregated by call path, see
+        :func:`~extra_ds_tools.decorators.spans.print_call_tree`, and the report shows the call
+        path. Calls made while a generator is in progress aren't placed under it, by default False
+    trace : Optional[ChromeTraceWriter], optional
+        If set every call is also written as a Chrome trace event with its arguments and
+        measurements, to view calls of all threads and processes on a timeline, by default None
+    profile : bool, optional
+        If True calls are run under cProfile and the report shows the functions with the most
+        cumulative time. Profiling slows down the call, by default False
+    profile_if_slower_than : Optional[float], optional
+        If set calls are profiled, but only calls that took at least this many seconds show their
+        profile, by default None
+    profile_top_n : int, optional
+        The number of functions shown of a profiled call, by default 10
+    profile_dir : Optional[str], optional
+        If set the profile of every shown profiled call is also dumped to a .pstats file in this
+        directory, by default None
+    stack_sample_interval : Optional[float], optional
+        If set a background thread samples the stack of a call every this many seconds and the
+        report shows the frames with the most samples, a low overhead alternative to profile for
+        long calls, by default None
+    stack_sample_dir : Optional[str], optional
+        If set the sampled stacks of every call are also written to a file in this directory, in the
+        collapsed format of flame graph tools, by default None
+    report_if_slower_than : Union[float, str, None], optional
+        If set every call is still timed and its arguments captured, but only calls slower than this
+        many seconds, or than a percentile of the previous calls like "p99", are reported. A
+        percentile reports nothing until the function made 100 timed calls, by default None
+    max_reports_per_second : Optional[float], optional
+        If set at most this many calls per second are reported per function, the report after
+        suppressed ones shows how many were suppressed, by default None
+    size_param : Optional[str], optional
+        If set the duration of calls is also collected per input-size bucket, by the length of the
+        argument of this parameter rounded up to a power of two, e.g. as ``module.func[n<1024]``,
+        to compare calls on similar input in a baseline, see
+        :func:`~extra_ds_tools.decorators.baselines.compare_to_baseline`, by default None
+    complexity : bool, optional
+        If True the report also shows the size of the largest argument, i.e. its length or number of
+        rows, and the items per second, and the sizes and durations of calls are collected to
+        estimate how the function scales with its input, see
+        :func:`~extra_ds_tools.decorators.complexity.print_complexity`, by default False
+    detect_repeats : Union[bool, str], optional
+        If True the inputs of timed calls are fingerprinted by their summary in the argument table,
+        and NumPy arrays and pandas objects also by their content, and "content" all inputs by
+        their content, to find calls with the same inputs as an earlier call and the time they
+        took, which a cache would save, see :func:`~extra_ds_tools.decorators.repeats.print_repeats`
+        and :func:`~extra_ds_tools.decorators.repeats.print_repeats_at_exit`. The report of such a
+        call shows how many calls had its inputs, by default False
+    capture_if_slower_than : Optional[float], optional
+        If set the arguments of calls that took at least this many seconds are written to
+        capture_dir after the call, at most 10 calls per process, to rerun them with
+        :func:`~extra_ds_tools.decorators.capture.replay`, by default None
+    capture_dir : str, optional
+        The directory of the captured calls, by default "captured_calls"
 
     Returns
     -------
     Callable
-        The decorated function
+        The decorated function, or the function itself when the decorator is disabled by
+        :func:`set_timeit_enabled` or the ``EXTRA_DS_TOOLS_DISABLE_TIMEIT`` environment variable.
 
     Examples
     --------
@@ -95,37 +286,784 @@ def timeit_arg_info_dec(
     See Also
     --------
     Uses:
-    :func:`~extra_ds_tools.format.args_and_kwargs_repr`
+    :class:`~extra_ds_tools.format.ArgBinder`
+    :class:`~extra_ds_tools.decorators.report.CallReport`
+    :class:`~extra_ds_tools.decorators.stats.StatsRegistry`
+    :class:`~extra_ds_tools.decorators.sampling.CallSampler`
+    :class:`~extra_ds_tools.decorators.probes.MemoryProbe`
+    :class:`~extra_ds_tools.decorators.probes.ResourceProbe`
+    :class:`~extra_ds_tools.decorators.probes.ProfileProbe`
+    :class:`~extra_ds_tools.decorators.probes.StackSamplingProbe`
+    :class:`~extra_ds_tools.decorators.sinks.BackgroundWriter`
+    :class:`~extra_ds_tools.decorators.spans.SpanProbe`
+    :class:`~extra_ds_tools.decorators.trace.ChromeTraceWriter`
+    :class:`~extra_ds_tools.decorators.thresholds.SlowCallFilter`
+    :class:`~extra_ds_tools.decorators.complexity.ComplexityEstimator`
+    :class:`~extra_ds_tools.decorators.repeats.RepeatDetector`
+    :class:`~extra_ds_tools.decorators.capture.CallCapturer`
     """  # noqa
+    # the options are kept to decorate the function again after unpickling
+    options = dict(locals())
+    del options["function"]
 
     def _timeit(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            if param_info:
-                args_and_kwargs = args_and_kwargs_repr(func, *args, **kwargs)
-                table = tabulate(
-                    pd.DataFrame(args_and_kwargs).fillna(""),
-                    headers="keys",
+        if not timeit_is_enabled():
+            return func
+        return _timed(func, options)
+
+    if function:
+        return _timeit(function)
+    return _timeit
+
+
+def _timed(func: Callable, options: dict, **timer_options) -> Callable:
+    """Returns a function timed with the options of \
+        :func:`timeit_arg_info_dec` and the keyword-only options of \
+            :class:`_CallTimer`."""
+    timer = _CallTimer(func, **options, **timer_options)
+
+    if inspect.isasyncgenfunction(func):
+        return _async_generator_wrapper(func, timer)
+    if inspect.iscoroutinefunction(func):
+        return _coroutine_wrapper(func, timer)
+    if inspect.isgeneratorfunction(func):
+        return _generator_wrapper(func, timer)
+
+    return _TimedFunction(func, timer, options)
+
+
+class _TimedFunction:
+    """A function decorated by :func:`timeit_arg_info_dec`, which can be \
+        pickled, e.g. to run it in the workers of a process pool.
+
+    A decorated function that can be imported under its name is pickled by
+    name, like a function. Otherwise, e.g. when it's decorated without
+    replacing the function, the function is pickled by name with the options
+    of the decorator, and decorated again when it's unpickled.
+    """
+
+    def __init__(self, func: Callable, timer: "_CallTimer", options: dict):
+        update_wrapper(self, func)
+        self._timer = timer
+        self._options = options
+        self._timing_only = timer.timing_only
+
+    def __call__(self, *args, **kwargs):
+        if self._timing_only:
+            # only read the clock around the call
+            start_time = perf_counter_ns()
+            try:
+                result = self.__wrapped__(*args, **kwargs)
+            except BaseException as error:
+                self._timer.stats.record_unsampled()
+                self._timer.abort(None, error)
+                raise
+            self._timer.report(None, perf_counter_ns() - start_time, result)
+            return result
+        return self._timer.call(args, kwargs)
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        # bound like a function when it's a method
+        if instance is None:
+            return self
+        return MethodType(self, instance)
+
+    def __reduce__(self) -> Union[str, tuple]:
+        if _import_name(self.__module__, self.__qualname__) is self:
+            return self.__qualname__
+        return _decorate, (self.__wrapped__, self._options)
+
+
+def _import_name(module: str, qualname: str) -> Any:
+    """Returns the object with a qualified name in a module, None if there \
+        is none."""
+    target: Any = sys.modules.get(module)
+    for name in qualname.split("."):
+        target = getattr(target, name, None)
+    return target
+
+
+def _decorate(func: Callable, options: dict) -> Callable:
+    """Decorates an unpickled function with the options of its decorator."""
+    return timeit_arg_info_dec(**options)(func)
+
+
+class _CallTimer:
+    """Times and reports the calls of a function decorated by \
+        :func:`timeit_arg_info_dec`.
+
+    A method can be timed with ``method=True``, which leaves its instance out
+    of the argument table, and ``call_stats``, which returns more statistics
+    to record a call in from its positional arguments, e.g. those of its
+    instance, or None.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        print_output: bool,
+        param_info: bool,
+        round_seconds: Optional[int],
+        sample_every: Optional[int],
+        sample_rate: Optional[float],
+        overhead_budget: Optional[float],
+        memory_info: bool,
+        resource_info: bool,
+        sink: Optional[Any],
+        call_tree: bool,
+        trace: Optional[ChromeTraceWriter],
+        profile: bool,
+        profile_if_slower_than: Optional[float],
+        profile_top_n: int,
+        profile_dir: Optional[str],
+        stack_sample_interval: Optional[float],
+        stack_sample_dir: Optional[str],
+        report_if_slower_than: Union[float, str, None],
+        max_reports_per_second: Optional[float],
+        size_param: Optional[str],
+        complexity: bool,
+        detect_repeats: Union[bool, str],
+        capture_if_slower_than: Optional[float],
+        capture_dir: str,
+        *,
+        method: bool = False,
+        call_stats: Optional[
+            Callable[[tuple], Optional[FunctionStats]]
+        ] = None,
+    ):
+        self.func = func
+        self.call_stats = call_stats
+        self.print_output = print_output
+        self.round_seconds = round_seconds
+        self.sink = sink
+        self.trace = trace
+        self.size_param = size_param
+        self._size_position = _param_position(func, size_param)
+        self.stats = default_registry.get(
+            f"{func.__module__}.{func.__qualname__}"
+        )
+        self.complexity = None
+        if complexity:
+            self.complexity = default_complexity_registry.get(self.stats.name)
+        self.repeats = _repeat_detector(self.stats.name, detect_repeats)
+        self.capturer = (
+            CallCapturer(func, capture_dir, capture_if_slower_than)
+            if capture_if_slower_than is not None
+            else None
+        )
+        # introspect the function once instead of on every call
+        self.binder = (
+            ArgBinder(func, memory_info, skip_self=method)
+            if param_info
+            else None
+        )
+        self._repeat_binder = self.binder
+        if self.repeats is not None and (self.binder is None or method):
+            # the argument table summarizes the inputs, but isn't reported,
+            # and with the instance, as calls of other instances differ
+            self._repeat_binder = ArgBinder(func)
+        # probes measure more than time around a call and add to its report
+        self.probes: list = []
+        if call_tree:
+            # started first so the time of a call includes its other probes
+            self.probes.append(
+                SpanProbe(
+                    self.stats.name,
+                    nests=not inspect.isgeneratorfunction(func)
+                    and not inspect.isasyncgenfunction(func),
                 )
-                table_len = len(max(table.split("\n"), key=len))
-                table = (
-                    f"\n\033[1m{func.__name__}()\033[0m"
-                    f"\n{'-' * table_len}\n{table}"
+            )
+        if memory_info:
+            self.probes.append(MemoryProbe())
+        if resource_info:
+            # started after the other measuring probes so its CPU time
+            # excludes them
+            self.probes.append(ResourceProbe(self.stats))
+        if stack_sample_interval is not None:
+            self.probes.append(
+                StackSamplingProbe(
+                    self.stats.name,
+                    getattr(func, "__code__", None),
+                    stack_sample_interval,
+                    output_dir=stack_sample_dir,
                 )
-                print(table)
-            start_time = time()
-            result = func(*args, **kwargs)
-            exec_time = time() - start_time
-            if round_seconds:
-                exec_time = round(exec_time, round_seconds)
-            print(f"\n{func.__name__}() took {exec_time} seconds to run.")
-            if print_output:
-                print(f"\nReturned:\n{result}")
-            print("-" * table_len)
-            return result
+            )
+        if profile or profile_if_slower_than is not None:
+            # started last so only the call itself is profiled
+            self.probes.append(
+                ProfileProbe(
+                    self.stats.name,
+                    profile_top_n,
+                    profile_if_slower_than,
+                    profile_dir,
+                )
+            )
+        self.slow_filter = None
+        if (
+            report_if_slower_than is not None
+            or max_reports_per_second is not None
+        ):
+            self.slow_filter = SlowCallFilter(
+                self.stats, report_if_slower_than, max_reports_per_second
+            )
+        self.sampler = None
+        if (
+            sample_every is not None
+            or sample_rate is not None
+            or overhead_budget is not None
+        ):
+            self.sampler = CallSampler(
+                self.stats, sample_every, sample_rate, overhead_budget
+            )
+
+    @property
+    def timing_only(self) -> bool:
+        """Whether calls only need to be timed."""
+        return (
+            self.binder is None
+            and self.sampler is None
+            and not self.probes
+            and self.trace is None
+            and self.size_param is None
+            and self.complexity is None
+            and self.repeats is None
+            and self.capturer is None
+            and self.call_stats is None
+        )
+
+    def start(self, args: tuple, kwargs: dict) -> Optional[tuple]:
+        """Decides whether a call is sampled and captures its arguments.
+
+        Returns None for an unsampled call, otherwise the state to pass to
+        :meth:`finish`.
+        """
+        if self.sampler is not None and not self.sampler.sample():
+            self.stats.record_unsampled()
+            if self.call_stats is not None:
+                stats = self.call_stats(args)
+                if stats is not None:
+                    stats.record_unsampled()
+            return None
+        wrapper_start_time = perf_counter_ns()
+        # the argument info is captured before the call, as the function
+        # may mutate its inputs, but only rendered when printed
+        records = None
+        if self.binder is not None:
+            records = self.binder(*args, **kwargs)
+        # the statistics besides those of the function the call is added to
+        extra_stats = []
+        if self.size_param is not None:
+            extra_stats.append(self._size_bucket_stats(args, kwargs))
+        if self.call_stats is not None:
+            extra_stats.append(self.call_stats(args))
+        size = None
+        if self.complexity is not None:
+            size = input_size(args, kwargs)
+        fingerprint = None
+        if self.repeats is not None:
+            fingerprint = self._fingerprint(records, args, kwargs)
+        # the arguments are copied before the call may mutate them, and
+        # written after it if it was slow
+        inputs = None
+        if self.capturer is not None:
+            inputs = self.capturer.snapshot(args, kwargs, records)
+        tokens = [probe.start() for probe in self.probes]
+        return (
+            wrapper_start_time,
+            records,
+            tokens,
+            [stats for stats in extra_stats if stats is not None],
+            size,
+            fingerprint,
+            inputs,
+        )
+
+    def finish(
+        self,
+        started: tuple,
+        exec_time_ns: int,
+        result: Any,
+        details: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Reports a sampled call and accounts for the overhead of doing so."""
+        end_time = perf_counter_ns()
+        (
+            wrapper_start_time,
+            records,
+            tokens,
+            extra_stats,
+            size,
+            fingerprint,
+            inputs,
+        ) = started
+        details = dict(details or {})
+        for probe, token in zip(reversed(self.probes), reversed(tokens)):
+            details.update(probe.stop(token))
+        if size is not None:
+            self.complexity.add(size, exec_time_ns)
+            details["input size"] = size
+            details["throughput"] = (
+                f"{size / exec_time_ns * 1e9:.6g} items per second"
+                if exec_time_ns
+                else "unavailable"
+            )
+        if fingerprint is not None:
+            same_inputs = self.repeats.add(fingerprint, exec_time_ns)
+            if same_inputs > 1:
+                details["calls with these inputs"] = same_inputs
+        if inputs is not None:
+            capture_path = self.capturer.capture(inputs, exec_time_ns)
+            if capture_path is not None:
+                details["captured to"] = capture_path
+        if self.trace is not None:
+            self.trace.add_call(
+                self.func.__qualname__,
+                self.func.__module__,
+                end_time - exec_time_ns,
+                exec_time_ns,
+                _trace_args(records, details),
+            )
+        self.report(records, exec_time_ns, result, details, extra_stats)
+        if self.sampler is not None:
+            self.sampler.add_overhead(
+                perf_counter_ns() - wrapper_start_time - exec_time_ns
+            )
+
+    def abort(self, started: Optional[tuple], error: BaseException) -> None:
+        """Counts a call that raised an exception as an error, unless it was \
+            interrupted, and stops its probes if it was sampled."""
+        if isinstance(error, Exception):
+            self.stats.record_error()
+        if started is None:
+            return
+        # counted like a call that wasn't timed
+        self.stats.record_unsampled()
+        for probe, token in zip(reversed(self.probes), reversed(started[2])):
+            # the measurements of a failed call aren't reported
+            getattr(probe, "abort", probe.stop)(token)
+
+    def _fingerprint(
+        self, records: Optional[List[dict]], args: tuple, kwargs: dict
+    ) -> str:
+        """Returns the fingerprint of the inputs of a call."""
+        if records is None or self._repeat_binder is not self.binder:
+            records = self._repeat_binder(*args, **kwargs)
+        return self.repeats.fingerprint(records, args, kwargs)
+
+    def _size_bucket_stats(
+        self, args: tuple, kwargs: dict
+    ) -> Optional[FunctionStats]:
+        """Returns the statistics of the input-size bucket of a call, None \
+            if the argument of the size parameter has no length."""
+        if self._size_position is not None and self._size_position < len(args):
+            arg = args[self._size_position]
+        elif self.size_param in kwargs:
+            arg = kwargs[self.size_param]
+        else:
+            return None
+        try:
+            size = len(arg)
+        except TypeError:
+            return None
+        return default_registry.get(
+            f"{self.stats.name}[n<{1 << size.bit_length()}]"
+        )
+
+    def call(self, args: tuple, kwargs: dict) -> Any:
+        """Calls the function, timing and reporting the call if sampled."""
+        started = self.start(args, kwargs)
+        if started is None:
+            try:
+                return self.func(*args, **kwargs)
+            except BaseException as error:
+                self.abort(None, error)
+                raise
+        start_time = perf_counter_ns()
+        try:
+            result = self.func(*args, **kwargs)
+        except BaseException as error:
+            self.abort(started, error)
+            raise
+        self.finish(started, perf_counter_ns() - start_time, result)
+        return result
+
+    def report(
+        self,
+        records: Optional[List[dict]],
+        exec_time_ns: int,
+        result: Any,
+        details: Optional[Dict[str, Any]] = None,
+        extra_stats: Sequence[FunctionStats] = (),
+    ) -> None:
+        """Records the duration of a call and prints or emits its report."""
+        for stats in extra_stats:
+            stats.record(exec_time_ns)
+        if self.slow_filter is not None:
+            report_call = self.slow_filter.should_report(exec_time_ns)
+            self.stats.record(exec_time_ns)
+            if not report_call:
+                return
+            suppressed = self.slow_filter.take_suppressed()
+            if suppressed:
+                details = dict(details or {})
+                details["suppressed reports"] = suppressed
+        else:
+            self.stats.record(exec_time_ns)
+        exec_time = exec_time_ns / 1e9
+        if self.round_seconds:
+            exec_time = round(exec_time, self.round_seconds)
+        report = CallReport(
+            self.func.__name__,
+            records,
+            exec_time,
+            result,
+            self.print_output,
+            details,
+        )
+        if self.sink is None:
+            print(report)
+        else:
+            self.sink.emit(report)
+
 
-        return wrapper
+def _repeat_detector(
+    name: str, detect_repeats: Union[bool, str]
+) -> Optional[RepeatDetector]:
+    """Returns the repeat detector of a function, None if repeats aren't \
+        detected."""
+    if detect_repeats not in (False, True, "content"):
+        raise ValueError(
+            'detect_repeats must be True, False or "content", '
+            f"got {detect_repeats!r}"
+        )
+    if not detect_repeats:
+        return None
+    return default_repeat_registry.get(name, detect_repeats == "content")
+
+
+def _param_position(func: Callable, name: Optional[str]) -> Optional[int]:
+    """Returns the position of a parameter that can be passed positionally, \
+        None if it can't or isn't given."""
+    if name is None:
+        return None
+    try:
+        return inspect.getfullargspec(func).args.index(name)
+    except (TypeError, ValueError):
+        return None
+
+
+def _trace_args(
+    records: Optional[List[dict]], details: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Returns the information on the arguments and the measurements of a \
+        call as the args of a trace event."""
+    args: Dict[str, Any] = {}
+    for record in records or ():
+        args[record["param"]] = {
+            key: value
+            for key, value in record.items()
+            if key != "param" and not (isinstance(value, str) and not value)
+        }
+    args.update(details)
+    return args
+
+
+def _coroutine_wrapper(func: Callable, timer: _CallTimer) -> Callable:
+    """Wraps a coroutine function so its calls are timed until the result \
+        is awaited."""
+
+    @wraps(func)
+    async def coroutine_wrapper(*args, **kwargs):
+        started = timer.start(args, kwargs)
+        if started is None:
+            try:
+                return await func(*args, **kwargs)
+            except BaseException as error:
+                timer.abort(None, error)
+                raise
+        start_time = perf_counter_ns()
+        try:
+            result = await func(*args, **kwargs)
+        except BaseException as error:
+            timer.abort(started, error)
+            raise
+        timer.finish(started, perf_counter_ns() - start_time, result)
+        return result
+
+    return coroutine_wrapper
+
+
+def _generator_wrapper(func: Callable, timer: _CallTimer) -> Callable:
+    """Wraps a generator function so its calls are timed until the \
+        generator is exhausted or closed."""
+
+    @wraps(func)
+    def generator_wrapper(*args, **kwargs):
+        started = timer.start(args, kwargs)
+        timing = _IterationTiming()
+        try:
+            # created in the try, so the probes stop if it raises
+            generator = func(*args, **kwargs)
+            item = next(generator)
+            while True:
+                timing.add_item()
+                # forward values and exceptions sent into the wrapper
+                try:
+                    sent = yield item
+                except GeneratorExit:
+                    generator.close()
+                    timing.finish(timer, started)
+                    raise
+                except BaseException as exc:
+                    item = generator.throw(exc)
+                else:
+                    item = generator.send(sent)
+        except StopIteration as stop:
+            timing.finish(timer, started, stop.value)
+            return stop.value
+        except BaseException as error:
+            if not timing.finished:
+                timer.abort(started, error)
+            raise
+
+    return generator_wrapper
+
+
+def _async_generator_wrapper(func: Callable, timer: _CallTimer) -> Callable:
+    """Wraps an async generator function so its calls are timed until the \
+        async generator is exhausted or closed."""
+
+    @wraps(func)
+    async def async_generator_wrapper(*args, **kwargs):
+        started = timer.start(args, kwargs)
+        timing = _IterationTiming()
+        try:
+            # created in the try, so the probes stop if it raises
+            generator = func(*args, **kwargs)
+            item = await generator.__anext__()
+            while True:
+                timing.add_item()
+                # forward values and exceptions sent into the wrapper
+                try:
+                    sent = yield item
+                except GeneratorExit:
+                    await generator.aclose()
+                    timing.finish(timer, started)
+                    raise
+                except BaseException as exc:
+                    item = await generator.athrow(exc)
+                else:
+                    item = await generator.asend(sent)
+        except StopAsyncIteration:
+            timing.finish(timer, started)
+        except BaseException as error:
+            if not timing.finished:
+                timer.abort(started, error)
+            raise
+
+    return async_generator_wrapper
+
+
+class _IterationTiming:
+    """Measures the items produced by a generator over time."""
+
+    def __init__(self):
+        self.start_time = perf_counter_ns()
+        self.first_item_time_ns: Optional[int] = None
+        self.n_items = 0
+        self.finished = False
+
+    def add_item(self) -> None:
+        if self.first_item_time_ns is None:
+            self.first_item_time_ns = perf_counter_ns() - self.start_time
+        self.n_items += 1
+
+    def finish(
+        self, timer: _CallTimer, started: Optional[tuple], result: Any = None
+    ) -> None:
+        """Reports the iteration if the call was sampled."""
+        self.finished = True
+        if started is None:
+            return
+        exec_time_ns = perf_counter_ns() - self.start_time
+        first_item_time = None
+        if self.first_item_time_ns is not None:
+            first_item_time = self.first_item_time_ns / 1e9
+        details = {
+            "time to first item": f"{first_item_time} seconds",
+            "items": self.n_items,
+            "items per second": self.n_items / exec_time_ns * 1e9
+            if exec_time_ns
+            else 0.0,
+        }
+        timer.finish(started, exec_time_ns, result, details)
+
+
+def memoize_dec(
+    function: None = None,
+    max_bytes: int = 256 * 2**20,
+    disk_dir: Optional[str] = None,
+    disk_max_bytes: int = 2**30,
+) -> Callable:
+    """Decorator that caches the output of a function by a fingerprint of the content of its \
+        arguments, e.g. to not recompute the same features of the same DataFrame.
+
+    Arguments are fingerprinted by :func:`~extra_ds_tools.decorators.cache.content_hash`
+    after binding them to the parameters, so a positional and a keyword argument, or an
+    omitted default, are the same. Outputs are kept in memory up to a total
+    :func:`~extra_ds_tools.decorators.cache.deep_memory_footprint` of ``max_bytes``, including
+    the items of tuples, lists and dictionaries like ``(X_train, X_test)``, forgetting the least
+    recently used outputs first, and optionally pickled to a directory, where they're kept
+    between runs. A call with an argument that can't be fingerprinted isn't cached.
+
+    Like :func:`functools.lru_cache`, a cached output is returned itself and not a copy, so it
+    shouldn't be mutated. The decorated function has the methods ``cache_info()`` and
+    ``cache_clear()``.
+
+    Parameters
+    ----------
+    function : None, optional
+        For compatability and should always be None, by default None
+    max_bytes : int, optional
+        The maximum total memory footprint of the outputs kept in memory, by default 256 MiB
+    disk_dir : Optional[str], optional
+        If set outputs are also pickled to files in this directory, by default None
+    disk_max_bytes : int, optional
+        The maximum total size of the files in disk_dir, which deletes the least recently used
+        files first, by default 1 GiB
+
+    Returns
+    -------
+    Callable
+        The decorated function.
+
+    Examples
+    --------
+    >>> @memoize_dec(disk_dir='feature_cache')
+    >>> def rolling_features(df: pd.DataFrame, window: int = 7) -> pd.DataFrame:
+    >>>     return df.rolling(window).agg(['mean', 'std'])
+    >>>
+    >>> df = pd.DataFrame(np.random.rand(1_000_000, 4))
+    >>> features = rolling_features(df)
+    >>> features = rolling_features(df.copy(), window=7)
+    >>> rolling_features.cache_info()
+    {'hits': 1, 'disk_hits': 0, 'misses': 1, 'uncached': 0, 'items': 1, 'bytes': 64000128}
+
+    See Also
+    --------
+    Uses:
+    :func:`~extra_ds_tools.decorators.cache.content_hash`
+    :class:`~extra_ds_tools.decorators.cache.MemoryCache`
+    :class:`~extra_ds_tools.decorators.cache.DiskCache`
+    """  # noqa
+
+    # the options are kept to decorate the function again after unpickling
+    options = dict(locals())
+    del options["function"]
+
+    def _memoize(func):
+        return _MemoizedFunction(func, **options)
 
     if function:
-        return _timeit(function)
-    return _timeit
+        return _memoize(function)
+    return _memoize
+
+
+class _MemoizedFunction:
+    """A function decorated by :func:`memoize_dec`."""
+
+    def __init__(
+        self,
+        func: Callable,
+        max_bytes: int,
+        disk_dir: Optional[str],
+        disk_max_bytes: int,
+    ):
+        update_wrapper(self, func)
+        self._options = {
+            "max_bytes": max_bytes,
+            "disk_dir": disk_dir,
+            "disk_max_bytes": disk_max_bytes,
+        }
+        self._name = f"{func.__module__}.{func.__qualname__}"
+        try:
+            self._signature: Optional[inspect.Signature] = inspect.signature(
+                func
+            )
+        except ValueError:
+            # functions without a signature, e.g. some builtins
+            self._signature = None
+        self._memory = MemoryCache(max_bytes)
+        self._disk = DiskCache(disk_dir, disk_max_bytes) if disk_dir else None
+        self._counts = {"hits": 0, "disk_hits": 0, "misses": 0, "uncached": 0}
+
+    def __call__(self, *args, **kwargs):
+        key = self._key(args, kwargs)
+        if key is None:
+            self._counts["uncached"] += 1
+            return self.__wrapped__(*args, **kwargs)
+        found, result = self._memory.lookup(key)
+        if found:
+            self._counts["hits"] += 1
+            return result
+        if self._disk is not None:
+            found, result = self._disk.lookup(key)
+            if found:
+                self._counts["disk_hits"] += 1
+                self._memory.put(key, result, deep_memory_footprint(result))
+                return result
+        self._counts["misses"] += 1
+        result = self.__wrapped__(*args, **kwargs)
+        self._memory.put(key, result, deep_memory_footprint(result))
+        if self._disk is not None:
+            try:
+                self._disk.put(key, result)
+            except TypeError:
+                # an output that can't be pickled is only kept in memory
+                pass
+        return result
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        # bound like a function when it's a method
+        if instance is None:
+            return self
+        return MethodType(self, instance)
+
+    def __reduce__(self) -> Union[str, tuple]:
+        if _import_name(self.__module__, self.__qualname__) is self:
+            return self.__qualname__
+        return _memoize_again, (self.__wrapped__, self._options)
+
+    def cache_info(self) -> Dict[str, int]:
+        """Returns the number of calls whose output was found in memory, on \
+            disk, wasn't found or wasn't cacheable, and the number of outputs \
+                and their bytes in memory."""
+        return {
+            **self._counts,
+            "items": len(self._memory),
+            "bytes": self._memory.nbytes,
+        }
+
+    def cache_clear(self) -> None:
+        """Forgets all cached outputs, in memory and on disk."""
+        self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def _key(self, args: tuple, kwargs: dict) -> Optional[str]:
+        """Returns the fingerprint of a call, None if an argument can't be \
+            fingerprinted."""
+        arguments: Any = (args, kwargs)
+        if self._signature is not None:
+            bound = self._signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+        try:
+            return content_hash(self._name, arguments)
+        except TypeError:
+            return None
+
+
+def _memoize_again(func: Callable, options: dict) -> Callable:
+    """Decorates an unpickled function with the options of its decorator."""
+    return memoize_dec(**options)(func)
@@ -0,0 +1,329 @@
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence
+
+from extra_ds_tools.decorators.stats import (
+    LatencyHistogram,
+    StatsRegistry,
+    default_registry,
+)
+
+# the upper bounds in seconds of the buckets of the latency histograms
+DEFAULT_BUCKETS = (
+    0.00001,
+    0.0001,
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+)
+
+# the content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# the prefix of the names of the metrics
+_PREFIX = "extra_ds_tools"
+
+# the type and description of every metric, in the order they're rendered
+_METRICS = {
+    "calls_total": ("counter", "Number of calls of a decorated function."),
+    "errors_total": (
+        "counter",
+        "Number of calls of a decorated function that raised an exception.",
+    ),
+    "call_duration_seconds": (
+        "histogram",
+        "Duration of the timed calls of a decorated function.",
+    ),
+}
+
+
+def render_prometheus(
+    registry: Optional[StatsRegistry] = None,
+    buckets: Sequence[float] = DEFAULT_BUCKETS,
+) -> str:
+    """Renders the call counts, error counts and latency histograms of \
+        decorated functions in the Prometheus text exposition format.
+
+    The statistics are read with :meth:`~extra_ds_tools.decorators.stats.StatsRegistry.peek`,
+    without taking locks, so rendering never blocks a timed call. Every function is a
+    ``function`` label with these metrics:
+
+    - ``extra_ds_tools_calls_total``, the number of calls, also those that weren't timed
+      or raised an exception.
+    - ``extra_ds_tools_errors_total``, the number of calls that raised an exception.
+    - ``extra_ds_tools_call_duration_seconds``, a histogram of the duration of the timed
+      calls that returned. Durations are kept in buckets that are at most 3% wide, so a
+      duration just above a bucket bound can be counted in the next bucket.
+
+    Parameters
+    ----------
+    registry : Optional[StatsRegistry], optional
+        The statistics to render, by default those of
+        :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`
+    buckets : Sequence[float], optional
+        The upper bounds in seconds of the histogram buckets, by default
+        :data:`DEFAULT_BUCKETS`
+
+    Returns
+    -------
+    str
+        The metrics in the text exposition format.
+
+    Examples
+    --------
+    >>> @timeit_arg_info_dec(print_output=False, param_info=False)
+    >>> def add(a, b):
+    >>>     return a + b
+    >>>
+    >>> add(1, 2)
+    >>> print(render_prometheus(buckets=[0.001, 1.0]))
+    # HELP extra_ds_tools_calls_total Number of calls of a decorated function.
+    # TYPE extra_ds_tools_calls_total counter
+    extra_ds_tools_calls_total{function="__main__.add"} 1
+    # HELP extra_ds_tools_errors_total Number of calls of a decorated function that raised an exception.
+    # TYPE extra_ds_tools_errors_total counter
+    extra_ds_tools_errors_total{function="__main__.add"} 0
+    # HELP extra_ds_tools_call_duration_seconds Duration of the timed calls of a decorated function.
+    # TYPE extra_ds_tools_call_duration_seconds histogram
+    extra_ds_tools_call_duration_seconds_bucket{function="__main__.add",le="0.001"} 1
+    extra_ds_tools_call_duration_seconds_bucket{function="__main__.add",le="1.0"} 1
+    extra_ds_tools_call_duration_seconds_bucket{function="__main__.add",le="+Inf"} 1
+    extra_ds_tools_call_duration_seconds_sum{function="__main__.add"} 1.4e-06
+    extra_ds_tools_call_duration_seconds_count{function="__main__.add"} 1
+
+    See Also
+    --------
+    Used by:
+    :class:`MetricsServer`
+    """  # noqa
+    registry = registry if registry is not None else default_registry
+    peeks = sorted(registry.peek(), key=lambda peek: peek["function"])
+    bounds = sorted(buckets)
+    lines: Dict[str, List[str]] = {name: [] for name in _METRICS}
+    for peek in peeks:
+        label = f'function="{_escape(peek["function"])}"'
+        lines["calls_total"].append(
+            f"{_PREFIX}_calls_total{{{label}}} {peek['calls']}"
+        )
+        lines["errors_total"].append(
+            f"{_PREFIX}_errors_total{{{label}}} {peek['errors']}"
+        )
+        lines["call_duration_seconds"].extend(
+            _histogram_lines(label, peek, bounds)
+        )
+    output = []
+    for name, (metric_type, description) in _METRICS.items():
+        output.append(f"# HELP {_PREFIX}_{name} {description}")
+        output.append(f"# TYPE {_PREFIX}_{name} {metric_type}")
+        output.extend(lines[name])
+    return "\n".join(output) + "\n"
+
+
+def _histogram_lines(
+    label: str, peek: dict, buckets: List[float]
+) -> List[str]:
+    """Returns the cumulative bucket counts, sum and count of the \
+        histogram of a function, for sorted bucket bounds in seconds."""
+    bounds_ns = [bound * 1e9 for bound in buckets]
+    histogram = LatencyHistogram(peek["significant_bits"])
+    counts = [0] * (len(bounds_ns) + 1)
+    for index, count in peek["histogram"].items():
+        # the largest duration in the bucket decides its upper bound
+        largest_ns = histogram.bucket_bounds(index)[1] - 1
+        counts[bisect_left(bounds_ns, largest_ns)] += count
+    name = f"{_PREFIX}_call_duration_seconds"
+    lines = []
+    cumulative = 0
+    for bound, count in zip([*map(float, buckets), "+Inf"], counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{label},le="{bound}"}} {cumulative}')
+    lines.append(f"{name}_sum{{{label}}} {peek['total_ns'] / 1e9}")
+    lines.append(f"{name}_count{{{label}}} {cumulative}")
+    return lines
+
+
+def _escape(value: str) -> str:
+    """Escapes a label value of the text exposition format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsServer:
+    """Serves the statistics of decorated functions to Prometheus, or any \
+        other scraper, on a local HTTP endpoint.
+
+    Every request to ``/metrics`` is answered with the output of
+    :func:`render_prometheus` by a thread of the server, which only reads
+    the statistics, so scraping doesn't slow down or block the timed calls.
+    Other paths are answered with 404. The server listens on localhost by
+    default and runs on daemon threads, so it doesn't keep the process
+    alive.
+
+    Parameters
+    ----------
+    host : str, optional
+        The address to listen on, by default "127.0.0.1"
+    port : int, optional
+        The port to listen on, or 0 for a free port, by default 9464
+    registry : Optional[StatsRegistry], optional
+        The statistics to serve, by default those of
+        :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`
+    buckets : Sequence[float], optional
+        The upper bounds in seconds of the histogram buckets, by default
+        :data:`DEFAULT_BUCKETS`
+
+    Examples
+    --------
+    >>> server = MetricsServer(port=9464).start()
+    >>> server.url
+    'http://127.0.0.1:9464/metrics'
+    >>> # curl http://127.0.0.1:9464/metrics
+    >>> server.close()
+
+    See Also
+    --------
+    Uses:
+    :func:`render_prometheus`
+    """  # noqa
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 9464,
+        registry: Optional[StatsRegistry] = None,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self.buckets = buckets
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """The URL of the metrics endpoint."""
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def start(self) -> "MetricsServer":
+        """Starts serving on a background thread, unless already serving.
+
+        Returns
+        -------
+        MetricsServer
+            The server itself, with its port set to the port it listens on.
+
+        Raises
+        ------
+        OSError
+            If the port is in use.
+        """
+        if self._server is not None:
+            return self
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.render = self.render  # type: ignore[attr-defined]
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="extra-ds-tools-metrics",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def render(self) -> str:
+        """Returns the served metrics.
+
+        Returns
+        -------
+        str
+            The output of :func:`render_prometheus`.
+        """
+        return render_prometheus(self.registry, self.buckets)
+
+    def close(self) -> None:
+        """Stops serving and frees the port."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = self._thread = None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answers requests to the metrics endpoint."""
+
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.render().encode()  # type: ignore[attr-defined]
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        # scrapes aren't written to stderr
+        pass
+
+
+def start_metrics_server(
+    port: int = 9464,
+    host: str = "127.0.0.1",
+    registry: Optional[StatsRegistry] = None,
+) -> MetricsServer:
+    """Serves the call counts, error counts and latency histograms of the \
+        functions decorated by \
+            :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec` \
+                in the Prometheus text format on a local HTTP endpoint.
+
+    Parameters
+    ----------
+    port : int, optional
+        The port to listen on, or 0 for a free port, by default 9464
+    host : str, optional
+        The address to listen on, by default "127.0.0.1"
+    registry : Optional[StatsRegistry], optional
+        The statistics to serve, by default those of timeit_arg_info_dec
+
+    Returns
+    -------
+    MetricsServer
+        The started server, see :meth:`MetricsServer.close` to stop it.
+
+    Raises
+    ------
+    OSError
+        If the port is in use.
+
+    Examples
+    --------
+    >>> @timeit_arg_info_dec(print_output=False, param_info=False, sample_rate=0.01)
+    >>> def score(features):
+    >>>     return model.predict(features)
+    >>>
+    >>> server = start_metrics_server(port=9464)
+    >>> # curl -s http://127.0.0.1:9464/metrics | grep score
+
+    See Also
+    --------
+    Uses:
+    :class:`MetricsServer`
+    """  # noqa
+    return MetricsServer(host, port, registry).start()
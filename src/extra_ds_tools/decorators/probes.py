@@ -0,0 +1,658 @@
+import cProfile
+import gc
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from time import perf_counter_ns, process_time_ns, time_ns
+from types import CodeType, FrameType
+from typing import Any, Dict, List, Optional
+
+from extra_ds_tools.decorators.report import render_table
+from extra_ds_tools.decorators.stats import FunctionStats
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+try:
+    from time import thread_time_ns
+except ImportError:  # not available on every platform
+    thread_time_ns = None
+
+# resetting the peak of tracemalloc was added in python 3.9
+_reset_peak = getattr(tracemalloc, "reset_peak", None)
+
+
+class MemoryProbe:
+    """Measures the memory used by a call: the peak of the memory allocated \
+        by python during the call, the memory still allocated after the call \
+            and the change of the resident set size (RSS) of the process.
+
+    Python allocations are traced with :mod:`tracemalloc`, which is started
+    for the outermost measured call and stopped after it, unless it was
+    already tracing. Allocations of other threads during the call are
+    included. The RSS is only available on Linux.
+
+    Examples
+    --------
+    >>> probe = MemoryProbe()
+    >>> token = probe.start()
+    >>> data = list(range(1_000_000))
+    >>> probe.stop(token)
+    {'peak memory': '38.6 MiB', 'retained memory': '38.6 MiB', 'RSS delta': '38.9 MiB'}
+
+    See Also
+    --------
+    Used by:
+    :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`
+    """  # noqa
+
+    # the state of every measured call in progress, outermost first, shared
+    # by all probes as tracemalloc is global to the process
+    _active: List[list] = []
+    _started_tracing = False
+    _lock = threading.Lock()
+
+    def start(self) -> list:
+        """Starts measuring a call.
+
+        Returns
+        -------
+        list
+            The state of the call to pass to :meth:`stop`.
+        """
+        with self._lock:
+            if not MemoryProbe._active and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                MemoryProbe._started_tracing = True
+            current, peak = tracemalloc.get_traced_memory()
+            # calls in progress keep the highest peak seen before a reset
+            for state in MemoryProbe._active:
+                state[1] = max(state[1], peak)
+            if _reset_peak is not None:
+                _reset_peak()
+                peak = current
+            state = [current, peak, _current_rss()]
+            MemoryProbe._active.append(state)
+        return state
+
+    def stop(self, state: list) -> Dict[str, Any]:
+        """Stops measuring a call.
+
+        Parameters
+        ----------
+        state : list
+            The state returned by :meth:`start`.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The peak, retained and RSS change of memory of the call.
+        """
+        rss = _current_rss()
+        with self._lock:
+            current, peak = tracemalloc.get_traced_memory()
+            start_current, _, start_rss = state
+            peak = max(peak, state[1])
+            MemoryProbe._active = [
+                other for other in MemoryProbe._active if other is not state
+            ]
+            for outer_state in MemoryProbe._active:
+                outer_state[1] = max(outer_state[1], peak)
+            if not MemoryProbe._active and MemoryProbe._started_tracing:
+                tracemalloc.stop()
+                MemoryProbe._started_tracing = False
+        return {
+            "peak memory": format_bytes(peak - start_current),
+            "retained memory": format_bytes(current - start_current),
+            "RSS delta": format_bytes(rss - start_rss)
+            if rss is not None and start_rss is not None
+            else "unavailable",
+        }
+
+
+class ResourceProbe:
+    """Measures what a call spent its time on besides wall time: the CPU \
+        time of the process and of the calling thread, page faults and context \
+            switches of the process and garbage collections with their pause time.
+
+    Page faults and context switches come from :func:`resource.getrusage` and
+    are unavailable on Windows. Garbage collections are counted with
+    :data:`gc.callbacks`, including those triggered by other threads during
+    the call.
+
+    Parameters
+    ----------
+    stats : Optional[FunctionStats], optional
+        If set the measurements of every call stopped with :meth:`stop` are
+        added to these statistics, by default None
+
+    Examples
+    --------
+    >>> probe = ResourceProbe()
+    >>> token = probe.start()
+    >>> sum(range(10_000_000))
+    >>> probe.stop(token)
+    {'cpu time': '0.21 seconds (process), 0.21 seconds (thread)',
+    'page faults': '0 minor, 0 major',
+    'context switches': '0 voluntary, 2 involuntary',
+    'gc': '0 collections, 0.0 seconds paused'}
+
+    See Also
+    --------
+    Used by:
+    :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`
+    """  # noqa
+
+    def __init__(self, stats: Optional[FunctionStats] = None):
+        self.stats = stats
+        _GC_MONITOR.install()
+
+    def start(self) -> tuple:
+        """Starts measuring a call.
+
+        Returns
+        -------
+        tuple
+            The state of the call to pass to :meth:`stop`.
+        """
+        return (
+            process_time_ns(),
+            thread_time_ns() if thread_time_ns is not None else None,
+            _rusage_counters(),
+            _GC_MONITOR.collections,
+            _GC_MONITOR.pause_ns,
+        )
+
+    def stop(self, state: tuple) -> Dict[str, Any]:
+        """Stops measuring a call.
+
+        Parameters
+        ----------
+        state : tuple
+            The state returned by :meth:`start`.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The CPU time, page faults, context switches and garbage
+            collections of the call.
+        """
+        process_ns = process_time_ns() - state[0]
+        thread_ns = None
+        if thread_time_ns is not None:
+            thread_ns = thread_time_ns() - state[1]
+        rusage = _rusage_counters()
+        counters = {
+            "cpu_s": process_ns / 1e9,
+            "gc_collections": _GC_MONITOR.collections - state[3],
+            "gc_pause_s": (_GC_MONITOR.pause_ns - state[4]) / 1e9,
+        }
+        if rusage is not None:
+            for name, value in rusage.items():
+                counters[name] = value - state[2][name]
+        if self.stats is not None:
+            self.stats.add_counters(counters)
+
+        cpu_time = f"{counters['cpu_s']} seconds (process)"
+        if thread_ns is not None:
+            cpu_time += f", {thread_ns / 1e9} seconds (thread)"
+        details = {"cpu time": cpu_time}
+        if rusage is not None:
+            details["page faults"] = (
+                f"{counters['minor_faults']} minor, "
+                f"{counters['major_faults']} major"
+            )
+            details["context switches"] = (
+                f"{counters['voluntary_switches']} voluntary, "
+                f"{counters['involuntary_switches']} involuntary"
+            )
+        details["gc"] = (
+            f"{counters['gc_collections']} collections, "
+            f"{counters['gc_pause_s']} seconds paused"
+        )
+        return details
+
+    def abort(self, state: tuple) -> None:
+        """Stops measuring a call that raised an exception, without adding \
+            its measurements to the statistics.
+
+        Parameters
+        ----------
+        state : tuple
+            The state returned by :meth:`start`.
+        """
+
+
+class _GCMonitor:
+    """Counts garbage collections and their pause time with a callback."""
+
+    def __init__(self):
+        self.collections = 0
+        self.pause_ns = 0
+        self._start_time: Optional[int] = None
+        self._installed = False
+        self._lock = threading.Lock()
+
+    def install(self) -> None:
+        with self._lock:
+            if not self._installed:
+                gc.callbacks.append(self._callback)
+                self._installed = True
+
+    def _callback(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self._start_time = perf_counter_ns()
+        elif self._start_time is not None:
+            self.pause_ns += perf_counter_ns() - self._start_time
+            self.collections += 1
+            self._start_time = None
+
+
+_GC_MONITOR = _GCMonitor()
+
+
+def _rusage_counters() -> Optional[Dict[str, int]]:
+    """Returns the page faults and context switches of the process, None if \
+        they aren't available on this platform."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return {
+        "minor_faults": usage.ru_minflt,
+        "major_faults": usage.ru_majflt,
+        "voluntary_switches": usage.ru_nvcsw,
+        "involuntary_switches": usage.ru_nivcsw,
+    }
+
+
+class ProfileProbe:
+    """Runs a call under :mod:`cProfile` and reports the functions with the \
+        most cumulative time, optionally only for slow calls.
+
+    As a call can only be known to be slow after it ran, every call is
+    profiled and the profile of a fast call is discarded. Profiling slows
+    down python code, so the measured time of a profiled call is higher.
+    Only one call is profiled at a time: calls made while another call is
+    profiled are part of that profile. For coroutines and generators the
+    profile also includes the code that runs while the call is suspended.
+
+    Parameters
+    ----------
+    name : str
+        The qualified name of the function, used in the name of dumped files.
+    top_n : int, optional
+        The number of functions reported, by default 10
+    min_seconds : Optional[float], optional
+        If set only calls that took at least this many seconds are reported,
+        by default None
+    dump_dir : Optional[str], optional
+        If set the profile of every reported call is also dumped to a
+        ``.pstats`` file in this directory, by default None
+
+    Examples
+    --------
+    >>> def sort_as_text(n):
+    >>>     return sorted(range(n), key=str)
+    >>>
+    >>> probe = ProfileProbe('module.sort_as_text', top_n=2)
+    >>> token = probe.start()
+    >>> sort_as_text(300_000)
+    >>> print(probe.stop(token)['profile'])
+        function                              ncalls    tottime    cumtime
+    --  ----------------------------------  --------  ---------  ---------
+     0  <stdin>:1(sort_as_text)                    1    1.1e-05   0.096435
+     1  {built-in method builtins.sorted}          1   0.096424   0.096424
+
+    See Also
+    --------
+    Used by:
+    :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`
+    """  # noqa
+
+    # whether a call is being profiled, as profilers can't be nested
+    _active = False
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        name: str,
+        top_n: int = 10,
+        min_seconds: Optional[float] = None,
+        dump_dir: Optional[str] = None,
+    ):
+        if top_n < 1:
+            raise ValueError(f"top_n must be >= 1, got {top_n}")
+        self.name = name
+        self.top_n = top_n
+        self.min_seconds = min_seconds
+        self.dump_dir = dump_dir
+
+    def start(self) -> Optional[tuple]:
+        """Starts profiling a call, unless another call is being profiled.
+
+        Returns
+        -------
+        Optional[tuple]
+            The state of the call to pass to :meth:`stop`.
+        """
+        with self._lock:
+            if ProfileProbe._active:
+                return None
+            ProfileProbe._active = True
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # another profiler, e.g. of the user, is already running
+            ProfileProbe._active = False
+            return None
+        return profile, perf_counter_ns()
+
+    def stop(self, state: Optional[tuple]) -> Dict[str, Any]:
+        """Stops profiling a call.
+
+        Parameters
+        ----------
+        state : Optional[tuple]
+            The state returned by :meth:`start`.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The functions with the most cumulative time and the path of the
+            dumped file, empty if the call wasn't profiled or was fast.
+        """
+        if state is None:
+            return {}
+        profile, start_time = state
+        profile.disable()
+        ProfileProbe._active = False
+        duration = (perf_counter_ns() - start_time) / 1e9
+        if self.min_seconds is not None and duration < self.min_seconds:
+            return {}
+        stats = pstats.Stats(profile)
+        details = {"profile": "\n" + render_table(self._top_functions(stats))}
+        if self.dump_dir is not None:
+            path = os.path.join(
+                self.dump_dir, f"{self.name}-{time_ns()}.pstats"
+            )
+            stats.dump_stats(path)
+            details["profile file"] = path
+        return details
+
+    def abort(self, state: Optional[tuple]) -> None:
+        """Stops profiling a call that raised an exception, without \
+            reporting or dumping its profile.
+
+        Parameters
+        ----------
+        state : Optional[tuple]
+            The state returned by :meth:`start`.
+        """
+        if state is None:
+            return
+        profile, _ = state
+        profile.disable()
+        ProfileProbe._active = False
+
+    def _top_functions(self, stats: pstats.Stats) -> List[dict]:
+        """Returns the functions with the most cumulative time."""
+        rows = sorted(
+            stats.stats.items(),  # type: ignore
+            key=lambda item: item[1][3],
+            reverse=True,
+        )[: self.top_n]
+        return [
+            {
+                "function": pstats.func_std_string(function),
+                "ncalls": n_calls,
+                "tottime": round(total_time, 6),
+                "cumtime": round(cumulative_time, 6),
+            }
+            for function, (_, n_calls, total_time, cumulative_time, _) in rows
+        ]
+
+
+class StackSamplingProbe:
+    """Samples the stack of the thread running a call at a fixed interval \
+        and reports where the call spent its time, for calls too long to \
+            profile deterministically.
+
+    A background thread captures the stack of the calling thread with
+    :func:`sys._current_frames` every interval, so the overhead is bounded by
+    the interval, and counts the stacks in collapsed form: the frames from the
+    decorated function down, separated by ``;``. Collapsed stacks can be
+    turned into a flame graph by e.g. flamegraph.pl or speedscope. Samples
+    without the decorated function on the stack, e.g. while a coroutine
+    awaits, are left out.
+
+    Parameters
+    ----------
+    name : str
+        The qualified name of the function, used in the name of written files.
+    code : Optional[CodeType], optional
+        The code of the decorated function, frames above its first frame are
+        left out of the stacks. If None whole stacks are kept, by default None
+    interval : float, optional
+        The number of seconds between samples, by default 0.01
+    top_n : int, optional
+        The number of frames reported with the most samples, by default 5
+    output_dir : Optional[str], optional
+        If set the collapsed stacks of every call are written to a
+        ``.folded`` file in this directory, by default None
+
+    Examples
+    --------
+    >>> probe = StackSamplingProbe('module.sort_as_text', sort_as_text.__code__)
+    >>> token = probe.start()
+    >>> sort_as_text(3_000_000)
+    >>> details = probe.stop(token)
+    >>> details['stack samples']
+    96
+    >>> print(details['hottest frames'])
+        frame                         samples    percentage
+    --  --------------------------  ---------  ------------
+     0  sort_as_text (<stdin>:1)           96           100
+
+    See Also
+    --------
+    Used by:
+    :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`
+    """  # noqa
+
+    def __init__(
+        self,
+        name: str,
+        code: Optional[CodeType] = None,
+        interval: float = 0.01,
+        top_n: int = 5,
+        output_dir: Optional[str] = None,
+    ):
+        if interval <= 0:
+            raise ValueError(f"interval must be > 0, got {interval}")
+        self.name = name
+        self.code = code
+        self.interval = interval
+        self.top_n = top_n
+        self.output_dir = output_dir
+
+    def start(self) -> tuple:
+        """Starts sampling the stack of the calling thread.
+
+        Returns
+        -------
+        tuple
+            The state of the call to pass to :meth:`stop`.
+        """
+        stacks: Counter = Counter()
+        stop_event = threading.Event()
+        sampler = threading.Thread(
+            target=self._sample,
+            args=(threading.get_ident(), stacks, stop_event),
+            name=f"stack-sampler-{self.name}",
+            daemon=True,
+        )
+        sampler.start()
+        return sampler, stacks, stop_event
+
+    def stop(self, state: tuple) -> Dict[str, Any]:
+        """Stops sampling and reports the stacks of the call.
+
+        Parameters
+        ----------
+        state : tuple
+            The state returned by :meth:`start`.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The number of samples, the frames with the most samples and the
+            path of the written file.
+        """
+        sampler, stacks, stop_event = state
+        stop_event.set()
+        sampler.join()
+        n_samples = sum(stacks.values())
+        details: Dict[str, Any] = {"stack samples": n_samples}
+        if n_samples:
+            details["hottest frames"] = "\n" + render_table(
+                self._hottest_frames(stacks, n_samples)
+            )
+        if self.output_dir is not None:
+            path = os.path.join(
+                self.output_dir, f"{self.name}-{time_ns()}.folded"
+            )
+            with open(path, "w") as file:
+                file.write(collapsed_stacks(stacks))
+            details["collapsed stacks"] = path
+        return details
+
+    def abort(self, state: tuple) -> None:
+        """Stops sampling a call that raised an exception, without \
+            reporting or writing its stacks.
+
+        Parameters
+        ----------
+        state : tuple
+            The state returned by :meth:`start`.
+        """
+        sampler, _, stop_event = state
+        stop_event.set()
+        sampler.join()
+
+    def _sample(
+        self, thread_id: int, stacks: Counter, stop_event: threading.Event
+    ) -> None:
+        """Counts the stacks of a thread until the stop event is set."""
+        while not stop_event.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                return
+            stack = self._collapse(frame)
+            if stack is not None:
+                stacks[stack] += 1
+
+    def _collapse(self, frame: Optional[FrameType]) -> Optional[str]:
+        """Returns a stack as its frames from the decorated function down, \
+            separated by semicolons, None if the function isn't on it."""
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            labels.append(
+                f"{code.co_name} ({os.path.basename(code.co_filename)}:"
+                f"{code.co_firstlineno})".replace(";", ",")
+            )
+            if code is self.code:
+                break
+            frame = frame.f_back
+        if frame is None and self.code is not None:
+            return None
+        return ";".join(reversed(labels))
+
+    def _hottest_frames(self, stacks: Counter, n_samples: int) -> List[dict]:
+        """Returns the innermost frames with the most samples."""
+        frames: Counter = Counter()
+        for stack, count in stacks.items():
+            frames[stack.rsplit(";", 1)[-1]] += count
+        return [
+            {
+                "frame": frame,
+                "samples": count,
+                "percentage": round(100 * count / n_samples, 1),
+            }
+            for frame, count in frames.most_common(self.top_n)
+        ]
+
+
+def collapsed_stacks(stacks: Dict[str, int]) -> str:
+    """Returns stacks with their number of samples in the collapsed format \
+        of flame graph tools.
+
+    Parameters
+    ----------
+    stacks : Dict[str, int]
+        Per stack, as frames separated by semicolons from the outermost
+        down, its number of samples.
+
+    Returns
+    -------
+    str
+        A line per stack with the stack and its number of samples, most
+        samples first.
+
+    Examples
+    --------
+    >>> print(collapsed_stacks({'main;load': 3, 'main;load;parse': 7}))
+    main;load;parse 7
+    main;load 3
+    """
+    return "".join(
+        f"{stack} {count}\n"
+        for stack, count in sorted(
+            stacks.items(), key=lambda item: item[1], reverse=True
+        )
+    )
+
+
+def format_bytes(n_bytes: float) -> str:
+    """Returns an amount of bytes as a human readable string.
+
+    Parameters
+    ----------
+    n_bytes : float
+        An amount of bytes, can be negative.
+
+    Returns
+    -------
+    str
+        The amount in B, KiB, MiB, GiB or TiB.
+
+    Examples
+    --------
+    >>> format_bytes(1536)
+    '1.5 KiB'
+    >>> format_bytes(-200)
+    '-200 B'
+    """
+    if abs(n_bytes) < 1024:
+        return f"{n_bytes:.0f} B"
+    for unit in ("KiB", "MiB", "GiB"):
+        n_bytes /= 1024
+        if abs(n_bytes) < 1024:
+            return f"{n_bytes:.1f} {unit}"
+    return f"{n_bytes / 1024:.1f} TiB"
+
+
+def _current_rss() -> Optional[int]:
+    """Returns the resident set size of the process in bytes, None if it \
+        isn't available on this platform."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
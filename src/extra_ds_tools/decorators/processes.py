@@ -0,0 +1,169 @@
+import json
+import multiprocessing
+import os
+from glob import glob
+from multiprocessing.util import Finalize, register_after_fork
+from time import time_ns
+from typing import Callable, Dict, Optional
+
+from extra_ds_tools.decorators.stats import (
+    FunctionStats,
+    StatsRegistry,
+    default_registry,
+)
+
+# the environment variable with the directory to which child processes write
+# their statistics, set by share_stats and inherited by child processes
+STATS_DIR_ENV_VAR = "EXTRA_DS_TOOLS_STATS_DIR"
+
+# the process that registered the export of its statistics
+_exporting_pid: Optional[int] = None
+
+
+def run_at_exit(callback: Callable, *args) -> None:
+    """Runs a callback when the current process exits, also in the child \
+        processes of :mod:`multiprocessing`, which don't run :mod:`atexit` \
+            handlers.
+
+    A forked child process doesn't inherit the callbacks of its parent.
+
+    Parameters
+    ----------
+    callback : Callable
+        The function to run.
+    *args
+        The arguments of the function.
+
+    See Also
+    --------
+    Used by:
+    :class:`~extra_ds_tools.decorators.trace.ChromeTraceWriter`
+    :class:`~extra_ds_tools.decorators.sinks.BackgroundWriter`
+    """  # noqa
+    Finalize(None, callback, args, exitpriority=0)
+
+
+def share_stats(directory: Optional[str]) -> None:
+    """Lets child processes, e.g. the workers of a process pool, send the \
+        latency statistics of their decorated functions to this process.
+
+    Every child process started afterwards writes the statistics of
+    :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`
+    to a file in the directory when it exits, and :func:`collect_stats` adds
+    them to the statistics of this process. A forked child process forgets
+    the statistics it inherited, so calls are counted once. Workers exit when
+    a :class:`~concurrent.futures.ProcessPoolExecutor` shuts down or a
+    :class:`multiprocessing.pool.Pool` is closed and joined, but not when a
+    pool is terminated.
+
+    Parameters
+    ----------
+    directory : Optional[str]
+        The directory of the statistics files, created if it doesn't exist, or
+        None to stop sharing.
+
+    Examples
+    --------
+    >>> @timeit_arg_info_dec(print_output=False, param_info=False)
+    >>> def square(x):
+    >>>     return x * x
+    >>>
+    >>> if __name__ == '__main__':
+    >>>     share_stats('worker_stats')
+    >>>     with ProcessPoolExecutor(4) as executor:
+    >>>         list(executor.map(square, range(1000)))
+    >>>     collect_stats()
+    >>>     print_stats()
+        function           calls    sampled    total_s      mean_s       p50_s       p95_s       p99_s       max_s
+    --  ---------------  -------  ---------  ---------  ----------  ----------  ----------  ----------  ----------
+     0  __main__.square     1000       1000  0.0004012  4.012e-07  3.8e-07     5.2e-07     1.01e-06    1.79e-05
+
+    See Also
+    --------
+    Uses:
+    :func:`collect_stats`
+    """  # noqa
+    if directory is None:
+        os.environ.pop(STATS_DIR_ENV_VAR, None)
+        return
+    os.makedirs(directory, exist_ok=True)
+    os.environ[STATS_DIR_ENV_VAR] = os.path.abspath(directory)
+
+
+def collect_stats(
+    directory: Optional[str] = None, registry: Optional[StatsRegistry] = None
+) -> Dict[str, dict]:
+    """Adds the statistics written by exited child processes to those of \
+        this process, and deletes their files.
+
+    Parameters
+    ----------
+    directory : Optional[str], optional
+        The directory of the statistics files, by default the one set by
+        :func:`share_stats`
+    registry : Optional[StatsRegistry], optional
+        The statistics the files are added to, by default those of
+        timeit_arg_info_dec
+
+    Returns
+    -------
+    Dict[str, dict]
+        Per function name the summary of its statistics over all processes,
+        see :meth:`~extra_ds_tools.decorators.stats.StatsRegistry.snapshot`.
+
+    Raises
+    ------
+    ValueError
+        If no directory is given and stats aren't shared.
+
+    See Also
+    --------
+    Used by:
+    :func:`share_stats`
+    """
+    directory = directory or os.environ.get(STATS_DIR_ENV_VAR)
+    if directory is None:
+        raise ValueError(
+            "Give a directory or share stats with share_stats() first"
+        )
+    registry = registry if registry is not None else default_registry
+    for path in sorted(glob(os.path.join(directory, "stats-*.json"))):
+        with open(path) as file:
+            data = json.load(file)
+        for name, item in data.items():
+            registry.get(name).merge(FunctionStats.from_dict(item))
+        os.remove(path)
+    return registry.snapshot()
+
+
+def _export_at_exit(registry: StatsRegistry) -> None:
+    """Makes a child process write its statistics when it exits, if its \
+        parent shares stats."""
+    global _exporting_pid
+    if STATS_DIR_ENV_VAR not in os.environ or _exporting_pid == os.getpid():
+        return
+    _exporting_pid = os.getpid()
+    # a forked child starts with the calls of its parent
+    registry.reset()
+    Finalize(None, _export_stats, (registry,), exitpriority=0)
+
+
+def _export_stats(registry: StatsRegistry) -> None:
+    """Writes the statistics of the functions with calls to a new file."""
+    directory = os.environ.get(STATS_DIR_ENV_VAR)
+    data = {name: registry.get(name).to_dict() for name in registry.snapshot()}
+    if directory is None or not data:
+        return
+    path = os.path.join(directory, f"stats-{os.getpid()}-{time_ns()}.json")
+    # written under another name first, so files are collected complete
+    with open(f"{path}.tmp", "w") as file:
+        json.dump(data, file)
+    os.replace(f"{path}.tmp", path)
+
+
+# runs in child processes after multiprocessing started them, both forked
+# and spawned ones that imported this module before
+register_after_fork(default_registry, _export_at_exit)
+if multiprocessing.parent_process() is not None:
+    # a spawned child that imports this module when it unpickles a task
+    _export_at_exit(default_registry)
@@ -0,0 +1,324 @@
+import atexit
+import multiprocessing
+import threading
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from extra_ds_tools.decorators.cache import content_hash
+from extra_ds_tools.decorators.report import render_table
+
+# the maximum number of distinct inputs remembered per function, calls with
+# other inputs are counted but not compared
+MAX_FINGERPRINTS = 100_000
+
+# the keys of the argument table that summarize an argument
+_SUMMARY_KEYS = ("param", "arg_type", "arg_value", "arg_len")
+
+# the types of arguments whose summary doesn't tell their content apart
+_ARRAY_LIKES = (np.ndarray, pd.DataFrame, pd.Series, pd.Index)
+
+
+class RepeatDetector:
+    """Finds the calls of a function with the same inputs as an earlier \
+        call, and the time spent on them, which caching could save.
+
+    Inputs are the same when their summaries in the argument table are, i.e.
+    their type, truncated value and length or shape, so different large
+    inputs can look the same. NumPy arrays and pandas objects, whose
+    summaries show little or none of their values, must also have the same
+    :func:`~extra_ds_tools.decorators.cache.content_hash`, and with
+    ``content=True`` all inputs must, which takes time in proportion to their
+    size. Inputs that can't be hashed are compared by their summaries.
+    Omitting an argument with a default value and passing its default are
+    different inputs.
+
+    Parameters
+    ----------
+    name : str
+        The qualified name of the function.
+    content : bool, optional
+        If True inputs are also compared by content, by default False
+
+    Examples
+    --------
+    >>> detector = RepeatDetector('module.func')
+    >>> for value in [1, 2, 1, 1]:
+    >>>     records = [{'param': 'x', 'arg_type': 'int', 'arg_value': str(value), 'arg_len': ''}]
+    >>>     detector.add(detector.fingerprint(records, (value,), {}), 1_000_000)
+    >>> detector.summary()
+    {'function': 'module.func',
+    'calls': 4,
+    'distinct_inputs': 2,
+    'repeated_calls': 2,
+    'repeated_s': 0.002,
+    'max_calls_per_input': 3}
+
+    See Also
+    --------
+    Used by:
+    :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`
+    """  # noqa
+
+    def __init__(self, name: str, content: bool = False):
+        self.name = name
+        self.content = content
+        self._lock = threading.Lock()
+        self.reset()
+
+    def fingerprint(
+        self, records: List[dict], args: tuple, kwargs: dict
+    ) -> str:
+        """Returns the fingerprint of the inputs of a call.
+
+        Parameters
+        ----------
+        records : List[dict]
+            The argument table of the call, see
+            :class:`~extra_ds_tools.format.ArgBinder`.
+        args : tuple
+            The positional arguments of the call.
+        kwargs : dict
+            The keyword arguments of the call.
+
+        Returns
+        -------
+        str
+            The fingerprint of the inputs.
+        """
+        summaries = [
+            [str(record.get(key, "")) for key in _SUMMARY_KEYS]
+            for record in records
+        ]
+        if self.content:
+            values: Any = (args, kwargs)
+        else:
+            # e.g. DataFrames have no summary of their values
+            values = (
+                [
+                    (position, value)
+                    for position, value in enumerate(args)
+                    if isinstance(value, _ARRAY_LIKES)
+                ],
+                sorted(
+                    (key, value)
+                    for key, value in kwargs.items()
+                    if isinstance(value, _ARRAY_LIKES)
+                ),
+            )
+        try:
+            return content_hash(summaries, *values)
+        except TypeError:
+            return content_hash(summaries)
+
+    def add(self, fingerprint: str, duration_ns: int) -> int:
+        """Adds a call with its inputs' fingerprint and duration.
+
+        Parameters
+        ----------
+        fingerprint : str
+            The fingerprint of the inputs, see :meth:`fingerprint`.
+        duration_ns : int
+            The duration of the call in nanoseconds.
+
+        Returns
+        -------
+        int
+            The number of calls with these inputs so far, including this one,
+            or 1 if the inputs aren't remembered.
+        """
+        with self._lock:
+            self.calls += 1
+            count = self._counts.get(fingerprint)
+            if count is None:
+                if len(self._counts) < MAX_FINGERPRINTS:
+                    self._counts[fingerprint] = 1
+                return 1
+            self._counts[fingerprint] = count + 1
+            self.repeated_calls += 1
+            self.repeated_ns += duration_ns
+            return count + 1
+
+    def reset(self) -> None:
+        """Forgets all added calls."""
+        with self._lock:
+            self.calls = 0
+            self.repeated_calls = 0
+            self.repeated_ns = 0
+            # fingerprint -> number of calls
+            self._counts: Dict[str, int] = {}
+
+    def summary(self) -> dict:
+        """Returns the number of calls with repeated inputs and their time.
+
+        Returns
+        -------
+        dict
+            The number of calls, distinct inputs and calls with the inputs of
+            an earlier call, the seconds spent on those calls and the largest
+            number of calls with the same inputs.
+        """
+        with self._lock:
+            return {
+                "function": self.name,
+                "calls": self.calls,
+                "distinct_inputs": len(self._counts),
+                "repeated_calls": self.repeated_calls,
+                "repeated_s": self.repeated_ns / 1e9,
+                "max_calls_per_input": max(self._counts.values(), default=0),
+            }
+
+
+class RepeatRegistry:
+    """A collection of :class:`RepeatDetector` by function name."""
+
+    def __init__(self):
+        self._detectors: Dict[str, RepeatDetector] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, content: bool = False) -> RepeatDetector:
+        """Returns the detector of a function, created if not present.
+
+        Parameters
+        ----------
+        name : str
+            The qualified name of the function.
+        content : bool, optional
+            Whether a created detector compares inputs by content, by default
+            False
+
+        Returns
+        -------
+        RepeatDetector
+            The detector of the function.
+        """
+        try:
+            return self._detectors[name]
+        except KeyError:
+            with self._lock:
+                return self._detectors.setdefault(
+                    name, RepeatDetector(name, content)
+                )
+
+    def snapshot(self) -> List[dict]:
+        """Returns the summary of every function with repeated calls, most \
+            time spent on repeated calls first.
+
+        Returns
+        -------
+        List[dict]
+            The output of :meth:`RepeatDetector.summary` per function.
+        """
+        summaries = (
+            detector.summary() for detector in list(self._detectors.values())
+        )
+        return sorted(
+            (summary for summary in summaries if summary["repeated_calls"]),
+            key=lambda summary: summary["repeated_s"],
+            reverse=True,
+        )
+
+    def reset(self) -> None:
+        """Forgets the calls of every function."""
+        for detector in list(self._detectors.values()):
+            detector.reset()
+
+    def render(self) -> str:
+        """Renders a table of the functions with repeated calls.
+
+        Returns
+        -------
+        str
+            The summaries as a table.
+        """
+        return render_table(self.snapshot())
+
+
+# the registry that collects the calls of timeit_arg_info_dec
+default_repeat_registry = RepeatRegistry()
+
+
+def snapshot_repeats() -> List[dict]:
+    """Returns the functions decorated by \
+        :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec` \
+            with ``detect_repeats`` that were called repeatedly with the same \
+                inputs, most time spent on those calls first.
+
+    Returns
+    -------
+    List[dict]
+        Per function its number of calls, distinct inputs and calls with the
+        inputs of an earlier call, the seconds spent on those calls and the
+        largest number of calls with the same inputs.
+    """  # noqa
+    return default_repeat_registry.snapshot()
+
+
+def reset_repeats() -> None:
+    """Forgets the calls of all functions decorated by \
+        :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec` \
+            with ``detect_repeats``.
+    """  # noqa
+    default_repeat_registry.reset()
+
+
+def print_repeats() -> None:
+    """Prints a table of the functions decorated by \
+        :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec` \
+            with ``detect_repeats`` that were called repeatedly with the same \
+                inputs, most time spent on those calls first, i.e. where a \
+                    cache saves the most time.
+
+    Examples
+    --------
+    >>> @timeit_arg_info_dec(detect_repeats=True, print_output=False, param_info=False)
+    >>> def load(path):
+    >>>     return pd.read_csv(path)
+    >>>
+    >>> for _ in range(3):
+    >>>     load('features.csv')
+    >>> print_repeats()
+        function          calls    distinct_inputs    repeated_calls    repeated_s    max_calls_per_input
+    --  --------------  -------  -----------------  ----------------  ------------  ---------------------
+     0  __main__.load         3                  1                 2        0.8412                      3
+    """  # noqa
+    print(default_repeat_registry.render())
+
+
+# whether print_repeats_at_exit registered the exit hook
+_registered_at_exit = False
+_registered_at_exit_lock = threading.Lock()
+
+
+def print_repeats_at_exit() -> None:
+    """Prints the table of :func:`print_repeats` when the main process \
+        exits, if any function was called repeatedly with the same inputs.
+
+    Calling it more than once prints the table once.
+
+    Examples
+    --------
+    >>> print_repeats_at_exit()
+    >>> # at exit
+    Functions called repeatedly with the same inputs:
+        function          calls    distinct_inputs    repeated_calls    repeated_s    max_calls_per_input
+    --  --------------  -------  -----------------  ----------------  ------------  ---------------------
+     0  __main__.load         3                  1                 2        0.8412                      3
+    """  # noqa
+    global _registered_at_exit
+    with _registered_at_exit_lock:
+        if not _registered_at_exit:
+            atexit.register(_print_repeats_at_exit)
+            _registered_at_exit = True
+
+
+def _print_repeats_at_exit() -> None:
+    """Prints the functions with repeated calls when the main process exits."""
+    if (
+        multiprocessing.parent_process() is None
+        and default_repeat_registry.snapshot()
+    ):
+        print(
+            "Functions called repeatedly with the same inputs:\n"
+            + default_repeat_registry.render()
+        )
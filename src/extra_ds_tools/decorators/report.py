@@ -0,0 +1,272 @@
+from time import time
+from typing import Any, Dict, List, Optional
+
+
+class CallReport:
+    """The report of a single call of a function decorated by \
+        :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`, \
+            which is only rendered to text when it's converted to a string.
+
+    Parameters
+    ----------
+    func_name : str
+        The name of the called function.
+    records : Optional[List[dict]]
+        Information about the arguments of the call as returned by
+        :func:`~extra_ds_tools.format.args_and_kwargs_repr`, None to leave out
+        the parameter table.
+    exec_time : float
+        The amount of seconds the call took.
+    result : Any
+        The returned value of the call.
+    print_output : bool, optional
+        If True the returned value is part of the report, by default True
+    details : Optional[Dict[str, Any]], optional
+        Additional measurements of the call, shown below its execution time,
+        by default None
+    timestamp : Optional[float], optional
+        The time of the call in seconds since the epoch, by default the time
+        the report is created
+
+    Examples
+    --------
+    >>> from extra_ds_tools.format import args_and_kwargs_repr
+    >>>
+    >>> def multiply_text(text: str, n: int = 1):
+    >>>     return text * n
+    >>>
+    >>> records = args_and_kwargs_repr(multiply_text, 'hello', n=2)
+    >>> report = CallReport('multiply_text', records, 1.0, 'hellohello')
+    >>> print(report)
+    multiply_text()
+    -----------------------------------------------------------------------------
+        param    type_hint      default_value  arg_type    arg_value      arg_len
+    --  -------  -----------  ---------------  ----------  -----------  ---------
+     0  text     str                           str         hello                5
+     1  n        int                        1  int         2
+
+    multiply_text() took 1.0 seconds to run.
+
+    Returned:
+    hellohello
+    -----------------------------------------------------------------------------
+    """  # noqa
+
+    __slots__ = (
+        "func_name",
+        "records",
+        "exec_time",
+        "result",
+        "print_output",
+        "details",
+        "timestamp",
+    )
+
+    def __init__(
+        self,
+        func_name: str,
+        records: Optional[List[dict]],
+        exec_time: float,
+        result: Any,
+        print_output: bool = True,
+        details: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[float] = None,
+    ):
+        self.func_name = func_name
+        self.records = records
+        self.exec_time = exec_time
+        self.result = result
+        self.print_output = print_output
+        self.details = details
+        self.timestamp = time() if timestamp is None else timestamp
+
+    def __str__(self) -> str:
+        return self.render()
+
+    def render(self) -> str:
+        """Renders the report to text.
+
+        Returns
+        -------
+        str
+            The parameter table, execution time and returned value.
+        """
+        parts = []
+        table_len = None
+        if self.records is not None:
+            table = render_table(self.records)
+            table_len = len(max(table.split("\n"), key=len))
+            parts.append(
+                f"\n\033[1m{self.func_name}()\033[0m"
+                f"\n{'-' * table_len}\n{table}"
+            )
+        parts.append(
+            f"\n{self.func_name}() took {self.exec_time} seconds to run."
+        )
+        if self.details:
+            parts.append(
+                "\n".join(
+                    f"{name}: {value}" for name, value in self.details.items()
+                )
+            )
+        if self.print_output:
+            parts.append(f"\nReturned:\n{self.result}")
+        if table_len is not None:
+            parts.append("-" * table_len)
+        return "\n".join(parts)
+
+    def to_dict(self) -> dict:
+        """Returns the report as a structured record.
+
+        Returns
+        -------
+        dict
+            The timestamp, function name and execution time, and if present
+            the information on the arguments, the additional measurements and
+            the returned value as a string.
+        """
+        record = {
+            "timestamp": self.timestamp,
+            "function": self.func_name,
+            "exec_time": self.exec_time,
+        }
+        if self.records is not None:
+            record["params"] = self.records
+        if self.details:
+            record["details"] = dict(self.details)
+        if self.print_output:
+            record["result"] = str(self.result)
+        return record
+
+
+def render_table(records: List[dict]) -> str:
+    """Renders dictionaries as a fixed-width table with an index column, \
+        in the same layout as tabulate renders a pandas DataFrame.
+
+    Parameters
+    ----------
+    records : List[dict]
+        The rows of the table, keys missing from a row are shown as empty.
+
+    Returns
+    -------
+    str
+        The table as text, empty if there are no records.
+
+    Examples
+    --------
+    >>> print(render_table([{'param': 'text', 'arg_len': 5}, {'param': 'n'}]))
+        param      arg_len
+    --  -------  ---------
+     0  text             5
+     1  n
+
+    See Also
+    --------
+    Used by:
+    :class:`~extra_ds_tools.decorators.report.CallReport`
+    """
+    if not records:
+        # like tabulate renders an empty DataFrame
+        return ""
+    # the columns in order of first appearance, like a pandas DataFrame
+    columns = list(dict.fromkeys(key for record in records for key in record))
+    values = [
+        [record.get(column, "") for column in columns] for record in records
+    ]
+    headers = [""] + columns
+    # columns with only numbers are aligned by their decimal point, others to
+    # the left
+    numeric = [True] + [
+        all(_is_number(row[index]) for row in values)
+        for index in range(len(columns))
+    ]
+    rows = [
+        [str(index)] + [_cell(value) for value in row]
+        for index, row in enumerate(values)
+    ]
+    for index, is_numeric in enumerate(numeric):
+        if is_numeric:
+            _align_decimals(rows, index)
+
+    widths = [len(header) + 2 for header in headers]
+    for row in rows:
+        for index, cell in enumerate(row):
+            widths[index] = max(
+                widths[index], *(len(line) for line in cell.split("\n"))
+            )
+
+    lines = [
+        _render_line(headers, widths, numeric),
+        "  ".join("-" * width for width in widths),
+    ]
+    for row in rows:
+        # cells can span multiple lines, e.g. for truncated numpy arrays
+        cell_lines = [cell.split("\n") for cell in row]
+        for line_index in range(max(len(cell) for cell in cell_lines)):
+            lines.append(
+                _render_line(
+                    [
+                        cell[line_index] if line_index < len(cell) else ""
+                        for cell in cell_lines
+                    ],
+                    widths,
+                    numeric,
+                )
+            )
+    return "\n".join(lines)
+
+
+def _render_line(
+    cells: List[str], widths: List[int], numeric: List[bool]
+) -> str:
+    """Pads and joins the cells of a single line of a table."""
+    return "  ".join(
+        cell.rjust(width) if is_numeric else cell.ljust(width)
+        for cell, width, is_numeric in zip(cells, widths, numeric)
+    ).rstrip()
+
+
+def _align_decimals(rows: List[List[str]], index: int) -> None:
+    """Pads the cells of a numeric column on the right so their decimal \
+        points line up, like tabulate's ``numalign="decimal"``."""
+    decimals = [_decimals(row[index]) for row in rows]
+    most = max(decimals)
+    for row, row_decimals in zip(rows, decimals):
+        row[index] += " " * (most - row_decimals)
+
+
+def _decimals(text: str) -> int:
+    """Returns the number of characters after the decimal point, or the \
+        exponent, of a number, and -1 for integers."""
+    try:
+        int(text)
+        return -1
+    except ValueError:
+        pass
+    position = text.rfind(".")
+    if position < 0:
+        position = text.lower().rfind("e")
+    return len(text) - position - 1 if position >= 0 else -1
+
+
+def _cell(value: Any) -> str:
+    """Returns the text of a table cell."""
+    if isinstance(value, float):
+        return format(value, "g")
+    return str(value)
+
+
+def _is_number(value: Any) -> bool:
+    """Returns whether a value is a number or a string of a number."""
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return True
+    if isinstance(value, str):
+        try:
+            float(value)
+        except ValueError:
+            return False
+        return True
+    return False
@@ -0,0 +1,107 @@
+from random import random
+from typing import Optional
+
+from extra_ds_tools.decorators.stats import FunctionStats
+
+
+class CallSampler:
+    """Decides which calls of a decorated function are fully instrumented.
+
+    Parameters
+    ----------
+    stats : FunctionStats
+        The statistics of the decorated function, used to estimate its wall
+        time for the overhead budget.
+    sample_every : Optional[int], optional
+        If set only every n-th call is sampled, starting with the first call,
+        by default None
+    sample_rate : Optional[float], optional
+        If set every call is sampled with this probability, by default None
+    overhead_budget : Optional[float], optional
+        If set no calls are sampled while the time spent on instrumentation
+        exceeds this fraction of the estimated wall time of all calls, both
+        kept in the statistics, so they're reset together. Calls are always
+        sampled until a call has been timed, by default None
+
+    Raises
+    ------
+    ValueError
+        If sample_every < 1, sample_rate isn't in (0, 1], overhead_budget <= 0
+        or both sample_every and sample_rate are set.
+
+    Examples
+    --------
+    >>> sampler = CallSampler(FunctionStats('module.func'), sample_every=3)
+    >>> [sampler.sample() for _ in range(6)]
+    [True, False, False, True, False, False]
+
+    See Also
+    --------
+    Used by:
+    :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`
+    """
+
+    def __init__(
+        self,
+        stats: FunctionStats,
+        sample_every: Optional[int] = None,
+        sample_rate: Optional[float] = None,
+        overhead_budget: Optional[float] = None,
+    ):
+        if sample_every is not None and sample_rate is not None:
+            raise ValueError(
+                "Set either sample_every or sample_rate, not both."
+            )
+        if sample_every is not None and sample_every < 1:
+            raise ValueError(f"sample_every must be >= 1, got {sample_every}")
+        if sample_rate is not None and not 0 < sample_rate <= 1:
+            raise ValueError(
+                f"sample_rate must be in (0, 1], got {sample_rate}"
+            )
+        if overhead_budget is not None and overhead_budget <= 0:
+            raise ValueError(
+                f"overhead_budget must be > 0, got {overhead_budget}"
+            )
+        self.stats = stats
+        self.sample_every = sample_every
+        self.sample_rate = sample_rate
+        self.overhead_budget = overhead_budget
+        self._n_calls = 0
+
+    def sample(self) -> bool:
+        """Returns whether the next call should be sampled.
+
+        Returns
+        -------
+        bool
+            True if the call should be fully instrumented.
+        """
+        if self.sample_every is not None:
+            # without a lock concurrent calls may shift which call is sampled,
+            # which doesn't bias the statistics
+            self._n_calls += 1
+            sampled = (self._n_calls - 1) % self.sample_every == 0
+        elif self.sample_rate is not None:
+            sampled = random() < self.sample_rate
+        else:
+            sampled = True
+        if (
+            sampled
+            and self.overhead_budget is not None
+            and self.stats.sampled_calls
+        ):
+            sampled = (
+                self.stats.overhead_ns
+                <= self.overhead_budget * self.stats.estimated_total_ns()
+            )
+        return sampled
+
+    def add_overhead(self, overhead_ns: int) -> None:
+        """Adds the time a sampled call spent on instrumentation.
+
+        Parameters
+        ----------
+        overhead_ns : int
+            The time in nanoseconds spent outside the decorated function.
+        """
+        self.stats.add_overhead(overhead_ns)
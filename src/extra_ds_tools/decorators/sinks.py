@@ -0,0 +1,397 @@
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from collections import deque
+from typing import Callable, List, Optional, TextIO, Union
+
+from extra_ds_tools.decorators.processes import run_at_exit
+from extra_ds_tools.decorators.report import CallReport
+
+# what a BackgroundWriter does with a report when its queue is full
+DROP_POLICIES = ("drop_newest", "drop_oldest", "block")
+
+# how long queued reports are still written when the interpreter exits
+EXIT_FLUSH_TIMEOUT = 5.0
+
+_logger = logging.getLogger(__name__)
+
+
+class PrintSink:
+    """Prints the reports of calls as text, the default output of \
+        :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`.
+
+    Parameters
+    ----------
+    stream : Optional[TextIO], optional
+        The stream to print to, by default the current ``sys.stdout``
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream
+
+    def emit(self, report: CallReport) -> None:
+        """Prints a report.
+
+        Parameters
+        ----------
+        report : CallReport
+            The report of a call.
+        """
+        print(report, file=self.stream or sys.stdout)
+
+
+class LoggingSink:
+    """Logs the reports of calls with the :mod:`logging` module.
+
+    The text of a report is the message and its structured record, see
+    :meth:`~extra_ds_tools.decorators.report.CallReport.to_dict`, is added to
+    the log record as the ``call_report`` attribute.
+
+    Parameters
+    ----------
+    logger : Optional[logging.Logger], optional
+        The logger to log to, by default the logger of this module
+    level : int, optional
+        The level to log at, by default logging.INFO
+
+    Examples
+    --------
+    >>> logging.basicConfig(level=logging.INFO)
+    >>>
+    >>> @timeit_arg_info_dec(sink=LoggingSink(), param_info=False)
+    >>> def add(a, b):
+    >>>     return a + b
+    >>>
+    >>> add(1, 2)
+    INFO:extra_ds_tools.decorators.sinks:
+    add() took 1.2e-06 seconds to run.
+
+    Returned:
+    3
+    """  # noqa
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        level: int = logging.INFO,
+    ):
+        self.logger = logger or _logger
+        self.level = level
+
+    def emit(self, report: CallReport) -> None:
+        """Logs a report.
+
+        Parameters
+        ----------
+        report : CallReport
+            The report of a call.
+        """
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(
+                self.level,
+                report.render(),
+                extra={"call_report": report.to_dict()},
+            )
+
+
+class JsonlSink:
+    """Appends the structured records of calls to a file, one JSON object \
+        per line.
+
+    Values that aren't JSON serializable are written as strings.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file, which is created if it doesn't exist.
+
+    Examples
+    --------
+    >>> @timeit_arg_info_dec(sink=JsonlSink('calls.jsonl'))
+    >>> def add(a: int, b: int):
+    >>>     return a + b
+    >>>
+    >>> add(1, 2)
+    >>> print(open('calls.jsonl').read())
+    {"timestamp": 1700000000.0, "function": "add", "exec_time": 1.2e-06, "params": [{"param": "a", "type_hint": "int", "default_value": "", "arg_type": "int", "arg_value": "1", "arg_len": ""}, {"param": "b", "type_hint": "int", "default_value": "", "arg_type": "int", "arg_value": "2", "arg_len": ""}], "result": "3"}
+    """  # noqa
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        return {"path": self.path}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["path"])
+
+    def emit(self, report: CallReport) -> None:
+        """Appends the record of a report.
+
+        Parameters
+        ----------
+        report : CallReport
+            The report of a call.
+        """
+        line = json.dumps(report.to_dict(), default=str)
+        with self._lock, open(self.path, "a") as file:
+            file.write(line + "\n")
+
+
+class RingBufferSink:
+    """Keeps the structured records of the most recent calls in memory.
+
+    Parameters
+    ----------
+    maxlen : int, optional
+        The number of records to keep, by default 1000
+
+    Examples
+    --------
+    >>> buffer = RingBufferSink(maxlen=2)
+    >>>
+    >>> @timeit_arg_info_dec(sink=buffer, param_info=False)
+    >>> def add(a, b):
+    >>>     return a + b
+    >>>
+    >>> for i in range(3):
+    >>>     add(i, i)
+    >>> [record['result'] for record in buffer.records()]
+    ['2', '4']
+    """
+
+    def __init__(self, maxlen: int = 1000):
+        self._records: deque = deque(maxlen=maxlen)
+
+    def emit(self, report: CallReport) -> None:
+        """Keeps the record of a report, forgetting the oldest when full.
+
+        Parameters
+        ----------
+        report : CallReport
+            The report of a call.
+        """
+        self._records.append(report.to_dict())
+
+    def records(self) -> List[dict]:
+        """Returns the kept records, oldest first.
+
+        Returns
+        -------
+        List[dict]
+            The structured records of the most recent calls.
+        """
+        return list(self._records)
+
+    def clear(self) -> None:
+        """Forgets all kept records."""
+        self._records.clear()
+
+
+class CallbackSink:
+    """Passes the reports of calls to a function.
+
+    Parameters
+    ----------
+    callback : Callable[[CallReport], None]
+        The function that's called with every report.
+    """
+
+    def __init__(self, callback: Callable[[CallReport], None]):
+        self.callback = callback
+
+    def emit(self, report: CallReport) -> None:
+        """Passes a report to the callback.
+
+        Parameters
+        ----------
+        report : CallReport
+            The report of a call.
+        """
+        self.callback(report)
+
+
+class BackgroundWriter:
+    """Hands the reports of calls to other sinks on a background thread, \
+        so slow terminals, disks or loggers don't block the timed function.
+
+    Reports are queued in a bounded queue and rendered by the writer thread,
+    which is started on the first report. When the queue is full a report is
+    dropped or waits, depending on the drop policy. Exceptions raised by a
+    sink are logged and don't stop the writer. Queued reports are written
+    for at most :data:`EXIT_FLUSH_TIMEOUT` seconds when the interpreter exits.
+    A forked or unpickled writer, e.g. in the worker of a process pool,
+    starts its own thread and doesn't write the reports queued in the parent.
+
+    A report refers to the returned value of its call, so a returned value
+    that's mutated before it's written is written as mutated.
+
+    Parameters
+    ----------
+    sinks : Union[object, List[object]]
+        A sink or a list of sinks, i.e. objects with an ``emit(report)``
+        method.
+    maxsize : int, optional
+        The maximum number of queued reports, by default 10_000
+    drop_policy : str, optional
+        When the queue is full, "drop_newest" drops the new report,
+        "drop_oldest" drops the oldest queued report and "block" waits until
+        there's room, by default "drop_newest"
+
+    Raises
+    ------
+    ValueError
+        If maxsize < 1 or drop_policy isn't one of :data:`DROP_POLICIES`.
+
+    Examples
+    --------
+    >>> writer = BackgroundWriter([JsonlSink('calls.jsonl'), LoggingSink()])
+    >>>
+    >>> @timeit_arg_info_dec(sink=writer)
+    >>> def add(a, b):
+    >>>     return a + b
+    >>>
+    >>> add(1, 2)
+    3
+    >>> writer.flush()
+
+    See Also
+    --------
+    Used by:
+    :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        sinks: Union[object, List[object]],
+        maxsize: int = 10_000,
+        drop_policy: str = "drop_newest",
+    ):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be >= 1, got {maxsize}")
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(
+                f"drop_policy must be one of {DROP_POLICIES}, "
+                f"got {drop_policy!r}"
+            )
+        self.sinks = list(sinks) if isinstance(sinks, list) else [sinks]
+        self.drop_policy = drop_policy
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._thread: Optional[threading.Thread] = None
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        return {
+            "sinks": self.sinks,
+            "maxsize": self._queue.maxsize,
+            "drop_policy": self.drop_policy,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["sinks"], state["maxsize"], state["drop_policy"])
+
+    def emit(self, report: CallReport) -> None:
+        """Queues a report for the sinks.
+
+        Parameters
+        ----------
+        report : CallReport
+            The report of a call.
+        """
+        self._ensure_started()
+        if self.drop_policy == "block":
+            self._queue.put(report)
+            return
+        while True:
+            try:
+                self._queue.put_nowait(report)
+                return
+            except queue.Full:
+                if self.drop_policy == "drop_newest":
+                    self.dropped += 1
+                    return
+                self._drop_oldest()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until all queued reports are written.
+
+        Parameters
+        ----------
+        timeout : Optional[float], optional
+            The maximum number of seconds to wait, by default no maximum
+
+        Returns
+        -------
+        bool
+            True if all queued reports were written.
+        """
+        if self._thread is None or self._pid != os.getpid():
+            return True
+        # Queue.join with a timeout, which notifies this condition when the
+        # last queued report is written
+        tasks_done = self._queue.all_tasks_done
+        with tasks_done:
+            return tasks_done.wait_for(
+                lambda: not self._queue.unfinished_tasks, timeout
+            )
+
+    def close(self) -> None:
+        """Writes the queued reports and stops the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(self._STOP)
+            thread.join()
+
+    def _ensure_started(self) -> None:
+        """Starts the writer thread if it isn't running."""
+        if self._thread is None or self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    # a forked child has neither the thread nor the queued
+                    # reports of its parent
+                    self._pid = os.getpid()
+                    self._queue = queue.Queue(self._queue.maxsize)
+                    self._thread = None
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run,
+                        name="extra-ds-tools-writer",
+                        daemon=True,
+                    )
+                    self._thread.start()
+                    run_at_exit(self.flush, EXIT_FLUSH_TIMEOUT)
+
+    def _drop_oldest(self) -> None:
+        """Drops the oldest queued report, if the writer didn't take it."""
+        try:
+            self._queue.get_nowait()
+        except queue.Empty:
+            return
+        self._queue.task_done()
+        self.dropped += 1
+
+    def _run(self) -> None:
+        """Writes queued reports until it gets the stop signal."""
+        while True:
+            report = self._queue.get()
+            try:
+                if report is self._STOP:
+                    return
+                for sink in self.sinks:
+                    try:
+                        sink.emit(report)
+                    except Exception:
+                        _logger.exception(
+                            "Sink %r failed to write a report", sink
+                        )
+            finally:
+                self._queue.task_done()
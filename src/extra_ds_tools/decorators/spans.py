@@ -0,0 +1,284 @@
+import threading
+from contextvars import ContextVar
+from time import perf_counter_ns
+from typing import Any, Dict, List, Optional, Tuple
+
+from extra_ds_tools.decorators.report import render_table
+
+# separates the function names of a call path
+PATH_SEPARATOR = " > "
+
+
+class Span:
+    """A call in progress of a function in the call tree.
+
+    Parameters
+    ----------
+    name : str
+        The qualified name of the function.
+    parent : Optional[Span]
+        The span of the decorated function that made the call, None for a
+        root call.
+    """
+
+    __slots__ = ("path", "parent", "children_ns", "start_time")
+
+    def __init__(self, name: str, parent: Optional["Span"]):
+        self.path: Tuple[str, ...] = (
+            parent.path + (name,) if parent is not None else (name,)
+        )
+        self.parent = parent
+        # the inclusive time of the finished calls made by this call
+        self.children_ns = 0
+        self.start_time = perf_counter_ns()
+
+
+# the span of the innermost decorated call in progress in this thread or task
+_current_span: ContextVar[Optional[Span]] = ContextVar(
+    "extra_ds_tools_span", default=None
+)
+
+
+class CallTree:
+    """The inclusive and exclusive time of calls aggregated by call path.
+
+    The inclusive time of a call is its whole duration, its exclusive time
+    is the inclusive time minus that of the decorated calls it made. A call
+    path consists of the decorated functions from the root call down to the
+    call, so the same function called by different parents has separate
+    nodes.
+
+    Examples
+    --------
+    >>> tree = CallTree()
+    >>> tree.record(('outer',), 3_000_000, 1_000_000)
+    >>> tree.record(('outer', 'inner'), 2_000_000, 2_000_000)
+    >>> print(tree.render())
+        function      calls    inclusive_s    exclusive_s    pct_of_parent
+    --  ----------  -------  -------------  -------------  ---------------
+     0  outer             1          0.003          0.001              100
+     1    inner           1          0.002          0.002          66.6667
+    """
+
+    def __init__(self):
+        self._nodes: Dict[Tuple[str, ...], List[int]] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self, path: Tuple[str, ...], inclusive_ns: int, exclusive_ns: int
+    ) -> None:
+        """Adds a finished call.
+
+        Parameters
+        ----------
+        path : Tuple[str, ...]
+            The function names from the root call down to the call.
+        inclusive_ns : int
+            The duration of the call in nanoseconds.
+        exclusive_ns : int
+            The duration minus that of the decorated calls it made.
+        """
+        with self._lock:
+            node = self._nodes.get(path)
+            if node is None:
+                node = self._nodes[path] = [0, 0, 0]
+            node[0] += 1
+            node[1] += inclusive_ns
+            node[2] += exclusive_ns
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Returns the aggregated calls per call path.
+
+        Returns
+        -------
+        Dict[str, dict]
+            Per call path, joined by :data:`PATH_SEPARATOR`, its depth, number
+            of calls, inclusive and exclusive time in seconds and the
+            percentage of the inclusive time of its parent path.
+        """
+        with self._lock:
+            nodes = {path: list(node) for path, node in self._nodes.items()}
+        snapshot = {}
+        for path, (calls, inclusive_ns, exclusive_ns) in nodes.items():
+            parent = nodes.get(path[:-1])
+            snapshot[PATH_SEPARATOR.join(path)] = {
+                "path": path,
+                "depth": len(path) - 1,
+                "calls": calls,
+                "inclusive_s": inclusive_ns / 1e9,
+                "exclusive_s": exclusive_ns / 1e9,
+                "pct_of_parent": 100 * inclusive_ns / parent[1]
+                if parent is not None and parent[1]
+                else 100.0,
+            }
+        return snapshot
+
+    def reset(self) -> None:
+        """Forgets all recorded calls."""
+        with self._lock:
+            self._nodes.clear()
+
+    def render(self) -> str:
+        """Renders the call tree as an indented table, with the children of \
+            every path ordered by inclusive time, slowest first.
+
+        Returns
+        -------
+        str
+            The call tree as a table.
+        """
+        snapshot = self.snapshot()
+        children: Dict[Tuple[str, ...], List[dict]] = {}
+        for node in snapshot.values():
+            children.setdefault(node["path"][:-1], []).append(node)
+
+        rows: List[dict] = []
+
+        def add_rows(parent_path: Tuple[str, ...]) -> None:
+            for node in sorted(
+                children.get(parent_path, []),
+                key=lambda node: node["inclusive_s"],
+                reverse=True,
+            ):
+                rows.append(
+                    {
+                        "function": "  " * node["depth"] + node["path"][-1],
+                        "calls": node["calls"],
+                        "inclusive_s": node["inclusive_s"],
+                        "exclusive_s": node["exclusive_s"],
+                        "pct_of_parent": node["pct_of_parent"],
+                    }
+                )
+                add_rows(node["path"])
+
+        add_rows(())
+        return render_table(rows)
+
+
+# the call tree that collects the calls of timeit_arg_info_dec
+default_call_tree = CallTree()
+
+
+class SpanProbe:
+    """Places the calls of a function in the call tree of decorated calls.
+
+    The span of the call in progress is kept in a :class:`~contextvars.ContextVar`,
+    so calls in other threads and asyncio tasks are placed under the right
+    parent. A thread started during a call has its own call tree, unless it
+    runs in a copy of the context of the call.
+
+    Parameters
+    ----------
+    name : str
+        The qualified name of the function.
+    tree : CallTree, optional
+        The call tree to add the calls to, by default :data:`default_call_tree`
+    nests : bool, optional
+        If False calls made during a call aren't placed under it, for
+        generators which yield to their caller while in progress,
+        by default True
+
+    Examples
+    --------
+    >>> outer, inner = SpanProbe('outer'), SpanProbe('inner')
+    >>> outer_state = outer.start()
+    >>> inner.stop(inner.start())
+    {'call path': 'outer > inner'}
+    >>> outer.stop(outer_state)
+    {'call path': 'outer'}
+
+    See Also
+    --------
+    Used by:
+    :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`
+    """  # noqa
+
+    def __init__(
+        self, name: str, tree: Optional[CallTree] = None, nests: bool = True
+    ):
+        self.name = name
+        self.tree = tree if tree is not None else default_call_tree
+        self.nests = nests
+
+    def start(self) -> tuple:
+        """Starts the span of a call.
+
+        Returns
+        -------
+        tuple
+            The state of the call to pass to :meth:`stop`.
+        """
+        span = Span(self.name, _current_span.get())
+        token = _current_span.set(span) if self.nests else None
+        return span, token
+
+    def stop(self, state: tuple) -> Dict[str, Any]:
+        """Ends the span of a call and adds it to the call tree.
+
+        Parameters
+        ----------
+        state : tuple
+            The state returned by :meth:`start`.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The call path of the call.
+        """
+        span, token = state
+        inclusive_ns = perf_counter_ns() - span.start_time
+        if token is not None:
+            _current_span.reset(token)
+        if span.parent is not None:
+            span.parent.children_ns += inclusive_ns
+        # children running concurrently can take longer than their parent
+        exclusive_ns = max(inclusive_ns - span.children_ns, 0)
+        self.tree.record(span.path, inclusive_ns, exclusive_ns)
+        return {"call path": PATH_SEPARATOR.join(span.path)}
+
+
+def snapshot_call_tree() -> Dict[str, dict]:
+    """Returns the call tree of all functions decorated by \
+        :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec` \
+            with ``call_tree=True``.
+
+    Returns
+    -------
+    Dict[str, dict]
+        Per call path its depth, number of calls, inclusive and exclusive time
+        in seconds and the percentage of the inclusive time of its parent.
+    """  # noqa
+    return default_call_tree.snapshot()
+
+
+def reset_call_tree() -> None:
+    """Forgets the call tree of all functions decorated by \
+        :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`.
+    """
+    default_call_tree.reset()
+
+
+def print_call_tree() -> None:
+    """Prints the call tree of all functions decorated by \
+        :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec` \
+            with ``call_tree=True``, to see which child dominates a slow parent.
+
+    Examples
+    --------
+    >>> @timeit_arg_info_dec(call_tree=True, param_info=False, print_output=False)
+    >>> def load():
+    >>>     sleep(0.2)
+    >>>
+    >>> @timeit_arg_info_dec(call_tree=True, param_info=False, print_output=False)
+    >>> def pipeline():
+    >>>     load()
+    >>>     sleep(0.1)
+    >>>
+    >>> pipeline()
+    >>> print_call_tree()
+        function                 calls    inclusive_s    exclusive_s    pct_of_parent
+    --  ---------------------  -------  -------------  -------------  ---------------
+     0  __main__.pipeline          1       0.300421       0.100162              100
+     1    __main__.load            1       0.200259       0.200259          66.6595
+    """  # noqa
+    print(default_call_tree.render())
@@ -0,0 +1,559 @@
+import threading
+from math import ceil
+from typing import Dict, List
+
+from extra_ds_tools.decorators.report import render_table
+
+# the percentiles reported per function
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """A streaming histogram of durations in nanoseconds with log-spaced \
+        buckets, so its memory doesn't grow with the number of durations.
+
+    Like an HDR histogram every power of two is split into
+    ``2 ** (significant_bits - 1)`` buckets, so a bucket is at most
+    ``2 ** (1 - significant_bits)`` times as wide as its lower bound. With the
+    default of 6 bits, percentiles are accurate to about 3%.
+
+    Parameters
+    ----------
+    significant_bits : int, optional
+        The number of significant bits of a duration that are kept, by default 6
+
+    Examples
+    --------
+    >>> histogram = LatencyHistogram()
+    >>> for duration_ns in range(1, 1001):
+    >>>     histogram.record(duration_ns)
+    >>> histogram.value_at_percentile(50)
+    499.5
+    >>> histogram.value_at_percentile(99)
+    983.5
+    """  # noqa
+
+    def __init__(self, significant_bits: int = 6):
+        if significant_bits < 1:
+            raise ValueError(
+                f"significant_bits must be > 0, got {significant_bits}"
+            )
+        self.significant_bits = significant_bits
+        self.count = 0
+        # bucket index -> number of durations, only for non-empty buckets
+        self.counts: Dict[int, int] = {}
+
+    def record(self, duration_ns: int, count: int = 1) -> None:
+        """Adds a duration to the histogram.
+
+        Parameters
+        ----------
+        duration_ns : int
+            A duration in nanoseconds.
+        count : int, optional
+            The number of times the duration occurred, by default 1
+        """
+        index = self._index(max(int(duration_ns), 0))
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Adds the durations of another histogram with the same precision.
+
+        Parameters
+        ----------
+        other : LatencyHistogram
+            The histogram to add.
+
+        Raises
+        ------
+        ValueError
+            If the histograms have a different number of significant bits.
+        """
+        if other.significant_bits != self.significant_bits:
+            raise ValueError(
+                "Can only merge histograms with the same significant_bits, "
+                f"got {self.significant_bits} and {other.significant_bits}"
+            )
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+
+    def value_at_percentile(self, percentile: float) -> float:
+        """Returns the duration below which the given percentage of \
+            durations fall, as the middle of the bucket it falls in.
+
+        Parameters
+        ----------
+        percentile : float
+            A percentage between 0 and 100.
+
+        Returns
+        -------
+        float
+            The duration in nanoseconds, 0.0 if the histogram is empty.
+        """
+        if not self.count:
+            return 0.0
+        rank = max(ceil(percentile / 100 * self.count), 1)
+        cumulative = 0
+        for index in sorted(self.counts):
+            cumulative += self.counts[index]
+            if cumulative >= rank:
+                break
+        lower, upper = self.bucket_bounds(index)
+        return (lower + upper - 1) / 2
+
+    def bucket_bounds(self, index: int) -> tuple:
+        """Returns the lower (inclusive) and upper (exclusive) bound in \
+            nanoseconds of a bucket."""
+        exponent = index >> self.significant_bits
+        mantissa = index & ((1 << self.significant_bits) - 1)
+        if exponent:
+            # the highest significant bit is implicit above the first buckets
+            mantissa |= 1 << (self.significant_bits - 1)
+            exponent -= 1
+        return mantissa << exponent, (mantissa + 1) << exponent
+
+    def _index(self, duration_ns: int) -> int:
+        """Returns the index of the bucket of a duration."""
+        shift = duration_ns.bit_length() - self.significant_bits
+        if shift <= 0:
+            return duration_ns
+        mantissa = duration_ns >> shift
+        return ((shift + 1) << self.significant_bits) | (
+            mantissa & ((1 << (self.significant_bits - 1)) - 1)
+        )
+
+
+class FunctionStats:
+    """Latency statistics of all calls of a single function.
+
+    Parameters
+    ----------
+    name : str
+        The qualified name of the function.
+
+    Examples
+    --------
+    >>> stats = FunctionStats('module.func')
+    >>> stats.record(2_000_000)
+    >>> stats.record(4_000_000)
+    >>> stats.summary()
+    {'function': 'module.func',
+    'calls': 2,
+    'sampled': 2,
+    'total_s': 0.006,
+    'mean_s': 0.003,
+    'p50_s': 0.0020152315,
+    'p95_s': 0.004,
+    'p99_s': 0.004,
+    'max_s': 0.004}
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def record(self, duration_ns: int) -> None:
+        """Adds the duration of a timed call.
+
+        Parameters
+        ----------
+        duration_ns : int
+            The duration of the call in nanoseconds.
+        """
+        with self._lock:
+            self.calls += 1
+            self.sampled_calls += 1
+            self.total_ns += duration_ns
+            self.sum_squares_ns2 += duration_ns * duration_ns
+            if duration_ns > self.max_ns:
+                self.max_ns = duration_ns
+            self.histogram.record(duration_ns)
+
+    def record_unsampled(self) -> None:
+        """Counts a call that wasn't timed."""
+        with self._lock:
+            self.calls += 1
+
+    def add_overhead(self, overhead_ns: int) -> None:
+        """Adds the time a timed call spent on instrumentation.
+
+        Parameters
+        ----------
+        overhead_ns : int
+            The time in nanoseconds spent outside the decorated function.
+        """
+        with self._lock:
+            self.overhead_ns += overhead_ns
+
+    def record_error(self) -> None:
+        """Counts a call that raised an exception."""
+        with self._lock:
+            self.errors += 1
+
+    def add_counters(self, counters: Dict[str, float]) -> None:
+        """Adds other measurements of a timed call, e.g. its CPU time.
+
+        Parameters
+        ----------
+        counters : Dict[str, float]
+            Per name of a measurement its value for the call.
+        """
+        with self._lock:
+            for name, value in counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def merge(self, other: "FunctionStats") -> None:
+        """Adds the recorded calls of other statistics, e.g. those of the \
+            same function in another process.
+
+        Parameters
+        ----------
+        other : FunctionStats
+            The statistics to add.
+
+        Raises
+        ------
+        ValueError
+            If the histograms have a different number of significant bits.
+        """
+        with other._lock:
+            calls, sampled_calls = other.calls, other.sampled_calls
+            total_ns, sum_squares_ns2 = other.total_ns, other.sum_squares_ns2
+            max_ns, counters = other.max_ns, dict(other.counters)
+            errors, overhead_ns = other.errors, other.overhead_ns
+            histogram = LatencyHistogram(other.histogram.significant_bits)
+            histogram.merge(other.histogram)
+        with self._lock:
+            self.histogram.merge(histogram)
+            self.calls += calls
+            self.sampled_calls += sampled_calls
+            self.total_ns += total_ns
+            self.sum_squares_ns2 += sum_squares_ns2
+            self.max_ns = max(self.max_ns, max_ns)
+            self.errors += errors
+            self.overhead_ns += overhead_ns
+            for name, value in counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self) -> None:
+        """Forgets all recorded calls."""
+        with self._lock:
+            self.calls = 0
+            self.sampled_calls = 0
+            self.total_ns = 0
+            self.sum_squares_ns2 = 0
+            self.max_ns = 0
+            self.errors = 0
+            self.overhead_ns = 0
+            self.histogram = LatencyHistogram()
+            self.counters: Dict[str, float] = {}
+
+    def estimated_total_ns(self) -> float:
+        """Returns the total duration of all calls, extrapolated from the \
+            timed calls when not every call was timed.
+
+        Returns
+        -------
+        float
+            The total duration in nanoseconds.
+        """
+        if not self.sampled_calls:
+            return 0.0
+        return self.total_ns * self.calls / self.sampled_calls
+
+    def std_ns(self) -> float:
+        """Returns the sample standard deviation of the duration of the timed \
+            calls.
+
+        Returns
+        -------
+        float
+            The standard deviation in nanoseconds, 0.0 with less than 2 timed
+            calls.
+        """
+        with self._lock:
+            n = self.sampled_calls
+            if n < 2:
+                return 0.0
+            variance = (
+                self.sum_squares_ns2 - self.total_ns * self.total_ns / n
+            ) / (n - 1)
+        return max(variance, 0.0) ** 0.5
+
+    def to_dict(self) -> dict:
+        """Returns the recorded calls as a JSON serializable dictionary.
+
+        Returns
+        -------
+        dict
+            The counts, sums and histogram buckets of the recorded calls.
+        """
+        with self._lock:
+            return {
+                "name": self.name,
+                "calls": self.calls,
+                "sampled_calls": self.sampled_calls,
+                "total_ns": self.total_ns,
+                "sum_squares_ns2": self.sum_squares_ns2,
+                "max_ns": self.max_ns,
+                "errors": self.errors,
+                "overhead_ns": self.overhead_ns,
+                "significant_bits": self.histogram.significant_bits,
+                "histogram": {
+                    str(index): count
+                    for index, count in self.histogram.counts.items()
+                },
+                "counters": dict(self.counters),
+            }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FunctionStats":
+        """Creates statistics from the output of :meth:`to_dict`.
+
+        Parameters
+        ----------
+        data : dict
+            The recorded calls as returned by :meth:`to_dict`.
+
+        Returns
+        -------
+        FunctionStats
+            The statistics of the recorded calls.
+        """
+        stats = cls(data["name"])
+        stats.calls = data["calls"]
+        stats.sampled_calls = data["sampled_calls"]
+        stats.total_ns = data["total_ns"]
+        stats.sum_squares_ns2 = data["sum_squares_ns2"]
+        stats.max_ns = data["max_ns"]
+        stats.errors = data.get("errors", 0)
+        stats.overhead_ns = data.get("overhead_ns", 0)
+        stats.histogram = LatencyHistogram(data["significant_bits"])
+        for index, count in data["histogram"].items():
+            stats.histogram.counts[int(index)] = count
+        stats.histogram.count = sum(stats.histogram.counts.values())
+        stats.counters = dict(data.get("counters", {}))
+        return stats
+
+    def peek(self) -> dict:
+        """Returns the counts, total duration and histogram buckets without \
+            taking the lock, so reading them never blocks a timed call.
+
+        The values are read one after another while calls can still be
+        recorded, so they can disagree by the calls recorded in between.
+
+        Returns
+        -------
+        dict
+            The number of calls, timed calls and calls that raised an
+            exception, the total duration of the timed calls in nanoseconds
+            and the number of timed calls per histogram bucket.
+        """
+        histogram = self.histogram
+        return {
+            "function": self.name,
+            "calls": self.calls,
+            "sampled_calls": self.sampled_calls,
+            "errors": self.errors,
+            "total_ns": self.total_ns,
+            "significant_bits": histogram.significant_bits,
+            "histogram": dict(histogram.counts),
+        }
+
+    def percentile_ns(self, percentile: float) -> float:
+        """Returns a percentile of the duration of the timed calls.
+
+        Parameters
+        ----------
+        percentile : float
+            A percentage between 0 and 100.
+
+        Returns
+        -------
+        float
+            The duration in nanoseconds, 0.0 without timed calls.
+        """
+        with self._lock:
+            # a bucket's middle can't exceed the largest duration
+            return min(
+                self.histogram.value_at_percentile(percentile), self.max_ns
+            )
+
+    def summary(self) -> dict:
+        """Returns the statistics in seconds.
+
+        The number of calls counts all calls, the total time is extrapolated
+        from the timed calls, see :meth:`estimated_total_ns`, and the other
+        statistics are computed over the timed calls. The totals of the
+        counters added by :meth:`add_counters` are extrapolated as well.
+
+        Returns
+        -------
+        dict
+            The number of calls and timed calls, the total and mean time, the
+            percentiles in :data:`PERCENTILES`, the maximum time and the
+            totals of the counters.
+        """
+        with self._lock:
+            summary = {
+                "function": self.name,
+                "calls": self.calls,
+                "sampled": self.sampled_calls,
+                "total_s": self.estimated_total_ns() / 1e9,
+                "mean_s": self.total_ns / self.sampled_calls / 1e9
+                if self.sampled_calls
+                else 0.0,
+            }
+            for percentile in PERCENTILES:
+                # a bucket's middle can't exceed the largest duration
+                value_ns = min(
+                    self.histogram.value_at_percentile(percentile),
+                    self.max_ns,
+                )
+                summary[f"p{percentile}_s"] = value_ns / 1e9
+            summary["max_s"] = self.max_ns / 1e9
+            for name, value in self.counters.items():
+                summary[name] = (
+                    value * self.calls / self.sampled_calls
+                    if self.sampled_calls
+                    else value
+                )
+        return summary
+
+
+class StatsRegistry:
+    """A collection of :class:`FunctionStats` by function name.
+
+    Examples
+    --------
+    >>> registry = StatsRegistry()
+    >>> registry.get('module.func').record(2_000_000)
+    >>> print(registry.render())
+        function       calls    sampled    total_s    mean_s    p50_s    p95_s    p99_s    max_s
+    --  -----------  -------  ---------  ---------  --------  -------  -------  -------  -------
+     0  module.func        1          1      0.002     0.002    0.002    0.002    0.002    0.002
+    """  # noqa
+
+    def __init__(self):
+        self._stats: Dict[str, FunctionStats] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> FunctionStats:
+        """Returns the statistics of a function, created if not present.
+
+        Parameters
+        ----------
+        name : str
+            The qualified name of the function.
+
+        Returns
+        -------
+        FunctionStats
+            The statistics of the function.
+        """
+        try:
+            return self._stats[name]
+        except KeyError:
+            with self._lock:
+                return self._stats.setdefault(name, FunctionStats(name))
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Returns a summary of the statistics of every function with calls.
+
+        Returns
+        -------
+        Dict[str, dict]
+            Per function name the output of :meth:`FunctionStats.summary`.
+        """
+        summaries = (stats.summary() for stats in list(self._stats.values()))
+        return {
+            summary["function"]: summary
+            for summary in summaries
+            if summary["calls"]
+        }
+
+    def peek(self) -> List[dict]:
+        """Returns the counts and histograms of every function with calls, \
+            without taking any lock.
+
+        Returns
+        -------
+        List[dict]
+            The output of :meth:`FunctionStats.peek` per function with
+            calls or errors.
+        """
+        peeks = (stats.peek() for stats in list(self._stats.values()))
+        return [peek for peek in peeks if peek["calls"] or peek["errors"]]
+
+    def reset(self) -> None:
+        """Forgets all recorded calls of every function."""
+        for stats in list(self._stats.values()):
+            stats.reset()
+
+    def render(self) -> str:
+        """Renders a table of the statistics, slowest total time first.
+
+        Returns
+        -------
+        str
+            The statistics as a table.
+        """
+        summaries: List[dict] = sorted(
+            self.snapshot().values(),
+            key=lambda summary: summary["total_s"],
+            reverse=True,
+        )
+        return render_table(summaries)
+
+
+# the registry that collects the statistics of timeit_arg_info_dec
+default_registry = StatsRegistry()
+
+
+def snapshot_stats() -> Dict[str, dict]:
+    """Returns the latency statistics of all functions decorated by \
+        :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`.
+
+    Returns
+    -------
+    Dict[str, dict]
+        Per qualified function name its number of calls and timed calls, total
+        and mean time, p50, p95, p99 and maximum time in seconds.
+
+    Examples
+    --------
+    >>> @timeit_arg_info_dec(param_info=False, print_output=False)
+    >>> def add(a, b):
+    >>>     return a + b
+    >>>
+    >>> add(1, 2)
+    >>> snapshot_stats()
+    {'__main__.add': {'function': '__main__.add',
+    'calls': 1,
+    'sampled': 1,
+    'total_s': 1.4e-06,
+    'mean_s': 1.4e-06,
+    'p50_s': 1.3995e-06,
+    'p95_s': 1.3995e-06,
+    'p99_s': 1.3995e-06,
+    'max_s': 1.4e-06}}
+    """
+    return default_registry.snapshot()
+
+
+def reset_stats() -> None:
+    """Forgets the statistics of all functions decorated by \
+        :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`.
+    """
+    default_registry.reset()
+
+
+def print_stats() -> None:
+    """Prints a table with the latency statistics of all functions decorated \
+        by :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`.
+    """  # noqa
+    print(default_registry.render())
@@ -0,0 +1,154 @@
+import threading
+from time import monotonic
+from typing import Optional, Union
+
+from extra_ds_tools.decorators.stats import FunctionStats
+
+# the number of timed calls before an adaptive threshold reports calls
+ADAPTIVE_MIN_CALLS = 100
+
+# the number of calls an adaptive threshold is reused before it's recomputed
+ADAPTIVE_REFRESH_CALLS = 64
+
+
+class SlowCallFilter:
+    """Decides which timed calls are slow enough to report, so a function \
+        called in a loop only reports its outliers.
+
+    Parameters
+    ----------
+    stats : FunctionStats
+        The statistics of the decorated function, used for an adaptive
+        threshold.
+    threshold : Union[float, str, None], optional
+        The number of seconds above which a call is reported, or a percentile
+        like "p99" to report calls slower than that percentile of the calls
+        so far. An adaptive threshold reports nothing for the first
+        :data:`ADAPTIVE_MIN_CALLS` timed calls. None reports every call,
+        by default None
+    max_reports_per_second : Optional[float], optional
+        If set at most this many reports per second are allowed on average,
+        with bursts of at most max(1, max_reports_per_second) reports,
+        by default None
+
+    Raises
+    ------
+    ValueError
+        If the threshold is negative or not a percentile between 0 and 100,
+        or max_reports_per_second <= 0.
+
+    Examples
+    --------
+    >>> slow_filter = SlowCallFilter(FunctionStats('module.func'), threshold=0.5)
+    >>> slow_filter.should_report(100_000_000)
+    False
+    >>> slow_filter.should_report(600_000_000)
+    True
+
+    See Also
+    --------
+    Used by:
+    :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`
+    """  # noqa
+
+    def __init__(
+        self,
+        stats: FunctionStats,
+        threshold: Union[float, str, None] = None,
+        max_reports_per_second: Optional[float] = None,
+    ):
+        self.stats = stats
+        self.threshold_ns: Optional[float] = None
+        self.percentile: Optional[float] = None
+        if isinstance(threshold, str):
+            self.percentile = _parse_percentile(threshold)
+        elif threshold is not None:
+            if threshold < 0:
+                raise ValueError(f"threshold must be >= 0, got {threshold}")
+            self.threshold_ns = threshold * 1e9
+        if max_reports_per_second is not None and max_reports_per_second <= 0:
+            raise ValueError(
+                "max_reports_per_second must be > 0, "
+                f"got {max_reports_per_second}"
+            )
+        self.max_reports_per_second = max_reports_per_second
+        # the number of slow calls not reported because of the rate limit
+        self.suppressed = 0
+        self._tokens = max(1.0, max_reports_per_second or 0)
+        self._last_refill = monotonic()
+        self._calls_until_refresh = 0
+        self._lock = threading.Lock()
+
+    def should_report(self, exec_time_ns: int) -> bool:
+        """Returns whether a timed call should be reported.
+
+        Parameters
+        ----------
+        exec_time_ns : int
+            The duration of the call in nanoseconds.
+
+        Returns
+        -------
+        bool
+            True if the call is slower than the threshold and the rate limit
+            allows another report.
+        """
+        if not self._is_slow(exec_time_ns):
+            return False
+        if self.max_reports_per_second is None:
+            return True
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(
+                max(1.0, self.max_reports_per_second),
+                self._tokens
+                + (now - self._last_refill) * self.max_reports_per_second,
+            )
+            self._last_refill = now
+            if self._tokens < 1:
+                self.suppressed += 1
+                return False
+            self._tokens -= 1
+        return True
+
+    def take_suppressed(self) -> int:
+        """Returns the number of suppressed reports since the last call.
+
+        Returns
+        -------
+        int
+            The number of slow calls that weren't reported because of the
+            rate limit.
+        """
+        with self._lock:
+            suppressed, self.suppressed = self.suppressed, 0
+        return suppressed
+
+    def _is_slow(self, exec_time_ns: int) -> bool:
+        """Returns whether a call is slower than the threshold."""
+        if self.percentile is not None:
+            if self.stats.sampled_calls < ADAPTIVE_MIN_CALLS:
+                return False
+            self._calls_until_refresh -= 1
+            if self._calls_until_refresh <= 0:
+                self.threshold_ns = self.stats.percentile_ns(self.percentile)
+                self._calls_until_refresh = ADAPTIVE_REFRESH_CALLS
+        return self.threshold_ns is None or exec_time_ns > self.threshold_ns
+
+
+def _parse_percentile(threshold: str) -> float:
+    """Returns the percentile of a threshold like "p99"."""
+    try:
+        if not threshold.startswith("p"):
+            raise ValueError
+        percentile = float(threshold[1:])
+    except ValueError:
+        raise ValueError(
+            f'threshold must be a number or a percentile like "p99", '
+            f"got {threshold!r}"
+        ) from None
+    if not 0 < percentile < 100:
+        raise ValueError(
+            f"The percentile must be between 0 and 100, got {threshold!r}"
+        )
+    return percentile
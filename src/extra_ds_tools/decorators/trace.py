@@ -0,0 +1,189 @@
+import json
+import os
+import threading
+from time import perf_counter_ns, time_ns
+from typing import Any, Dict, List, Optional
+
+from extra_ds_tools.decorators.processes import run_at_exit
+
+# converts perf_counter_ns to nanoseconds since the epoch, so traces of
+# different processes share a timeline
+_EPOCH_OFFSET_NS = time_ns() - perf_counter_ns()
+
+
+class ChromeTraceWriter:
+    """Writes calls as Chrome trace events, to view them on a timeline in \
+        Perfetto (https://ui.perfetto.dev) or chrome://tracing.
+
+    Every call is a complete event with its process and thread ID, so nested
+    calls are shown nested and calls of different threads and processes on
+    their own track. The arguments of a call are the event args. Events are
+    buffered and appended to the file in batches, and on exit, also of the
+    worker processes of a process pool. A pickled writer, e.g. sent to a
+    worker, is unpickled without buffered events.
+
+    The file is in the JSON Array Format without the closing bracket, which
+    the trace viewers allow, so batches can be appended. Use
+    :func:`merge_chrome_traces` to combine files into a single JSON file.
+
+    Parameters
+    ----------
+    path : str
+        The path of the trace file. ``{pid}`` is replaced by the process ID,
+        so every process of a multi-process run writes its own file.
+    batch_size : int, optional
+        The number of buffered events that are written at once, by default 1000
+
+    Raises
+    ------
+    ValueError
+        If batch_size < 1.
+
+    Examples
+    --------
+    >>> writer = ChromeTraceWriter('trace_{pid}.json')
+    >>>
+    >>> @timeit_arg_info_dec(trace=writer, print_output=False)
+    >>> def add(a: int, b: int):
+    >>>     return a + b
+    >>>
+    >>> add(1, 2)
+    >>> writer.flush()
+    >>> print(open(f'trace_{os.getpid()}.json').read())
+    [
+    {"name": "thread_name", "ph": "M", "pid": 4242, "tid": 140234, "args": {"name": "MainThread"}},
+    {"name": "add", "cat": "__main__", "ph": "X", "ts": 1700000000000000.0, "dur": 1.2, "pid": 4242, "tid": 140234, "args": {"a": {"type_hint": "int", "arg_type": "int", "arg_value": "1"}, "b": {"type_hint": "int", "arg_type": "int", "arg_value": "2"}}},
+
+    See Also
+    --------
+    Used by:
+    :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`
+    """  # noqa
+
+    def __init__(self, path: str, batch_size: int = 1000):
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+        self.path_template = path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._reset_for_process()
+
+    def __getstate__(self) -> dict:
+        return {
+            "path_template": self.path_template,
+            "batch_size": self.batch_size,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["path_template"], state["batch_size"])
+
+    @property
+    def path(self) -> str:
+        """The path of the trace file of this process."""
+        return self.path_template.format(pid=os.getpid())
+
+    def add_call(
+        self,
+        name: str,
+        category: str,
+        start_time_ns: int,
+        duration_ns: int,
+        args: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Buffers a call as a complete event.
+
+        Parameters
+        ----------
+        name : str
+            The name of the called function.
+        category : str
+            The category of the event, e.g. the module of the function.
+        start_time_ns : int
+            The start of the call according to :func:`time.perf_counter_ns`.
+        duration_ns : int
+            The duration of the call in nanoseconds.
+        args : Optional[Dict[str, Any]], optional
+            Information on the call shown with the event, by default None
+        """
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start_time_ns + _EPOCH_OFFSET_NS) / 1e3,
+            "dur": duration_ns / 1e3,
+            "pid": os.getpid(),
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            if event["pid"] != self._pid:
+                # a forked child doesn't write the events of its parent
+                self._reset_for_process()
+            if thread.ident not in self._named_threads:
+                self._named_threads.add(thread.ident)
+                self._events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": event["pid"],
+                        "tid": thread.ident,
+                        "args": {"name": thread.name},
+                    }
+                )
+            self._events.append(event)
+            if len(self._events) >= self.batch_size:
+                self._write()
+
+    def flush(self) -> None:
+        """Writes all buffered events."""
+        with self._lock:
+            if self._pid == os.getpid():
+                self._write()
+
+    def _write(self) -> None:
+        """Appends the buffered events to the file, holding the lock."""
+        if not self._events:
+            return
+        lines = "".join(
+            json.dumps(event, default=str) + ",\n" for event in self._events
+        )
+        with open(self.path, "a") as file:
+            if file.tell() == 0:
+                file.write("[\n")
+            file.write(lines)
+        self._events = []
+
+    def _reset_for_process(self) -> None:
+        """Forgets the buffered events and named threads of another process."""
+        self._pid = os.getpid()
+        self._events: List[dict] = []
+        self._named_threads: set = set()
+        run_at_exit(self.flush)
+
+
+def merge_chrome_traces(paths: List[str], output_path: str) -> None:
+    """Combines Chrome trace files, e.g. those of the processes of a \
+        multi-process run, into a single JSON file.
+
+    Parameters
+    ----------
+    paths : List[str]
+        The paths of the trace files, as written by :class:`ChromeTraceWriter`
+        or as complete JSON arrays.
+    output_path : str
+        The path of the combined trace file.
+
+    Examples
+    --------
+    >>> merge_chrome_traces(glob('trace_*.json'), 'trace.json')
+    """
+    events = []
+    for path in paths:
+        with open(path) as file:
+            text = file.read().strip().rstrip("]").rstrip().rstrip(",")
+        if text:
+            events.extend(json.loads(text + "]"))
+    with open(output_path, "w") as file:
+        json.dump(events, file)
@@ -1,11 +1,139 @@
 import inspect
 import re
+import sys
+from collections import OrderedDict, deque
+from functools import lru_cache
 from inspect import getfullargspec, signature
-from typing import Any, Callable, List
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 
+class ArgBinder:
+    """Maps the arguments of a call to the information returned by \
+        :func:`~extra_ds_tools.format.args_and_kwargs_repr`, with all \
+            introspection of the function done once at construction.
+
+    Parameters
+    ----------
+    func : Callable
+        A function.
+    memory_info : bool, optional
+        If True the information of an argument also has its memory footprint in
+        bytes under the key 'arg_bytes', see :func:`memory_footprint`,
+        by default False
+    skip_self : bool, optional
+        If True the first positional argument, i.e. the instance of a method,
+        is left out, so it's never rendered, by default False
+
+    Attributes
+    ----------
+    positional : Tuple[str]
+        The names of the parameters that can be filled positionally.
+    varargs : Optional[str]
+        The name of the ``*args`` parameter, None if absent.
+    varkw : Optional[str]
+        The name of the ``**kwargs`` parameter, None if absent.
+    params : Dict[str, Tuple[str, Any]]
+        Per parameter name its rendered type hint and printable default value.
+
+    Examples
+    --------
+    >>> def multiply_text(text: str, n: int = 1):
+    >>>     return text * n
+    >>>
+    >>> binder = ArgBinder(multiply_text)
+    >>> binder('hello', n=2)
+    [{'param': 'text',
+    'type_hint': 'str',
+    'default_value': '',
+    'arg_type': 'str',
+    'arg_value': 'hello',
+    'arg_len': 5},
+    {'param': 'n',
+    'type_hint': 'int',
+    'default_value': 1,
+    'arg_type': 'int',
+    'arg_value': '2',
+    'arg_len': ''}]
+
+    See Also
+    --------
+    Used by:
+    :func:`~extra_ds_tools.format.args_and_kwargs_repr`
+    :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        memory_info: bool = False,
+        skip_self: bool = False,
+    ):
+        self.memory_info = memory_info
+        self.skip_self = skip_self
+        sign = signature(func)
+        fullargspec = getfullargspec(func)
+        self.positional: Tuple[str, ...] = tuple(fullargspec.args)
+        self.varargs = fullargspec.varargs
+        self.varkw = fullargspec.varkw
+        self.params: Dict[str, Tuple[str, Any]] = {
+            name: (
+                class_as_str_repr(param.annotation),
+                make_empty_value_printable(param.default),
+            )
+            for name, param in sign.parameters.items()
+        }
+
+    def __call__(self, *args, **kwargs) -> List[dict]:
+        args_and_kwargs: List[dict] = []
+        n_positional = len(self.positional)
+        for index, arg in islice(enumerate(args), int(self.skip_self), None):
+            if index < n_positional:
+                args_and_kwargs.append(self._bind(self.positional[index], arg))
+            else:
+                args_and_kwargs.append(
+                    {
+                        "param": f"args[{index}]",
+                        **_value_info(arg, self.memory_info),
+                    }
+                )
+
+        for key, arg in kwargs.items():
+            args_and_kwargs.append(self._bind(key, arg))
+
+        # only a keyword can collide with a parameter already filled by
+        # position, all other parameter names are unique by construction
+        if (
+            args
+            and kwargs
+            and not kwargs.keys().isdisjoint(self.positional[: len(args)])
+        ):
+            params = [info["param"] for info in args_and_kwargs]
+            raise TypeError(
+                "Two values were tried to set to the same parameter."
+                f"\nFound values for the following parameters:\n{params}"
+            )
+        return args_and_kwargs
+
+    def _bind(self, key: str, arg: Any) -> dict:
+        try:
+            type_hint, default_value = self.params[key]
+        except KeyError:
+            return {
+                "param": f"kwarg['{key}']",
+                **_value_info(arg, self.memory_info),
+            }
+        return {
+            "param": key,
+            "type_hint": type_hint,
+            "default_value": default_value,
+            **_value_info(arg, self.memory_info),
+        }
+
+
 def args_and_kwargs_repr(func: Callable, *args, **kwargs) -> List[dict]:
     """Returns information about the arguments of a function and \
     its inputted values.
@@ -75,27 +203,12 @@ def args_and_kwargs_repr(func: Callable, *args, **kwargs) -> List[dict]:
     See Also
     --------
     Uses:
-    :func:`~extra_ds_tools.format.arg_info`
+    :class:`~extra_ds_tools.format.ArgBinder`
 
     Used by:
     :func:`~extra_ds_tools.decorators.func_decorators.timeit_arg_info_dec`
     """
-    args_and_kwargs: List[dict] = []
-    sign = signature(func)
-    fullargspec = getfullargspec(func)
-    for index, arg in enumerate(args):
-        args_and_kwargs.append(arg_info(index, arg, sign, fullargspec))
-
-    for key, arg in kwargs.items():
-        args_and_kwargs.append(arg_info(key, arg, sign, fullargspec))
-
-    params = [info["param"] for info in args_and_kwargs]
-    if len(set(params)) < len(params):
-        raise TypeError(
-            "Two values were tried to set to the same parameter."
-            f"\nFound values for the following parameters:\n{params}"
-        )
-    return args_and_kwargs
+    return ArgBinder(func)(*args, **kwargs)
 
 
 def arg_info(
@@ -103,6 +216,7 @@ def arg_info(
     arg: Any,
     sign: inspect.signature,
     fullargspec: inspect.FullArgSpec,
+    memory_info: bool = False,
 ) -> dict:
     """Returns a dictionairy with comprehensive information about a single argument.
 
@@ -116,6 +230,9 @@ def arg_info(
         The signature of the function from the inspect module.
     fullargspec : inspect.FullArgSpec
         The FullArgSpec class of the function from the inspect module.
+    memory_info : bool, optional
+        If True also returns the memory footprint of the argument in bytes
+        under the key 'arg_bytes', see :func:`memory_footprint`, by default False
 
     Returns
     -------
@@ -148,27 +265,23 @@ def arg_info(
     'arg_value': '[1, 2]',
     'arg_len': 2}
 
+    >>> arg_info(key='n', arg=[1,2], sign=sign, fullargspec=fullargspec, memory_info=True)
+    {'param': 'n',
+    'type_hint': 'int',
+    'default_value': 1,
+    'arg_type': 'list',
+    'arg_value': '[1, 2]',
+    'arg_len': 2,
+    'arg_bytes': 72}
+
     See Also
     --------
     Uses:
     :func:`~extra_ds_tools.format.class_as_str_repr`
     :func:`~extra_ds_tools.format.truncated_value`
     :func:`~extra_ds_tools.format.make_empty_value_printable`
+    :func:`~extra_ds_tools.format.memory_footprint`
     """  # noqa
-    # store the value and type of the argument
-    arg_type: str = class_as_str_repr(arg)
-    arg_value: str = truncated_value(arg)
-
-    # check if value has a shape, e.g. with numpy arrays and pandas DataFrames
-    try:
-        arg_len = str(arg.shape)
-    except AttributeError:
-        # check if value has a length
-        try:
-            arg_len = len(arg)
-        except TypeError:
-            arg_len = ""
-
     # if the key is in int, it's an *args argument
     if isinstance(key, int):
         func_args = fullargspec.args
@@ -177,20 +290,13 @@ def arg_info(
         except IndexError:
             return {
                 "param": f"args[{key}]",
-                "arg_type": arg_type,
-                "arg_value": arg_value,
-                "arg_len": arg_len,
+                **_value_info(arg, memory_info),
             }
     # if the key is a string but doesn't have a parameter, it's a kwarg
     try:
         param_info = sign.parameters[key]
     except KeyError:
-        return {
-            "param": f"kwarg['{key}']",
-            "arg_type": arg_type,
-            "arg_value": arg_value,
-            "arg_len": arg_len,
-        }
+        return {"param": f"kwarg['{key}']", **_value_info(arg, memory_info)}
     # get the parameter type hint
     type_hint = class_as_str_repr(param_info.annotation)
 
@@ -202,10 +308,69 @@ def arg_info(
         "param": key,
         "type_hint": type_hint,
         "default_value": default_value,
-        "arg_type": arg_type,
-        "arg_value": arg_value,
+        **_value_info(arg, memory_info),
+    }
+
+
+def _value_info(arg: Any, memory_info: bool = False) -> dict:
+    """Returns the type, truncated value, length and optionally the memory \
+        footprint of an argument."""
+    # check if value has a shape, e.g. with numpy arrays and pandas DataFrames
+    try:
+        arg_len = str(arg.shape)
+    except AttributeError:
+        # check if value has a length
+        try:
+            arg_len = len(arg)
+        except TypeError:
+            arg_len = ""
+    value_info = {
+        "arg_type": class_as_str_repr(arg),
+        "arg_value": truncated_value(arg),
         "arg_len": arg_len,
     }
+    if memory_info:
+        value_info["arg_bytes"] = memory_footprint(arg)
+    return value_info
+
+
+def memory_footprint(arg: Any) -> int:
+    """Returns the memory footprint of a value in bytes.
+
+    Parameters
+    ----------
+    arg : Any
+        Any value.
+
+    Returns
+    -------
+    int
+        The size of the data of a NumPy array, the deep memory usage of a
+        pandas object including its index and the shallow size of any other
+        value.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> memory_footprint(np.zeros(1000))
+    8000
+
+    >>> import pandas as pd
+    >>> memory_footprint(pd.DataFrame({'a': ['x', 'y']}))
+    248
+
+    Other values only count their own size, not the size of their items.
+
+    >>> memory_footprint([1, 2])
+    72
+    """
+    if isinstance(arg, np.ndarray):
+        return arg.nbytes
+    if isinstance(arg, pd.DataFrame):
+        return int(arg.memory_usage(deep=True).sum())
+    if isinstance(arg, (pd.Series, pd.Index)):
+        return int(arg.memory_usage(deep=True))
+    return sys.getsizeof(arg)
 
 
 def truncated_value(arg: Any, str_limit: int = 20) -> str:
@@ -241,25 +406,280 @@ def truncated_value(arg: Any, str_limit: int = 20) -> str:
 
     >>> truncated_value(list(range(100)), str_limit = 20)
     [0, 1, 2,  .. 7, 98, 99]
+
+    Only the head and tail of lists, tuples, dicts, strings, deques,
+    namedtuples and their subclasses are converted to a string, and only a few
+    items at the edges of every axis of NumPy arrays, so huge arguments are
+    summarized as fast as small ones.
+
+    >>> truncated_value(list(range(10_000_000)))
+    [0, 1, 2,  .. , 9999999]
+
+    Sets have no order, so only their first items are shown and the rest is
+    elided.
+
+    >>> truncated_value(set(range(10_000_000)))
+    {0, 1, 2,  .. , 20, ...}
     """  # noqa
     if str_limit <= 0:
         raise ValueError(f"str_limit must be > 0, got {str_limit}")
-    len_str_repr = len(str(arg))
 
     # pandas DataFrames and Series have unclear string representation
     # so don't return those
-    if len_str_repr <= str_limit and not isinstance(
-        arg, (pd.DataFrame, pd.Series)
+    if isinstance(arg, (pd.DataFrame, pd.Series)):
+        return ""
+
+    half = int(str_limit / 2)
+    if half == 0:
+        # slicing [-0:] keeps the whole string representation
+        str_repr = str(arg)
+        if len(str_repr) <= str_limit:
+            return str_repr
+        return f" .. {str_repr}"
+
+    head, tail, complete = _str_edges(arg, str_limit + 1)
+    if complete and len(head) <= str_limit:
+        return head
+    return f"{head[:half]} .. {tail[-half:]}"
+
+
+# the representation of these types is fully determined by their items
+_CONTAINERS = (list, tuple, dict, set, frozenset)
+
+# the number of items numpy shows at the edges of every axis of an array
+_EDGE_ITEMS = 3
+
+
+def _str_edges(arg: Any, n: int) -> Tuple[str, str, bool]:
+    """Returns the edges of ``str(arg)``, see :func:`_repr_edges`."""
+    if isinstance(arg, str) and type(arg).__str__ is str.__str__:
+        if len(arg) <= n:
+            return str(arg), str(arg), True
+        return arg[:n], arg[-n:], False
+    if type(arg) is np.ndarray and arg.ndim > 0:
+        # let numpy summarize the array with only its edge items, a few per
+        # axis as every axis multiplies the number of items shown
+        str_repr = np.array2string(
+            arg, threshold=n, edgeitems=min(_EDGE_ITEMS, max(1, n // 2))
+        )
+        return str_repr, str_repr, True
+    if type(arg).__str__ is object.__str__:
+        # e.g. containers and their subclasses, whose str is their repr
+        return _repr_edges(arg, n, set())
+    str_repr = str(arg)
+    return str_repr, str_repr, True
+
+
+def _repr_edges(arg: Any, n: int, seen: set) -> Tuple[str, str, bool]:
+    """Returns the edges of ``repr(arg)`` without building the full string \
+        for large strings and containers.
+
+    The result is a tuple ``(head, tail, complete)``. If complete, head and
+    tail are both the full representation. Otherwise head is a prefix and tail
+    a suffix of the full representation, each at least n characters long.
+    """
+    if isinstance(arg, str) and type(arg).__repr__ is str.__repr__:
+        return _str_repr_edges(arg, n)
+    parts = _container_parts(arg, n)
+    if parts is None or not arg:
+        str_repr = repr(arg)
+        return str_repr, str_repr, True
+
+    opener, closer, items, reversed_items, assign = parts
+    # recursive containers are represented like python does, e.g. [[...]]
+    if id(arg) in seen:
+        str_repr = {"{": "{...}", "(": "(...)"}.get(opener[-1], "[...]")
+        return str_repr, str_repr, True
+
+    seen.add(id(arg))
+    try:
+        return _concat_edges(
+            chain(
+                [(opener, opener, True)],
+                _item_edges(items, assign, n, seen),
+                [(closer, closer, True)],
+            ),
+            chain(
+                [(closer, closer, True)],
+                _item_edges(reversed_items, assign, n, seen),
+                [(opener, opener, True)],
+            ),
+            n,
+        )
+    finally:
+        seen.discard(id(arg))
+
+
+def _container_parts(
+    arg: Any, n: int
+) -> Optional[Tuple[str, str, Iterator, Iterator, Optional[str]]]:
+    """Returns the brackets of a container, iterators over its items from the \
+        front and from the back, and the separator of keys and values.
+
+    Returns None if the representation of arg isn't the one of a builtin
+    container, deque, OrderedDict or namedtuple.
+    """
+    arg_type = type(arg)
+    name = arg_type.__name__
+    if isinstance(arg, deque) and arg_type.__repr__ is deque.__repr__:
+        closer = "])" if arg.maxlen is None else f"], maxlen={arg.maxlen})"
+        return f"{name}([", closer, iter(arg), reversed(arg), None
+    if (
+        isinstance(arg, OrderedDict)
+        and arg_type.__repr__ is OrderedDict.__repr__
     ):
-        return f"{arg}"
-    else:
-        if isinstance(arg, (pd.Series, pd.DataFrame)):
-            return ""
-        else:
-            return (
-                f"{str(arg)[:int(str_limit/2)]} .. "
-                f"{str(arg)[-int(str_limit/2):]}"
+        items, reversed_items = iter(arg.items()), reversed(arg.items())
+        if sys.version_info >= (3, 12):
+            return f"{name}({{", "})", items, reversed_items, ": "
+        # e.g. OrderedDict([('a', 1)])
+        return f"{name}([", "])", items, reversed_items, None
+    if isinstance(arg, tuple) and _is_namedtuple_repr(arg_type.__repr__):
+        fields = [_Verbatim(field) for field in arg._fields]
+        return (
+            f"{name}(",
+            ")",
+            zip(fields, arg),
+            zip(reversed(fields), reversed(arg)),
+            "=",
+        )
+    base = next(
+        (
+            base
+            for base in _CONTAINERS
+            if isinstance(arg, base) and arg_type.__repr__ is base.__repr__
+        ),
+        None,
+    )
+    if base is dict:
+        return "{", "}", iter(arg.items()), reversed(arg.items()), ": "
+    if base is list:
+        return "[", "]", iter(arg), reversed(arg), None
+    if base is tuple:
+        closer = ",)" if len(arg) == 1 else ")"
+        return "(", closer, iter(arg), reversed(arg), None
+    if base is None:
+        return None
+    return _set_parts(arg, n)
+
+
+def _set_parts(
+    arg: Any, n: int
+) -> Tuple[str, str, Iterator, Iterator, Optional[str]]:
+    """Returns the parts of a set, see :func:`_container_parts`."""
+    opener, closer = "{", "}"
+    if type(arg) is not set:
+        opener, closer = f"{type(arg).__name__}({{", "})"
+    # sets have no order, so only their first items are represented and the
+    # rest are elided, as n items are at least n characters
+    items = list(islice(arg, n))
+    if len(arg) > n:
+        return (
+            opener,
+            closer,
+            chain(items, [_ELIDED]),
+            chain([_ELIDED], reversed(items)),
+            None,
+        )
+    return opener, closer, iter(items), reversed(items), None
+
+
+def _is_namedtuple_repr(method: Any) -> bool:
+    """Returns whether a method is the ``__repr__`` of a namedtuple."""
+    return (
+        getattr(method, "__module__", None) == "collections"
+        and getattr(method, "__name__", None) == "__repr__"
+    )
+
+
+class _Verbatim:
+    """Represents a part of a representation that is shown as is, e.g. the \
+        field names of a namedtuple and the elided items of a set."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def __repr__(self) -> str:
+        return self.text
+
+
+_ELIDED = _Verbatim("...")
+
+
+def _item_edges(
+    items: Iterator, assign: Optional[str], n: int, seen: set
+) -> Iterator[Tuple[str, str, bool]]:
+    """Lazily yields the edges of the items of a container and their \
+        separators, with items as key and value pairs if assign is given."""
+    separator = (", ", ", ", True)
+    for index, item in enumerate(items):
+        if index:
+            yield separator
+        if assign is not None:
+            key_edges = _repr_edges(item[0], n, seen)
+            value_edges = _repr_edges(item[1], n, seen)
+            colon = (assign, assign, True)
+            yield _concat_edges(
+                iter([key_edges, colon, value_edges]),
+                iter([value_edges, colon, key_edges]),
+                n,
             )
+        else:
+            yield _repr_edges(item, n, seen)
+
+
+def _concat_edges(
+    forward: Iterator[Tuple[str, str, bool]],
+    backward: Iterator[Tuple[str, str, bool]],
+    n: int,
+) -> Tuple[str, str, bool]:
+    """Concatenates the edges of consecutive parts of a representation, \
+        walking from the front and from the back until n characters are found.
+    """
+    head_parts: List[str] = []
+    size = 0
+    for head, _, complete in forward:
+        head_parts.append(head)
+        size += len(head)
+        if not complete or size >= n:
+            break
+    else:
+        str_repr = "".join(head_parts)
+        return str_repr, str_repr, True
+
+    tail_parts: List[str] = []
+    size = 0
+    for _, tail, complete in backward:
+        tail_parts.append(tail)
+        size += len(tail)
+        if not complete or size >= n:
+            break
+    return "".join(head_parts), "".join(reversed(tail_parts)), False
+
+
+def _str_repr_edges(text: str, n: int) -> Tuple[str, str, bool]:
+    """Returns the edges of ``repr(text)`` using only its first and last n \
+        characters."""
+    if len(text) <= n:
+        str_repr = repr(text)
+        return str_repr, str_repr, True
+    # python uses double quotes only if the text has no double but does have
+    # single quotes, the edges must use the quotes of the full text
+    quote = '"' if "'" in text and '"' not in text else "'"
+    return (
+        _quoted_repr(text[:n], quote)[:-1],
+        _quoted_repr(text[-n:], quote)[1:],
+        False,
+    )
+
+
+def _quoted_repr(text: str, quote: str) -> str:
+    """Returns ``repr(text)`` enclosed by the given quote."""
+    str_repr = repr(text)
+    if str_repr[0] == quote:
+        return str_repr
+    # adding the other quote makes python choose the wanted one
+    str_repr = repr(text + ('"' if quote == "'" else "'"))
+    return str_repr[:-2] + str_repr[-1]
 
 
 def class_as_str_repr(instance: Any) -> str:
@@ -289,23 +709,60 @@ def class_as_str_repr(instance: Any) -> str:
     >>> class_as_str_repr(Union[List[str], None])
     'Union[List[str], NoneType]'
     """
-    # try except because numpy arrays don't accept ==
-    try:
-        if instance == inspect._empty:
-            return ""
-    except ValueError:
-        pass
+    # compare by identity, as numpy arrays and pandas objects compare
+    # elementwise with ==
+    if instance is inspect._empty:
+        return ""
     if instance is None:
         return "None"
 
+    instance_type = type(instance)
     # if the instance is from the typing module, just return the string
     # representation as that's more clear
-    elif "typing" in str(type(instance)).split(".")[0]:
-        return re.sub("typing.", "", str(instance))
+    if _is_typing_type(instance_type):
+        return _typing_repr(instance)
     elif isinstance(instance, type):
-        return f"""{re.findall("'([^']*)'", str(instance))[0]}"""
+        return _type_name(instance)
     else:
-        return f"""{re.findall("'([^']*)'", str(type(instance)))[0]}"""
+        return _type_name(instance_type)
+
+
+# the maximum number of types and typing constructs of which the string
+# representation is cached
+_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _type_name(type_: type) -> str:
+    """Returns the qualified name of a class, e.g. 'numpy.ndarray'."""
+    return f"""{re.findall("'([^']*)'", str(type_))[0]}"""
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _is_typing_type(type_: type) -> bool:
+    """Returns whether instances of a class are typing constructs."""
+    return "typing" in str(type_).split(".")[0]
+
+
+# typing constructs can be unhashable, e.g. Literal[[1]], so they are cached
+# by their id together with the construct itself to avoid reuse of the id
+_typing_reprs: Dict[int, Tuple[Any, str]] = {}
+
+
+def _typing_repr(instance: Any) -> str:
+    """Returns the string representation of a typing construct without the \
+        module prefixes, e.g. 'Union[List[str], NoneType]'."""
+    try:
+        cached_instance, typing_repr = _typing_reprs[id(instance)]
+        if cached_instance is instance:
+            return typing_repr
+    except KeyError:
+        pass
+    typing_repr = re.sub("typing.", "", str(instance))
+    if len(_typing_reprs) >= _CACHE_SIZE:
+        _typing_reprs.clear()
+    _typing_reprs[id(instance)] = (instance, typing_repr)
+    return typing_repr
 
 
 def make_empty_value_printable(value: Any) -> Any:
@@ -341,9 +798,9 @@ def make_empty_value_printable(value: Any) -> Any:
     >>> print(make_empty_value_printable(None))
     None
     """
-    if value == inspect._empty:
+    if value is inspect._empty:
         return ""
-    if value == "":
+    if isinstance(value, str) and value == "":
         return "''"
     if value is None:
         return "None"
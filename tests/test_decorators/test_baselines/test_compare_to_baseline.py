@@ -0,0 +1,84 @@
+import json
+import random
+
+import pytest
+from extra_ds_tools.decorators.baselines import (
+    PerformanceRegressionError,
+    PerformanceRegressionWarning,
+    compare_to_baseline,
+    load_baseline,
+    save_baseline,
+)
+from extra_ds_tools.decorators.stats import StatsRegistry
+
+
+def make_registry(mean_ns, n=200, name="module.job", seed=0):
+    rng = random.Random(seed)
+    registry = StatsRegistry()
+    stats = registry.get(name)
+    for _ in range(n):
+        stats.record(int(rng.gauss(mean_ns, mean_ns / 10)))
+    return registry
+
+
+@pytest.mark.parametrize("file_name", ["baseline.json", "baseline.sqlite"])
+def test_save_and_load(tmp_path, file_name):
+    path = str(tmp_path / file_name)
+    registry = make_registry(1_000_000)
+    save_baseline(path, registry)
+    save_baseline(path, make_registry(2_000_000, name="module.other"))
+    baseline = load_baseline(path)
+    assert set(baseline) == {"module.job", "module.other"}
+    assert (
+        baseline["module.job"].summary()
+        == registry.get("module.job").summary()
+    )
+
+
+def test_json_is_keyed_by_function(tmp_path):
+    path = tmp_path / "baseline.json"
+    save_baseline(str(path), make_registry(1_000_000))
+    assert list(json.loads(path.read_text())) == ["module.job"]
+
+
+def test_no_regression(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    save_baseline(path, make_registry(1_000_000))
+    current = make_registry(1_020_000, seed=1)
+    assert compare_to_baseline(path, registry=current) == []
+
+
+def test_regression_warns(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    save_baseline(path, make_registry(1_000_000))
+    current = make_registry(1_500_000, seed=1)
+    with pytest.warns(PerformanceRegressionWarning, match="module.job: mean"):
+        (regression,) = compare_to_baseline(path, registry=current)
+    assert regression["ratio"] == pytest.approx(1.5, rel=0.05)
+    assert regression["p_value"] < 0.01
+
+
+def test_regression_raises(tmp_path):
+    path = str(tmp_path / "baseline.db")
+    save_baseline(path, make_registry(1_000_000))
+    current = make_registry(1_500_000, seed=1)
+    with pytest.raises(PerformanceRegressionError):
+        compare_to_baseline(
+            path, metric="p95", on_regression="raise", registry=current
+        )
+
+
+def test_too_few_calls_are_not_compared(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    save_baseline(path, make_registry(1_000_000))
+    current = make_registry(5_000_000, n=5, seed=1)
+    assert compare_to_baseline(path, registry=current) == []
+
+
+def test_invalid_options(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    save_baseline(path, make_registry(1_000_000))
+    with pytest.raises(ValueError):
+        compare_to_baseline(path, metric="median")
+    with pytest.raises(ValueError):
+        compare_to_baseline(path, on_regression="fail")
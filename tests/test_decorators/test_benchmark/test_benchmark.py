@@ -0,0 +1,132 @@
+import gc
+from functools import lru_cache, partial
+from time import sleep
+
+import pytest
+from extra_ds_tools.decorators.benchmark import DEFAULT_REPEATS, benchmark
+from extra_ds_tools.decorators.func_decorators import timeit_arg_info_dec
+
+
+def multiply_text(text: str, n: int = 1):
+    return text * n
+
+
+def test_statistics(capfd):
+    results = benchmark(multiply_text, "hello", n=2, repeats=200)
+    assert results["runs"] == 200
+    assert results["result"] == "hellohello"
+    assert len(results["times_s"]) == 200
+    assert results["min_s"] <= results["median_s"]
+    low, high = results["median_ci_s"]
+    assert low <= results["median_s"] <= high
+    low, high = results["mean_ci_s"]
+    assert low <= results["mean_s"] <= high
+    out, _ = capfd.readouterr()
+    assert "arg_value" in out
+    assert "runs: 200 (3 warmup)" in out
+    assert "median: " in out and "(95% CI " in out
+    assert "Returned:\nhellohello" in out
+
+
+def test_default_repeats_and_warmup(capfd):
+    calls = []
+    results = benchmark(calls.append, 1, warmup=2, print_output=False)
+    assert results["runs"] == DEFAULT_REPEATS
+    assert len(calls) == DEFAULT_REPEATS + 2
+    out, _ = capfd.readouterr()
+    assert "Returned" not in out
+
+
+def test_time_budget(capfd):
+    results = benchmark(sleep, 0.01, warmup=0, time_budget=0.05)
+    assert 5 <= results["runs"] <= 6
+    results = benchmark(sleep, 0.01, warmup=0, repeats=2, time_budget=1)
+    assert results["runs"] == 2
+
+
+def test_disable_gc(capfd):
+    enabled = []
+    benchmark(
+        lambda: enabled.append(gc.isenabled()), warmup=1, disable_gc=True
+    )
+    assert enabled[0] is True
+    assert not any(enabled[1:])
+    assert gc.isenabled()
+
+
+def test_decorated_function_runs_undecorated(capfd):
+    decorated = timeit_arg_info_dec(multiply_text)
+    benchmark(decorated, "hello", repeats=5)
+    out, _ = capfd.readouterr()
+    assert out.count("took") == 1
+
+
+def test_partial_of_decorated_function(capfd):
+    decorated = timeit_arg_info_dec(multiply_text)
+    results = benchmark(partial(decorated, "hello", n=2), repeats=5)
+    assert results["result"] == "hellohello"
+    out, _ = capfd.readouterr()
+    assert out.count("took") == 1
+    assert "multiply_text() took" in out
+    assert "hello" in out.split("took")[0]
+
+
+def test_other_decorators_are_kept(capfd):
+    calls = []
+
+    @lru_cache(maxsize=None)
+    def cached(n):
+        calls.append(n)
+        return n * 2
+
+    results = benchmark(cached, 21, repeats=5)
+    assert results["result"] == 42
+    # only the first warmup run misses the cache
+    assert calls == [21]
+    assert cached.cache_info().hits == 7
+    out, _ = capfd.readouterr()
+    assert "cached() took" in out
+    assert "arg_value" in out
+
+
+class Model:
+    @timeit_arg_info_dec
+    def predict(self, x):
+        return x + 1
+
+
+def test_decorated_method(capfd):
+    results = benchmark(Model().predict, 1, repeats=3)
+    assert results["result"] == 2
+    out, _ = capfd.readouterr()
+    assert out.count("took") == 1
+
+
+class Repeater:
+    def __call__(self, text):
+        return text * 2
+
+    def __repr__(self):
+        return "Repeater()"
+
+
+def test_callable_object(capfd):
+    results = benchmark(Repeater(), "hi", repeats=2)
+    assert results["result"] == "hihi"
+    out, _ = capfd.readouterr()
+    assert "Repeater()() took" in out
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"warmup": -1},
+        {"repeats": 0},
+        {"time_budget": 0},
+        {"confidence": 1},
+        {"n_resamples": 0},
+    ],
+)
+def test_invalid_options(kwargs):
+    with pytest.raises(ValueError):
+        benchmark(multiply_text, "hello", **kwargs)
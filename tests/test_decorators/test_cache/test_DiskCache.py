@@ -0,0 +1,40 @@
+import os
+import threading
+
+import pytest
+from extra_ds_tools.decorators.cache import DiskCache
+
+
+def test_round_trip(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache"), max_bytes=10_000)
+    assert cache.lookup("a") == (False, None)
+    cache.put("a", {"values": [1, 2, 3]})
+    assert cache.lookup("a") == (True, {"values": [1, 2, 3]})
+    # another cache on the same directory finds the value
+    assert DiskCache(cache.directory, 10_000).lookup("a")[0]
+    cache.clear()
+    assert cache.lookup("a") == (False, None)
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=2_500)
+    for index, key in enumerate("abc"):
+        cache.put(key, b"x" * 1_000)
+        # make the order of use independent of the timestamp resolution
+        os.utime(cache._path(key), (index, index))
+    assert not cache.lookup("a")[0]
+    assert cache.lookup("b")[0]
+    os.utime(cache._path("c"), (5, 5))
+    cache.put("d", b"x" * 1_000)
+    assert not cache.lookup("c")[0]
+    assert cache.lookup("b")[0] and cache.lookup("d")[0]
+    # a value larger than the maximum isn't stored
+    cache.put("e", b"x" * 3_000)
+    assert not cache.lookup("e")[0]
+
+
+def test_unpicklable_value(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1_000)
+    with pytest.raises(TypeError):
+        cache.put("a", threading.Lock())
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,35 @@
+import pytest
+from extra_ds_tools.decorators.cache import MemoryCache
+
+
+def test_evicts_least_recently_used():
+    cache = MemoryCache(max_bytes=30)
+    cache.put("a", 1, 10)
+    cache.put("b", 2, 10)
+    cache.put("c", 3, 10)
+    assert cache.lookup("a") == (True, 1)
+    cache.put("d", 4, 10)
+    assert cache.lookup("b") == (False, None)
+    assert [cache.lookup(key)[0] for key in "acd"] == [True, True, True]
+    assert cache.nbytes == 30
+    # replacing a value counts its new size
+    cache.put("a", 5, 20)
+    assert cache.nbytes == 30
+    assert len(cache) == 2
+
+
+def test_too_large_values_are_not_kept():
+    cache = MemoryCache(max_bytes=10)
+    cache.put("a", 1, 11)
+    assert cache.lookup("a") == (False, None)
+    assert cache.nbytes == 0
+
+
+def test_clear_and_invalid_options():
+    cache = MemoryCache(max_bytes=10)
+    cache.put("a", 1, 5)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+    with pytest.raises(ValueError):
+        MemoryCache(max_bytes=-1)
@@ -0,0 +1,127 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from extra_ds_tools.decorators.cache import content_hash
+
+
+def test_arrays():
+    array = np.arange(12, dtype=float).reshape(3, 4)
+    assert content_hash(array) == content_hash(array.copy())
+    # a non-contiguous view equals its contiguous copy
+    assert content_hash(array[:, ::2]) == content_hash(array[:, ::2].copy())
+    # a Fortran ordered array is hashed in its own order
+    assert content_hash(array.T) == content_hash(np.asfortranarray(array.T))
+    assert content_hash(array.T) != content_hash(array.T.copy(order="C"))
+    assert content_hash(array) != content_hash(array.reshape(4, 3))
+    assert content_hash(array) != content_hash(array.astype(np.float32))
+    changed = array.copy()
+    changed[2, 3] = -1
+    assert content_hash(array) != content_hash(changed)
+    dates = np.array(["2023-01-01", "2023-01-02"], dtype="datetime64[ns]")
+    assert content_hash(dates) == content_hash(dates.copy())
+    objects = np.array(["a", None, 1], dtype=object)
+    assert content_hash(objects) == content_hash(objects.copy())
+
+
+def test_frames():
+    frame = pd.DataFrame(
+        {
+            "a": [1, 2, 3],
+            "b": [0.5, 1.5, 2.5],
+            "c": ["x", "y", "z"],
+            "d": pd.Categorical(["u", "v", "u"]),
+            "e": pd.date_range("2023", periods=3, tz="UTC"),
+        }
+    )
+    assert content_hash(frame) == content_hash(frame.copy())
+    assert content_hash(frame) != content_hash(frame.set_index("a"))
+    assert content_hash(frame) != content_hash(frame.rename(columns=str.upper))
+    assert content_hash(frame) != content_hash(frame.astype({"a": float}))
+    assert content_hash(frame) != content_hash(frame.iloc[::-1])
+    changed = frame.copy()
+    changed.loc[1, "c"] = "w"
+    assert content_hash(frame) != content_hash(changed)
+    naive = frame.assign(e=frame["e"].dt.tz_localize(None))
+    assert content_hash(frame) != content_hash(naive)
+
+
+def test_frame_from_2d_array():
+    array = np.arange(12, dtype=float).reshape(3, 4)
+    frame = pd.DataFrame(array, columns=list("abcd"))
+    copy = pd.DataFrame(array.copy(), columns=list("abcd"))
+    assert content_hash(frame) == content_hash(copy)
+    assert content_hash(frame) != content_hash(frame * 2)
+
+
+def test_categoricals():
+    ab, xy = pd.Categorical(["a", "b"]), pd.Categorical(["x", "y"])
+    assert content_hash(pd.Series(ab)) != content_hash(pd.Series(xy))
+    assert content_hash(pd.DataFrame({"c": ab})) != content_hash(
+        pd.DataFrame({"c": xy})
+    )
+    assert content_hash(ab) != content_hash(ab.as_ordered())
+    assert content_hash(pd.Series(ab)) == content_hash(pd.Series(ab.copy()))
+
+
+def test_series_and_index():
+    series = pd.Series([1.0, 2.0], index=["a", "b"], name="s")
+    assert content_hash(series) == content_hash(series.copy())
+    assert content_hash(series) != content_hash(series.rename("t"))
+    assert content_hash(series) != content_hash(series.reset_index(drop=True))
+    assert content_hash(pd.Index([1, 2])) != content_hash(pd.Index([2, 1]))
+
+
+def test_objects_by_type_and_value():
+    assert content_hash(np.array([1, "a"], dtype=object)) != content_hash(
+        np.array(["1", "a"], dtype=object)
+    )
+    assert content_hash(pd.DataFrame({"id": [1, "a"]})) != content_hash(
+        pd.DataFrame({"id": ["1", "a"]})
+    )
+    assert content_hash(pd.Index([1, "a"])) != content_hash(
+        pd.Index(["1", "a"])
+    )
+    strings = pd.Series(["a", "b", None])
+    assert content_hash(strings) == content_hash(strings.copy())
+
+
+def test_list_cells():
+    frame = pd.DataFrame({"tags": [[1, 2], ["a"]]})
+    assert content_hash(frame) == content_hash(frame.copy(deep=True))
+    assert content_hash(frame) != content_hash(
+        pd.DataFrame({"tags": [[1, 2], ["b"]]})
+    )
+
+
+def test_other_values():
+    assert content_hash([1, {"a": (2, 3)}]) == content_hash([1, {"a": (2, 3)}])
+    assert content_hash(1) != content_hash(1.0)
+    assert content_hash("ab", "c") != content_hash("a", "bc")
+    assert content_hash([np.zeros(3)]) == content_hash([np.zeros(3)])
+    assert content_hash({"b", "a", 1}) == content_hash({1, "a", "b"})
+    assert content_hash({"a"}) != content_hash(frozenset({"a"}))
+    assert content_hash({"a", "b"}) != content_hash({"a", "c"})
+    with pytest.raises(TypeError):
+        content_hash(lambda x: x)
+
+
+def test_sets_in_other_processes():
+    code = (
+        "from extra_ds_tools.decorators.cache import content_hash; "
+        "print(content_hash({'a', 'b', 'c', 'd'}))"
+    )
+    digests = {
+        subprocess.run(
+            [sys.executable, "-c", code],
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        for seed in ("1", "2", "3")
+    }
+    assert len(digests) == 1
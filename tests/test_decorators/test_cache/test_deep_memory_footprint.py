@@ -0,0 +1,16 @@
+import numpy as np
+from extra_ds_tools.decorators.cache import deep_memory_footprint
+from extra_ds_tools.format import memory_footprint
+
+
+def test_counts_items():
+    X, y = np.zeros((100, 10)), np.zeros(100)
+    assert deep_memory_footprint((X, y)) > X.nbytes + y.nbytes
+    assert deep_memory_footprint({"X": X}) > X.nbytes
+    assert deep_memory_footprint([[X]]) > X.nbytes
+    assert deep_memory_footprint(X) == memory_footprint(X)
+
+
+def test_counts_shared_items_once():
+    X = np.zeros(1000)
+    assert deep_memory_footprint((X, X)) < 2 * X.nbytes
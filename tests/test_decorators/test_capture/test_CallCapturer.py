@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+from extra_ds_tools.decorators.capture import (
+    ARGUMENTS_FILE,
+    CALL_FILE,
+    CallCapturer,
+    load_call,
+)
+
+
+def scale(df, factor, weights=None, label="x"):
+    return df * factor
+
+
+def capture(capturer, args, kwargs, exec_time_ns):
+    return capturer.capture(capturer.snapshot(args, kwargs), exec_time_ns)
+
+
+def test_round_trip(tmp_path):
+    capturer = CallCapturer(scale, str(tmp_path))
+    df = pd.DataFrame({"a": [1.0, 2.0]}, index=["x", "y"])
+    weights = np.arange(6).reshape(2, 3)
+    path = capture(capturer, (df, 2), {"weights": weights, "label": "y"}, 10)
+    # the frame is pickled without a Parquet engine
+    assert {
+        CALL_FILE,
+        ARGUMENTS_FILE,
+        "arg_1.pkl",
+        "kwarg_0.npy",
+        "kwarg_1.pkl",
+    } <= set(os.listdir(path))
+    with open(os.path.join(path, CALL_FILE)) as file:
+        call = json.load(file)
+    assert call["qualname"] == "scale"
+    assert [record["param"] for record in call["arguments"]] == [
+        "df",
+        "factor",
+        "weights",
+        "label",
+    ]
+    func, args, kwargs = load_call(path)
+    assert func is scale
+    pd.testing.assert_frame_equal(args[0], df)
+    assert args[1] == 2
+    np.testing.assert_array_equal(kwargs["weights"], weights)
+    assert kwargs["label"] == "y"
+
+
+def test_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    capturer = CallCapturer(scale, str(tmp_path))
+    df = pd.DataFrame({"a": [1.0, 2.0]})
+    series = pd.Series([1, 2], name="s")
+    path = capture(capturer, (df, series), {}, 10)
+    assert {"arg_0.parquet", "arg_1.parquet"} <= set(os.listdir(path))
+    _, args, _ = load_call(path)
+    pd.testing.assert_frame_equal(args[0], df)
+    pd.testing.assert_series_equal(args[1], series)
+
+
+def test_threshold_and_maximum(tmp_path):
+    capturer = CallCapturer(
+        scale, str(tmp_path), threshold=0.5, max_captures=2
+    )
+    assert capture(capturer, (1, 2), {}, 100_000_000) is None
+    assert capture(capturer, (1, 2), {}, 600_000_000) is not None
+    snapshot = capturer.snapshot((1, 2), {})
+    assert capture(capturer, (1, 2), {}, 600_000_000) is not None
+    # no more snapshots are taken once the maximum is reached
+    assert capturer.snapshot((1, 2), {}) is None
+    assert capturer.capture(snapshot, 600_000_000) is None
+    assert len(os.listdir(tmp_path)) == 2
+    with pytest.raises(ValueError):
+        CallCapturer(scale, str(tmp_path), threshold=-1)
+
+
+def test_failed_capture_is_removed(tmp_path, caplog):
+    capturer = CallCapturer(scale, str(tmp_path))
+    assert capturer.snapshot((threading.Lock(), 2), {}) is None
+    assert os.listdir(tmp_path) == []
+    assert "Failed to capture" in caplog.text
+
+
+def test_local_function_is_not_importable(tmp_path):
+    def local(x):
+        return x
+
+    path = capture(CallCapturer(local, str(tmp_path)), (1,), {}, 10)
+    with pytest.raises(ImportError):
+        load_call(path)
+
+
+def test_inputs_before_the_call(tmp_path):
+    capturer = CallCapturer(scale, str(tmp_path))
+    values = [1, 2]
+    records = [{"param": "df"}]
+    snapshot = capturer.snapshot((values, 2), {}, records)
+    values.append(3)
+    path = capturer.capture(snapshot, 10)
+    _, args, _ = load_call(path)
+    assert args == ([1, 2], 2)
+    # the argument records of the call are written as given
+    with open(os.path.join(path, CALL_FILE)) as file:
+        assert json.load(file)["arguments"] == records
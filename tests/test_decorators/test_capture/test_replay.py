@@ -0,0 +1,39 @@
+import numpy as np
+from extra_ds_tools.decorators.capture import CallCapturer, replay
+
+
+def normalize(values, epsilon=1e-9):
+    return values / (values.sum() + epsilon)
+
+
+def test_replay(tmp_path, capsys):
+    values = np.arange(10.0)
+    capturer = CallCapturer(normalize, str(tmp_path))
+    path = capturer.capture(capturer.snapshot((values,), {"epsilon": 0.5}), 10)
+    results = replay(path, warmup=0, repeats=3)
+    np.testing.assert_array_equal(results["result"], values / 45.5)
+    assert results["runs"] == 3
+    assert "normalize() took" in capsys.readouterr().out
+    # a new version of the function runs on the captured arguments
+    results = replay(
+        path, lambda values, epsilon: epsilon, repeats=1, print_output=False
+    )
+    assert results["result"] == 0.5
+
+
+def resample(values, repeats, warmup=0):
+    return np.repeat(values, repeats)[warmup:]
+
+
+def test_captured_keywords_named_like_options(tmp_path, capsys):
+    capturer = CallCapturer(resample, str(tmp_path))
+    values = np.arange(3)
+    path = capturer.capture(
+        capturer.snapshot((values,), {"repeats": 2, "warmup": 1}), 10
+    )
+    results = replay(path, repeats=4)
+    np.testing.assert_array_equal(results["result"], [0, 1, 1, 2, 2])
+    assert results["runs"] == 4
+    output = capsys.readouterr().out
+    assert "resample() took" in output
+    assert "runs: 4 (3 warmup)" in output
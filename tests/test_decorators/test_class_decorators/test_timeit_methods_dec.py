@@ -0,0 +1,129 @@
+import gc
+import pickle
+
+import numpy as np
+from extra_ds_tools.decorators import class_decorators
+from extra_ds_tools.decorators.class_decorators import (
+    instance_stats,
+    timeit_methods_dec,
+)
+from extra_ds_tools.decorators.stats import reset_stats, snapshot_stats
+from extra_ds_tools.ml.sklearn.meta_estimators import EstimatorSwitch
+from sklearn.base import BaseEstimator, TransformerMixin, clone
+from sklearn.linear_model import LinearRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+
+@timeit_methods_dec(per_instance=True, param_info=False, print_output=False)
+class Scaler(TransformerMixin, BaseEstimator):
+    def __init__(self, factor=2):
+        self.factor = factor
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        return X * self.factor
+
+
+def calls(stats, name):
+    return stats[f"{__name__}.{name}"]["calls"]
+
+
+def test_times_methods_per_class_and_instance():
+    reset_stats()
+    X = np.ones((10, 2))
+    first, second = Scaler(), Scaler(factor=3)
+    np.testing.assert_array_equal(first.fit_transform(X), X * 2)
+    second.fit(X)
+    second.transform(X)
+    second.transform(X)
+    stats = snapshot_stats()
+    assert calls(stats, "Scaler.fit") == 2
+    assert calls(stats, "Scaler.transform") == 3
+    # inherited from TransformerMixin, but collected under Scaler
+    assert calls(stats, "Scaler.fit_transform") == 1
+    assert f"{__name__}.Scaler.predict" not in stats
+    # per instance apart from the statistics of the class
+    assert not any(name.endswith("]") for name in stats)
+    assert calls(instance_stats(first), "Scaler.fit") == 1
+    assert calls(instance_stats(second), "Scaler.transform") == 2
+    assert instance_stats(Scaler()) == {}
+    reset_stats()
+
+
+def test_instance_stats_are_bounded(monkeypatch):
+    monkeypatch.setattr(class_decorators, "MAX_INSTANCES", 2)
+    X = np.ones((2, 1))
+    scalers = [Scaler() for _ in range(3)]
+    for scaler in scalers:
+        scaler.fit(X)
+    assert [bool(instance_stats(scaler)) for scaler in scalers] == [
+        True,
+        True,
+        False,
+    ]
+    # forgotten with their instance
+    del scalers[0]
+    gc.collect()
+    Scaler().fit(X)
+    assert sum(bool(instance_stats(scaler)) for scaler in scalers) == 1
+
+
+def test_instance_isnt_rendered(capsys):
+    class Unrenderable:
+        def fit(self, X):
+            return len(X)
+
+        def __repr__(self):
+            raise AssertionError("the instance is rendered")
+
+    timeit_methods_dec(Unrenderable)
+    Unrenderable().fit([1, 2])
+    out = capsys.readouterr().out
+    assert "fit() took" in out
+    assert "self" not in out
+
+
+def test_estimator_api_is_unchanged():
+    scaler = Scaler(factor=5)
+    assert scaler.get_params() == {"factor": 5}
+    cloned = clone(scaler)
+    assert type(cloned) is Scaler
+    assert cloned.get_params() == {"factor": 5}
+    scaler.set_params(factor=4)
+    scaler.fit(np.ones((2, 1)))
+    assert vars(scaler) == {"factor": 4}
+    restored = pickle.loads(pickle.dumps(scaler))
+    assert restored.factor == 4
+
+
+def test_subclasses_of_estimators(capsys):
+    @timeit_methods_dec(
+        methods=["fit", "predict"], per_instance=False, param_info=False
+    )
+    class TimedPipeline(Pipeline):
+        pass
+
+    @timeit_methods_dec(param_info=False, print_output=False)
+    class TimedSwitch(EstimatorSwitch):
+        pass
+
+    reset_stats()
+    X, y = np.arange(20.0).reshape(10, 2), np.arange(10.0)
+    pipeline = TimedPipeline(
+        [("scale", TimedSwitch(StandardScaler())), ("lr", LinearRegression())]
+    )
+    pipeline.fit(X, y).predict(X)
+    assert "fit() took" in capsys.readouterr().out
+    stats = snapshot_stats()
+    prefix = f"{__name__}.test_subclasses_of_estimators.<locals>"
+    assert stats[f"{prefix}.TimedPipeline.fit"]["calls"] == 1
+    assert stats[f"{prefix}.TimedPipeline.predict"]["calls"] == 1
+    assert stats[f"{prefix}.TimedSwitch.transform"]["calls"] == 1
+    assert not any(name.endswith("]") for name in stats if "Pipeline" in name)
+    # the method that depends on the final estimator is still unavailable
+    assert not hasattr(TimedPipeline([("scale", StandardScaler())]), "predict")
+    assert clone(pipeline).get_params()["scale__apply"]
+    reset_stats()
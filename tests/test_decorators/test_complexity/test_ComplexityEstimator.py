@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from extra_ds_tools.decorators.complexity import ComplexityEstimator
+
+
+@pytest.mark.parametrize(
+    "scaling, runtime_ns",
+    [
+        ("O(1)", lambda n: 100_000),
+        ("O(n)", lambda n: 100 * n + 10_000),
+        ("O(n log n)", lambda n: 50 * n * np.log2(n)),
+        ("O(n^2)", lambda n: n * n),
+    ],
+)
+def test_scaling(scaling, runtime_ns):
+    rng = np.random.default_rng(0)
+    estimator = ComplexityEstimator("module.func")
+    for n in np.unique(np.logspace(2, 5, 30).astype(int)):
+        for _ in range(3):
+            noise = rng.lognormal(0, 0.1)
+            estimator.add(int(n), int(runtime_ns(n) * noise))
+    estimate = estimator.estimate()
+    assert estimate["scaling"] == scaling
+    assert estimate["calls"] == 90
+    assert estimate["min_n"] == 100
+    assert estimate["max_n"] == 100_000
+    assert estimate["time_at_2x_max_n_s"] == pytest.approx(
+        runtime_ns(200_000) / 1e9, rel=0.25
+    )
+
+
+def test_throughput():
+    estimator = ComplexityEstimator("module.func")
+    for n in [1_000, 2_000, 3_000]:
+        estimator.add(n, n * 1_000)
+    assert estimator.estimate()["items_per_s"] == pytest.approx(1e6)
+
+
+def test_unknown_without_enough_sizes():
+    estimator = ComplexityEstimator("module.func")
+    for n in [1_000, 1_500, 2_000]:
+        estimator.add(n, n * 1_000)
+    estimate = estimator.estimate()
+    assert estimate["scaling"] == "unknown"
+    assert estimate["time_at_2x_max_n_s"] is None
+
+
+def test_keeps_max_samples():
+    estimator = ComplexityEstimator("module.func", max_samples=10)
+    for n in range(1, 101):
+        estimator.add(n, n)
+    assert estimator.calls == 100
+    assert len(estimator._sizes) == 10
+    estimator.reset()
+    assert estimator.estimate() == {"function": "module.func", "calls": 0}
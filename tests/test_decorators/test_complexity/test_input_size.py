@@ -0,0 +1,13 @@
+import numpy as np
+import pandas as pd
+from extra_ds_tools.decorators.complexity import input_size
+
+
+def test_largest_argument():
+    df = pd.DataFrame({"a": range(10)})
+    assert input_size((df, "a"), {"n": 3}) == 10
+    assert input_size((np.zeros((4, 20)),), {"values": list(range(6))}) == 6
+
+
+def test_no_sized_argument():
+    assert input_size((1, 2.0), {"x": None}) is None
@@ -0,0 +1,124 @@
+import pickle
+import threading
+
+import numpy as np
+import pandas as pd
+from extra_ds_tools.decorators.func_decorators import memoize_dec
+
+calls = []
+
+
+@memoize_dec
+def column_means(df: pd.DataFrame, scale: float = 1.0) -> pd.Series:
+    calls.append(len(df))
+    return df.mean() * scale
+
+
+def test_memoizes_by_content():
+    column_means.cache_clear()
+    calls.clear()
+    df = pd.DataFrame({"a": np.arange(10.0), "b": np.arange(10.0, 20.0)})
+    first = column_means(df)
+    # equal content and arguments bound to the same parameters
+    assert column_means(df.copy(), 1.0) is first
+    assert column_means(df, scale=1.0) is first
+    assert calls == [10]
+    changed = df.copy()
+    changed.iloc[0, 0] = 100
+    column_means(changed)
+    column_means(df, scale=2.0)
+    assert calls == [10, 10, 10]
+    info = column_means.cache_info()
+    assert (info["hits"], info["misses"], info["items"]) == (2, 3, 3)
+    assert column_means.__name__ == "column_means"
+
+
+def test_categories_are_part_of_the_key():
+    @memoize_dec
+    def first_value(series):
+        return series.iloc[0]
+
+    assert first_value(pd.Series(pd.Categorical(["a", "b"]))) == "a"
+    assert first_value(pd.Series(pd.Categorical(["x", "y"]))) == "x"
+
+
+def test_objects_are_part_of_the_key():
+    calls = []
+
+    @memoize_dec
+    def first_id(df):
+        calls.append(df)
+        return df["id"].iloc[0]
+
+    assert first_id(pd.DataFrame({"id": [1, "a"]})) == 1
+    assert first_id(pd.DataFrame({"id": ["1", "a"]})) == "1"
+    assert first_id(pd.DataFrame({"id": [[1], "a"]})) == [1]
+    assert first_id(pd.DataFrame({"id": [[1], "a"]})) == [1]
+    assert len(calls) == 3
+    assert first_id.cache_info()["hits"] == 1
+
+
+def test_memory_budget():
+    @memoize_dec(max_bytes=2_000)
+    def ones(n):
+        return np.ones(n)
+
+    ones(100)
+    ones(100)
+    # too large to keep
+    ones(1_000)
+    ones(1_000)
+    assert ones.cache_info()["hits"] == 1
+    assert ones.cache_info()["misses"] == 3
+    assert ones.cache_info()["bytes"] == 800
+
+
+def test_memory_budget_counts_items():
+    @memoize_dec(max_bytes=10_000)
+    def split(n):
+        return np.ones(n), np.zeros(n)
+
+    for n in range(500, 510):
+        split(n)
+    info = split.cache_info()
+    assert info["items"] == 1
+    assert 8_000 < info["bytes"] <= 10_000
+
+
+def test_disk_tier(tmp_path):
+    def square(array):
+        calls.append("square")
+        return array**2
+
+    calls.clear()
+    first = memoize_dec(disk_dir=str(tmp_path))(square)
+    first(np.arange(5))
+    # a new process would start with an empty memory cache
+    second = memoize_dec(disk_dir=str(tmp_path))(square)
+    np.testing.assert_array_equal(second(np.arange(5)), np.arange(5) ** 2)
+    assert calls == ["square"]
+    assert second.cache_info()["disk_hits"] == 1
+    second.cache_clear()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_uncacheable_arguments_and_outputs(tmp_path):
+    @memoize_dec(disk_dir=str(tmp_path))
+    def make_lock(argument=None):
+        return threading.Lock()
+
+    make_lock(lambda: None)
+    assert make_lock.cache_info()["uncached"] == 1
+    # an output that can't be pickled is still kept in memory
+    assert make_lock() is make_lock()
+    assert make_lock.cache_info()["hits"] == 1
+
+
+def test_method_and_pickle():
+    class Model:
+        @memoize_dec
+        def predict(self, x):
+            return x * 2
+
+    assert Model().predict(2) == 4
+    assert pickle.loads(pickle.dumps(column_means)) is column_means
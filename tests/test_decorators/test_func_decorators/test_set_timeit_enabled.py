@@ -0,0 +1,37 @@
+import pytest
+from extra_ds_tools.decorators.func_decorators import (
+    DISABLE_ENV_VAR,
+    set_timeit_enabled,
+    timeit_arg_info_dec,
+    timeit_is_enabled,
+)
+
+
+def add(a, b):
+    return a + b
+
+
+@pytest.fixture
+def disabled():
+    set_timeit_enabled(False)
+    yield
+    set_timeit_enabled(True)
+
+
+def test_disabled_returns_function(disabled):
+    assert not timeit_is_enabled()
+    assert timeit_arg_info_dec(add) is add
+    assert timeit_arg_info_dec(print_output=False)(add) is add
+
+
+@pytest.mark.parametrize("value", ["1", "true", "YES"])
+def test_disabled_by_env_var(monkeypatch, value):
+    monkeypatch.setenv(DISABLE_ENV_VAR, value)
+    assert timeit_arg_info_dec(add) is add
+
+
+def test_enabled_wraps_function(monkeypatch):
+    monkeypatch.setenv(DISABLE_ENV_VAR, "0")
+    decorated = timeit_arg_info_dec(add)
+    assert decorated is not add
+    assert decorated.__wrapped__ is add
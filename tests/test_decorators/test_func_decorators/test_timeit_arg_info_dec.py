@@ -1,8 +1,40 @@
+import asyncio
+import gc
+import inspect
+import json
+import pickle
+import tracemalloc
 from difflib import SequenceMatcher
+from time import perf_counter, sleep
 from typing import List
 
+import numpy as np
 import pandas as pd
-from extra_ds_tools.decorators.func_decorators import timeit_arg_info_dec
+import pytest
+from extra_ds_tools.decorators.complexity import (
+    estimate_complexity,
+    print_complexity,
+    reset_complexity,
+)
+from extra_ds_tools.decorators.func_decorators import (
+    DISABLE_ENV_VAR,
+    timeit_arg_info_dec,
+)
+from extra_ds_tools.decorators.probes import MemoryProbe, ProfileProbe
+from extra_ds_tools.decorators.repeats import reset_repeats, snapshot_repeats
+from extra_ds_tools.decorators.sinks import BackgroundWriter, RingBufferSink
+from extra_ds_tools.decorators.spans import (
+    print_call_tree,
+    reset_call_tree,
+    snapshot_call_tree,
+)
+from extra_ds_tools.decorators.stats import (
+    default_registry,
+    print_stats,
+    reset_stats,
+    snapshot_stats,
+)
+from extra_ds_tools.decorators.trace import ChromeTraceWriter
 
 
 def test_print_output(capfd):
@@ -48,3 +80,564 @@ illustrate_decorater() took 1.0 seconds to run.
         SequenceMatcher(a=out.strip(), b=expected_output.strip()).ratio()
         > 0.95
     )
+
+
+def test_no_param_info(capfd):
+    @timeit_arg_info_dec(param_info=False)
+    def add(a, b):
+        return a + b
+
+    assert add(1, 2) == 3
+    out, _ = capfd.readouterr()
+    assert "add() took" in out
+    assert "param" not in out
+    assert "Returned:\n3" in out
+
+
+def test_no_params(capfd):
+    @timeit_arg_info_dec
+    def answer():
+        return 42
+
+    assert answer() == 42
+    out, _ = capfd.readouterr()
+    assert "answer() took" in out
+    # there is neither an argument table nor a rule under it
+    assert "--" not in out
+
+
+def add(a: int, b: int = 1):
+    return a + b
+
+
+def test_overhead_per_mode(capfd, monkeypatch):
+    # micro-benchmark of each mode compared to an undecorated call
+
+    def seconds_per_call(func):
+        n_calls = 200
+        start_time = perf_counter()
+        for _ in range(n_calls):
+            func(1, b=2)
+        return (perf_counter() - start_time) / n_calls
+
+    monkeypatch.setenv(DISABLE_ENV_VAR, "1")
+    disabled = timeit_arg_info_dec(add)
+    monkeypatch.delenv(DISABLE_ENV_VAR)
+    timing_only = timeit_arg_info_dec(add, param_info=False)
+    param_info = timeit_arg_info_dec(add)
+
+    undecorated_time = seconds_per_call(add)
+    timing_only_time = seconds_per_call(timing_only)
+    param_info_time = seconds_per_call(param_info)
+    capfd.readouterr()
+
+    assert disabled is add
+    assert undecorated_time < timing_only_time < param_info_time
+
+
+def test_sampling(capfd):
+    @timeit_arg_info_dec(sample_every=10, print_output=False)
+    def sampled_add(a, b=1):
+        return a + b
+
+    reset_stats()
+    assert [sampled_add(i) for i in range(100)] == list(range(1, 101))
+    out, _ = capfd.readouterr()
+    assert out.count("sampled_add() took") == 10
+
+    name = f"{sampled_add.__module__}.{sampled_add.__qualname__}"
+    summary = snapshot_stats()[name]
+    assert summary["calls"] == 100
+    assert summary["sampled"] == 10
+    assert summary["total_s"] == pytest.approx(summary["mean_s"] * 100)
+
+
+def test_overhead_budget_after_reset_stats(capfd):
+    @timeit_arg_info_dec(overhead_budget=0.01, print_output=False)
+    def cheap_add(a, b=1):
+        return a + b
+
+    name = f"{cheap_add.__module__}.{cheap_add.__qualname__}"
+    for _ in range(2):
+        reset_stats()
+        for i in range(200):
+            cheap_add(i)
+        assert snapshot_stats()[name]["sampled"] > 0
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        dict(param_info=False),
+        dict(param_info=True),
+        dict(param_info=False, sample_every=2),
+    ],
+)
+def test_errors_are_counted(options, capfd):
+    @timeit_arg_info_dec(print_output=False, **options)
+    def invert(x):
+        return 1 / x
+
+    @timeit_arg_info_dec(print_output=False, **options)
+    def invert_all(values):
+        for x in values:
+            yield 1 / x
+
+    reset_stats()
+    for function in (invert, lambda x: list(invert_all([x]))):
+        for x in (1, 0, 2, 0):
+            try:
+                function(x)
+            except ZeroDivisionError:
+                pass
+    for decorated in (invert, invert_all):
+        stats = default_registry.get(
+            f"{decorated.__module__}.{decorated.__qualname__}"
+        )
+        assert stats.calls == 4
+        assert stats.errors == 2
+        assert stats.sampled_calls <= 2
+
+
+def test_coroutine_function(capfd):
+    @timeit_arg_info_dec(round_seconds=1)
+    async def load(n: int):
+        await asyncio.sleep(0.1)
+        return n * 2
+
+    assert inspect.iscoroutinefunction(load)
+    assert asyncio.run(load(3)) == 6
+    out, _ = capfd.readouterr()
+    assert "load() took 0.1 seconds to run." in out
+    assert "Returned:\n6" in out
+
+
+def test_async_generator_function(capfd):
+    @timeit_arg_info_dec(print_output=False)
+    async def stream(n: int):
+        for i in range(n):
+            await asyncio.sleep(0.01)
+            yield i
+
+    async def consume():
+        return [i async for i in stream(3)]
+
+    assert inspect.isasyncgenfunction(stream)
+    assert asyncio.run(consume()) == [0, 1, 2]
+    out, _ = capfd.readouterr()
+    assert "stream() took" in out
+    assert "time to first item:" in out
+    assert "items: 3" in out
+    assert "items per second:" in out
+
+
+def test_generator_function(capfd):
+    @timeit_arg_info_dec
+    def echo(n: int):
+        for i in range(n):
+            sent = yield i
+            if sent is not None:
+                yield sent
+        return "done"
+
+    assert inspect.isgeneratorfunction(echo)
+    generator = echo(3)
+    assert next(generator) == 0
+    assert generator.send("hi") == "hi"
+    assert list(generator) == [1, 2]
+    out, _ = capfd.readouterr()
+    assert "items: 4" in out
+    assert "Returned:\ndone" in out
+
+
+@pytest.mark.parametrize("asynchronous", [False, True])
+def test_generator_with_invalid_arguments(asynchronous, capfd):
+    @timeit_arg_info_dec(profile=True, memory_info=True, print_output=False)
+    def count(n: int):
+        yield from range(n)
+
+    @timeit_arg_info_dec(profile=True, memory_info=True, print_output=False)
+    async def count_async(n: int):
+        for i in range(n):
+            yield i
+
+    async def consume(generator):
+        return [i async for i in generator]
+
+    with pytest.raises(TypeError):
+        if asynchronous:
+            asyncio.run(consume(count_async(1, 2)))
+        else:
+            list(count(1, 2))
+    # the probes of the failed call are stopped
+    assert not ProfileProbe._active
+    assert not MemoryProbe._active
+    assert not tracemalloc.is_tracing()
+
+
+def test_closed_generator_is_reported(capfd):
+    @timeit_arg_info_dec(param_info=False)
+    def count():
+        i = 0
+        while True:
+            yield i
+            i += 1
+
+    generator = count()
+    assert [next(generator) for _ in range(5)] == list(range(5))
+    generator.close()
+    out, _ = capfd.readouterr()
+    assert "items: 5" in out
+
+
+def test_memory_info(capfd):
+    @timeit_arg_info_dec(memory_info=True, print_output=False)
+    def allocate(n: int, arr: np.ndarray):
+        return np.ones(n)
+
+    allocate(100_000, np.zeros(10))
+    out, _ = capfd.readouterr()
+    assert "arg_bytes" in out
+    assert "peak memory:" in out
+    assert "retained memory: 78" in out
+    assert "RSS delta:" in out
+
+
+def test_resource_info(capfd):
+    reset_stats()
+
+    @timeit_arg_info_dec(
+        resource_info=True, param_info=False, print_output=False
+    )
+    def burn(n: int):
+        gc.collect()
+        return sum(range(n))
+
+    burn(100_000)
+    out, _ = capfd.readouterr()
+    lines = out.split("\n")
+    took = next(i for i, line in enumerate(lines) if "took" in line)
+    assert lines[took + 1].startswith("cpu time:")
+    assert "page faults:" in out
+    assert "context switches:" in out
+    assert "gc: 1 collections" in out
+    summary = next(
+        summary
+        for name, summary in snapshot_stats().items()
+        if name.endswith("burn")
+    )
+    assert summary["gc_collections"] == 1
+    assert summary["cpu_s"] > 0
+
+
+def test_resource_info_of_failed_calls(capfd):
+    reset_stats()
+
+    @timeit_arg_info_dec(
+        resource_info=True, param_info=False, print_output=False
+    )
+    def fail():
+        gc.collect()
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        fail()
+    # the measurements of a failed call aren't added
+    summary = snapshot_stats()[f"{fail.__module__}.{fail.__qualname__}"]
+    assert (summary["calls"], summary["sampled"]) == (1, 0)
+    assert "gc_collections" not in summary
+    print_stats()
+
+
+def test_sink(capfd):
+    buffer = RingBufferSink()
+    writer = BackgroundWriter(buffer)
+
+    @timeit_arg_info_dec(sink=writer)
+    def add(a: int, b: int):
+        return a + b
+
+    assert add(1, 2) == 3
+    assert writer.flush(timeout=5)
+    writer.close()
+    out, _ = capfd.readouterr()
+    assert out == ""
+    (record,) = buffer.records()
+    assert record["function"] == "add"
+    assert record["result"] == "3"
+    assert [param["param"] for param in record["params"]] == ["a", "b"]
+
+
+def test_call_tree(capfd):
+    reset_call_tree()
+
+    @timeit_arg_info_dec(call_tree=True, param_info=False, print_output=False)
+    def child():
+        sleep(0.01)
+
+    @timeit_arg_info_dec(call_tree=True, param_info=False, print_output=False)
+    def parent():
+        child()
+        child()
+
+    parent()
+    out, _ = capfd.readouterr()
+    assert "call path: " in out
+    assert ".parent > " in out
+    snapshot = snapshot_call_tree()
+    parent_path = next(path for path in snapshot if path.endswith("parent"))
+    child_path = f"{parent_path} > {parent_path[:-len('parent')]}child"
+    assert snapshot[child_path]["calls"] == 2
+    assert snapshot[child_path]["pct_of_parent"] > 90
+    print_call_tree()
+    out, _ = capfd.readouterr()
+    assert "pct_of_parent" in out
+
+
+def test_trace(tmp_path, capfd):
+    path = tmp_path / "trace.json"
+    writer = ChromeTraceWriter(str(path))
+
+    @timeit_arg_info_dec(trace=writer, print_output=False)
+    def child(n: int):
+        sleep(0.01)
+
+    @timeit_arg_info_dec(trace=writer, param_info=False, print_output=False)
+    def parent():
+        child(1)
+
+    parent()
+    writer.flush()
+    text = path.read_text().rstrip().rstrip(",")
+    events = [event for event in json.loads(text + "]") if event["ph"] == "X"]
+    child_event, parent_event = events
+    assert child_event["name"].endswith("child")
+    assert child_event["args"]["n"]["arg_value"] == "1"
+    # the child is nested in the parent on the same thread
+    assert child_event["tid"] == parent_event["tid"]
+    assert parent_event["ts"] <= child_event["ts"]
+    assert (
+        child_event["ts"] + child_event["dur"]
+        <= parent_event["ts"] + parent_event["dur"]
+    )
+
+
+def test_profile(capfd, tmp_path):
+    def sort_as_text(n: int):
+        return sorted(range(n), key=str)
+
+    @timeit_arg_info_dec(
+        profile_if_slower_than=0.2,
+        profile_top_n=3,
+        profile_dir=str(tmp_path),
+        param_info=False,
+        print_output=False,
+    )
+    def maybe_slow(n: int, wait: float):
+        sleep(wait)
+        return sort_as_text(n)
+
+    maybe_slow(10, 0)
+    out, _ = capfd.readouterr()
+    assert "profile:" not in out
+    maybe_slow(1_000, 0.25)
+    out, _ = capfd.readouterr()
+    assert "profile:" in out
+    assert "(sort_as_text)" in out
+    assert "profile file: " in out
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_stack_sampling(capfd, tmp_path):
+    @timeit_arg_info_dec(
+        stack_sample_interval=0.005,
+        stack_sample_dir=str(tmp_path),
+        param_info=False,
+        print_output=False,
+    )
+    def long_call():
+        end = perf_counter() + 0.1
+        while perf_counter() < end:
+            pass
+
+    long_call()
+    out, _ = capfd.readouterr()
+    assert "stack samples: " in out
+    assert "hottest frames:" in out
+    (path,) = tmp_path.iterdir()
+    assert path.read_text().startswith("long_call (")
+
+
+def test_report_if_slower_than(capfd):
+    reset_stats()
+
+    @timeit_arg_info_dec(report_if_slower_than=0.02, print_output=False)
+    def append_and_wait(items: list, wait: float):
+        items.append(1)
+        sleep(wait)
+
+    items = []
+    for _ in range(5):
+        append_and_wait(items, 0)
+    out, _ = capfd.readouterr()
+    assert out == ""
+    append_and_wait(items, 0.03)
+    out, _ = capfd.readouterr()
+    assert "took" in out
+    # the arguments are captured before the call mutates them
+    assert "[1, 1, 1, 1, 1]" in out
+    (summary,) = [
+        summary
+        for name, summary in snapshot_stats().items()
+        if name.endswith("append_and_wait")
+    ]
+    assert summary["calls"] == 6
+
+
+def test_max_reports_per_second(capfd):
+    @timeit_arg_info_dec(
+        max_reports_per_second=1, param_info=False, print_output=False
+    )
+    def add(a, b):
+        return a + b
+
+    for i in range(5):
+        add(i, i)
+    out, _ = capfd.readouterr()
+    assert out.count("took") == 1
+
+
+def test_size_param(capfd):
+    reset_stats()
+
+    @timeit_arg_info_dec(size_param="items", param_info=False)
+    def total(items: list):
+        return sum(items)
+
+    total(list(range(100)))
+    total(items=list(range(120)))
+    total(list(range(1000)))
+    total(items=iter(range(3)))
+    capfd.readouterr()
+    names = {
+        name.rsplit(".", 1)[1]: summary["calls"]
+        for name, summary in snapshot_stats().items()
+        if "total" in name
+    }
+    assert names == {"total": 4, "total[n<128]": 2, "total[n<1024]": 1}
+
+
+def test_complexity(capfd):
+    reset_complexity()
+
+    @timeit_arg_info_dec(complexity=True, param_info=False, print_output=False)
+    def pairs(values: list):
+        return sum(a * b for a in values for b in values)
+
+    for n in [20, 40, 80, 160, 320]:
+        pairs(list(range(n)))
+    out, _ = capfd.readouterr()
+    assert "input size: 320" in out
+    assert "items per second" in out
+    (estimate,) = [
+        estimate
+        for name, estimate in estimate_complexity().items()
+        if name.endswith("pairs")
+    ]
+    assert estimate["calls"] == 5
+    assert estimate["scaling"] == "O(n^2)"
+    print_complexity()
+    out, _ = capfd.readouterr()
+    assert "O(n^2)" in out
+
+
+@timeit_arg_info_dec(print_output=False, sample_every=2)
+def _picklable_add(a, b):
+    return a + b
+
+
+def _add(a, b):
+    return a + b
+
+
+def test_pickle(capsys):
+    assert pickle.loads(pickle.dumps(_picklable_add)) is _picklable_add
+    timed_add = timeit_arg_info_dec(param_info=False, round_seconds=3)(_add)
+    unpickled = pickle.loads(pickle.dumps(timed_add))
+    assert unpickled is not timed_add
+    assert unpickled(1, 2) == 3
+    assert "_add() took" in capsys.readouterr().out
+
+
+def test_method():
+    class Counter:
+        def __init__(self):
+            self.count = 0
+
+        @timeit_arg_info_dec(print_output=False, param_info=False)
+        def add(self, n):
+            self.count += n
+            return self.count
+
+    counter = Counter()
+    assert counter.add(2) == 2
+    assert Counter.add(counter, 3) == 5
+
+
+def test_detect_repeats(capsys):
+    reset_repeats()
+
+    @timeit_arg_info_dec(
+        detect_repeats=True, param_info=False, print_output=False
+    )
+    def repeated(df, n=1):
+        return len(df) * n
+
+    df = pd.DataFrame({"a": range(5)})
+    repeated(df)
+    repeated(df.copy())
+    repeated(df, 2)
+    out = capsys.readouterr().out
+    assert out.count("calls with these inputs: 2") == 1
+    (summary,) = snapshot_repeats()
+    assert summary["function"].endswith("repeated")
+    assert summary["calls"] == 3
+    assert summary["repeated_calls"] == 1
+    assert summary["repeated_s"] > 0
+    reset_repeats()
+    with pytest.raises(ValueError):
+        timeit_arg_info_dec(detect_repeats="yes")(repeated)
+
+
+def test_capture_if_slower_than(tmp_path, capsys):
+    @timeit_arg_info_dec(
+        capture_if_slower_than=0.01,
+        capture_dir=str(tmp_path),
+        param_info=False,
+        print_output=False,
+    )
+    def maybe_slow(values, seconds):
+        sleep(seconds)
+        return values.sum()
+
+    maybe_slow(np.ones(3), 0)
+    assert list(tmp_path.iterdir()) == []
+    maybe_slow(np.ones(3), 0.02)
+    (capture,) = tmp_path.iterdir()
+    assert f"captured to: {capture}" in capsys.readouterr().out
+    assert (capture / "arg_0.npy").exists()
+
+
+def test_capture_before_mutation(tmp_path):
+    @timeit_arg_info_dec(
+        capture_if_slower_than=0,
+        capture_dir=str(tmp_path),
+        print_output=False,
+    )
+    def fill(values):
+        values[:] = 0
+
+    fill(np.ones(3))
+    (capture,) = tmp_path.iterdir()
+    np.testing.assert_array_equal(np.load(capture / "arg_0.npy"), np.ones(3))
+    assert "[1. 1. 1.]" in (capture / "arguments.txt").read_text()
@@ -0,0 +1,67 @@
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+from extra_ds_tools.decorators.func_decorators import timeit_arg_info_dec
+from extra_ds_tools.decorators.metrics import (
+    CONTENT_TYPE,
+    MetricsServer,
+    start_metrics_server,
+)
+from extra_ds_tools.decorators.stats import StatsRegistry, reset_stats
+
+
+def test_serves_metrics():
+    registry = StatsRegistry()
+    registry.get("module.func").record(1_000)
+    server = MetricsServer(port=0, registry=registry).start()
+    try:
+        assert server.port != 0
+        with urllib.request.urlopen(server.url, timeout=5) as response:
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            text = response.read().decode()
+        assert 'extra_ds_tools_calls_total{function="module.func"} 1' in text
+
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(
+                server.url.replace("/metrics", "/other"), timeout=5
+            )
+        assert error.value.code == 404
+    finally:
+        server.close()
+    with pytest.raises(urllib.error.URLError):
+        urllib.request.urlopen(server.url, timeout=5)
+
+
+def test_scraping_doesnt_block_calls():
+    @timeit_arg_info_dec(print_output=False, param_info=False)
+    def add(a, b):
+        return a + b
+
+    reset_stats()
+    server = start_metrics_server(port=0)
+    stop = threading.Event()
+
+    def scrape():
+        while not stop.is_set():
+            with urllib.request.urlopen(server.url, timeout=5) as response:
+                response.read()
+
+    scraper = threading.Thread(target=scrape)
+    scraper.start()
+    try:
+        for i in range(2_000):
+            add(i, i)
+    finally:
+        stop.set()
+        scraper.join()
+    with urllib.request.urlopen(server.url, timeout=5) as response:
+        text = response.read().decode()
+    server.close()
+    name = f"{add.__module__}.{add.__qualname__}"
+    assert f'extra_ds_tools_calls_total{{function="{name}"}} 2000' in text
+    assert (
+        f'extra_ds_tools_call_duration_seconds_count{{function="{name}"}} 2000'
+        in text
+    )
@@ -0,0 +1,62 @@
+import re
+
+from extra_ds_tools.decorators.metrics import render_prometheus
+from extra_ds_tools.decorators.stats import StatsRegistry
+
+
+def test_render_prometheus():
+    registry = StatsRegistry()
+    stats = registry.get("module.func")
+    for duration_ns in (1_000, 2_000_000, 3_000_000_000):
+        stats.record(duration_ns)
+    stats.record_unsampled()
+    stats.record_error()
+    registry.get("module.unused")
+    text = render_prometheus(registry, buckets=[1.0, 0.001])
+    assert text.endswith("\n")
+    assert "module.unused" not in text
+    lines = text.splitlines()
+    assert 'extra_ds_tools_calls_total{function="module.func"} 4' in lines
+    assert 'extra_ds_tools_errors_total{function="module.func"} 1' in lines
+    buckets = [line for line in lines if "_bucket{" in line]
+    assert buckets == [
+        'extra_ds_tools_call_duration_seconds_bucket{function="module.func",le="0.001"} 1',  # noqa
+        'extra_ds_tools_call_duration_seconds_bucket{function="module.func",le="1.0"} 2',  # noqa
+        'extra_ds_tools_call_duration_seconds_bucket{function="module.func",le="+Inf"} 3',  # noqa
+    ]
+    assert (
+        'extra_ds_tools_call_duration_seconds_sum{function="module.func"} '
+        "3.002001" in lines
+    )
+    assert (
+        'extra_ds_tools_call_duration_seconds_count{function="module.func"} 3'
+        in lines
+    )
+    for metric in ("calls_total", "errors_total", "call_duration_seconds"):
+        assert f"# TYPE extra_ds_tools_{metric} " in text
+
+
+def test_durations_near_a_bound():
+    registry = StatsRegistry()
+    # in the last histogram bucket below 1 ms
+    registry.get("module.func").record(995_000)
+    # in the bucket that contains 1 ms, so counted above it
+    registry.get("module.func").record(1_000_000)
+    registry.get("module.func").record(1_020_000)
+    text = render_prometheus(registry, buckets=[0.001])
+    assert 'le="0.001"} 1' in text
+    assert 'le="+Inf"} 3' in text
+
+
+def test_label_values_are_escaped():
+    registry = StatsRegistry()
+    registry.get('module.func[x="a\\b"]').record(1_000)
+    text = render_prometheus(registry)
+    assert re.search(
+        r'calls_total\{function="module\.func\[x=\\"a\\\\b\\"\]"\} 1', text
+    )
+
+
+def test_empty_registry():
+    text = render_prometheus(StatsRegistry())
+    assert [line for line in text.splitlines() if line[0] != "#"] == []
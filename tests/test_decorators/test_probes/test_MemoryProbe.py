@@ -0,0 +1,45 @@
+import tracemalloc
+
+import numpy as np
+from extra_ds_tools.decorators.probes import MemoryProbe
+
+
+def test_peak_and_retained():
+    probe = MemoryProbe()
+    token = probe.start()
+    temporary = np.ones(1_000_000)
+    del temporary
+    kept = np.ones(100_000)
+    details = probe.stop(token)
+    assert details["peak memory"].endswith("MiB")
+    assert float(details["peak memory"].split()[0]) >= 7.6
+    assert details["retained memory"].endswith("KiB")
+    assert 781 <= float(details["retained memory"].split()[0]) < 800
+    assert "RSS delta" in details
+    assert not tracemalloc.is_tracing()
+    del kept
+
+
+def test_nested_calls_keep_outer_peak():
+    probe = MemoryProbe()
+    outer_token = probe.start()
+    inner_token = probe.start()
+    temporary = np.ones(1_000_000)
+    del temporary
+    probe.stop(inner_token)
+    assert tracemalloc.is_tracing()
+    after_inner = probe.start()
+    probe.stop(after_inner)
+    details = probe.stop(outer_token)
+    assert float(details["peak memory"].split()[0]) >= 7.6
+    assert not tracemalloc.is_tracing()
+
+
+def test_keeps_tracing_started_by_user():
+    tracemalloc.start()
+    try:
+        probe = MemoryProbe()
+        probe.stop(probe.start())
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,73 @@
+import os
+import pstats
+from time import sleep
+
+import pytest
+from extra_ds_tools.decorators.func_decorators import timeit_arg_info_dec
+from extra_ds_tools.decorators.probes import ProfileProbe
+
+
+def sort_as_text(n):
+    return sorted(range(n), key=str)
+
+
+def test_top_functions():
+    probe = ProfileProbe("module.sort_as_text", top_n=2)
+    token = probe.start()
+    sort_as_text(10_000)
+    profile = probe.stop(token)["profile"]
+    lines = profile.strip().split("\n")
+    assert lines[0].split() == ["function", "ncalls", "tottime", "cumtime"]
+    assert len(lines) == 4
+    assert "(sort_as_text)" in lines[2]
+    assert "builtins.sorted" in lines[3]
+
+
+def test_only_slow_calls():
+    probe = ProfileProbe("module.func", min_seconds=0.05)
+    token = probe.start()
+    sort_as_text(10)
+    assert probe.stop(token) == {}
+    token = probe.start()
+    sleep(0.06)
+    assert "profile" in probe.stop(token)
+
+
+def test_nested_calls_are_not_profiled():
+    outer, inner = ProfileProbe("outer"), ProfileProbe("inner")
+    outer_token = outer.start()
+    inner_token = inner.start()
+    assert inner_token is None
+    assert inner.stop(inner_token) == {}
+    assert "profile" in outer.stop(outer_token)
+    # profiling is possible again after the outer call
+    assert "profile" in inner.stop(inner.start())
+
+
+def test_dump(tmp_path):
+    probe = ProfileProbe("module.sort_as_text", dump_dir=str(tmp_path))
+    token = probe.start()
+    sort_as_text(1_000)
+    path = probe.stop(token)["profile file"]
+    assert os.path.dirname(path) == str(tmp_path)
+    assert path.endswith(".pstats")
+    assert pstats.Stats(path).total_calls > 0
+
+
+def test_invalid_top_n():
+    with pytest.raises(ValueError):
+        ProfileProbe("module.func", top_n=0)
+
+
+def test_failed_call_is_not_dumped(tmp_path):
+    @timeit_arg_info_dec(profile=True, profile_dir=str(tmp_path))
+    def fail():
+        sort_as_text(1_000)
+        raise KeyError("missing")
+
+    with pytest.raises(KeyError):
+        fail()
+    assert list(tmp_path.iterdir()) == []
+    # the profiler is stopped, so the next call is profiled
+    probe = ProfileProbe("module.sort_as_text")
+    assert "profile" in probe.stop(probe.start())
@@ -0,0 +1,41 @@
+import gc
+
+from extra_ds_tools.decorators.probes import ResourceProbe
+from extra_ds_tools.decorators.stats import FunctionStats
+
+
+def test_cpu_time():
+    probe = ResourceProbe()
+    token = probe.start()
+    sum(range(2_000_000))
+    details = probe.stop(token)
+    process_seconds = float(details["cpu time"].split()[0])
+    assert process_seconds > 0
+    assert "(thread)" in details["cpu time"]
+    assert details["page faults"].endswith("major")
+    assert details["context switches"].endswith("involuntary")
+
+
+def test_gc_collections():
+    probe = ResourceProbe()
+    token = probe.start()
+    gc.collect()
+    gc.collect()
+    details = probe.stop(token)
+    assert details["gc"].startswith("2 collections")
+
+
+def test_adds_counters_to_stats():
+    stats = FunctionStats("module.func")
+    probe = ResourceProbe(stats)
+    for _ in range(2):
+        token = probe.start()
+        gc.collect()
+        probe.stop(token)
+        stats.record(1_000)
+    summary = stats.summary()
+    assert summary["gc_collections"] == 2
+    assert summary["cpu_s"] > 0
+    assert summary["gc_pause_s"] > 0
+    assert "minor_faults" in summary
+    assert "involuntary_switches" in summary
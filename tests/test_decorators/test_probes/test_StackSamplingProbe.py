@@ -0,0 +1,74 @@
+import threading
+from time import perf_counter, sleep
+
+import pytest
+from extra_ds_tools.decorators.func_decorators import timeit_arg_info_dec
+from extra_ds_tools.decorators.probes import (
+    StackSamplingProbe,
+    collapsed_stacks,
+)
+
+
+def busy(seconds):
+    end = perf_counter() + seconds
+    while perf_counter() < end:
+        pass
+
+
+def run(seconds):
+    busy(seconds)
+
+
+def test_samples_stacks(tmp_path):
+    probe = StackSamplingProbe(
+        "module.run", run.__code__, interval=0.005, output_dir=str(tmp_path)
+    )
+    token = probe.start()
+    run(0.2)
+    details = probe.stop(token)
+    assert details["stack samples"] >= 5
+    hottest = details["hottest frames"].strip().split("\n")[2]
+    assert hottest.split()[1] == "busy"
+    with open(details["collapsed stacks"]) as file:
+        lines = file.read().splitlines()
+    # the stacks start at the decorated function
+    assert all(line.startswith("run (") for line in lines)
+    assert any(";busy (" in line for line in lines)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == (
+        details["stack samples"]
+    )
+
+
+def test_short_call_has_no_samples():
+    probe = StackSamplingProbe("module.func", interval=10)
+    token = probe.start()
+    sleep(0.01)
+    assert probe.stop(token) == {"stack samples": 0}
+
+
+def test_invalid_interval():
+    with pytest.raises(ValueError):
+        StackSamplingProbe("module.func", interval=0)
+
+
+def test_collapsed_stacks():
+    assert (
+        collapsed_stacks({"main;load": 3, "main;load;parse": 7})
+        == "main;load;parse 7\nmain;load 3\n"
+    )
+
+
+def test_failed_call_is_not_written(tmp_path):
+    @timeit_arg_info_dec(
+        stack_sample_interval=0.001, stack_sample_dir=str(tmp_path)
+    )
+    def fail():
+        busy(0.01)
+        raise KeyError("missing")
+
+    threads = threading.active_count()
+    with pytest.raises(KeyError):
+        fail()
+    assert list(tmp_path.iterdir()) == []
+    # the sampler thread is stopped
+    assert threading.active_count() == threads
@@ -0,0 +1,17 @@
+import pytest
+from extra_ds_tools.decorators.probes import format_bytes
+
+
+@pytest.mark.parametrize(
+    "n_bytes, expected",
+    [
+        (0, "0 B"),
+        (-200, "-200 B"),
+        (1536, "1.5 KiB"),
+        (3 * 1024**2, "3.0 MiB"),
+        (-(1024**3), "-1.0 GiB"),
+        (2 * 1024**4, "2.0 TiB"),
+    ],
+)
+def test_units(n_bytes, expected):
+    assert format_bytes(n_bytes) == expected
@@ -0,0 +1,56 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from extra_ds_tools.decorators.func_decorators import timeit_arg_info_dec
+from extra_ds_tools.decorators.processes import collect_stats, share_stats
+from extra_ds_tools.decorators.sinks import RingBufferSink
+from extra_ds_tools.decorators.stats import reset_stats
+
+
+@timeit_arg_info_dec(
+    print_output=False, param_info=False, sink=RingBufferSink()
+)
+def square(x):
+    return x * x
+
+
+def cube(x):
+    return x**3
+
+
+timed_cube = timeit_arg_info_dec(param_info=False, sink=RingBufferSink())(cube)
+
+
+@pytest.fixture
+def stats_dir(tmp_path):
+    reset_stats()
+    share_stats(str(tmp_path))
+    yield str(tmp_path)
+    share_stats(None)
+    reset_stats()
+
+
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+def test_collects_stats_of_workers(stats_dir, start_method):
+    context = multiprocessing.get_context(start_method)
+    with ProcessPoolExecutor(2, mp_context=context) as executor:
+        assert list(executor.map(square, range(20))) == [
+            x * x for x in range(20)
+        ]
+        assert list(executor.map(timed_cube, range(10))) == [
+            x**3 for x in range(10)
+        ]
+    stats = collect_stats()
+    square_name = f"{square.__module__}.{square.__qualname__}"
+    cube_name = f"{cube.__module__}.{cube.__qualname__}"
+    assert stats[square_name]["calls"] == 20
+    assert stats[cube_name]["calls"] == 10
+    # the files are collected once
+    assert collect_stats(stats_dir)[square_name]["calls"] == 20
+
+
+def test_collect_without_directory():
+    share_stats(None)
+    with pytest.raises(ValueError):
+        collect_stats()
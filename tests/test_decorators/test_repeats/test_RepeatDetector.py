@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+from extra_ds_tools.decorators.repeats import RepeatDetector, RepeatRegistry
+from extra_ds_tools.format import ArgBinder
+
+
+def total(values, scale=1):
+    return sum(values) * scale
+
+
+def add_call(detector, duration_ns, *args, **kwargs):
+    records = ArgBinder(total)(*args, **kwargs)
+    return detector.add(
+        detector.fingerprint(records, args, kwargs), duration_ns
+    )
+
+
+def test_counts_repeated_inputs():
+    detector = RepeatDetector("module.total")
+    assert add_call(detector, 1_000, [1, 2]) == 1
+    assert add_call(detector, 2_000, [1, 2]) == 2
+    assert add_call(detector, 3_000, [1, 2], scale=2) == 1
+    assert add_call(detector, 4_000, [1, 2]) == 3
+    assert detector.summary() == {
+        "function": "module.total",
+        "calls": 4,
+        "distinct_inputs": 2,
+        "repeated_calls": 2,
+        "repeated_s": pytest.approx(6e-06),
+        "max_calls_per_input": 3,
+    }
+    detector.reset()
+    assert detector.summary()["calls"] == 0
+
+
+def test_content():
+    first, second = [0] * 1_000, [0] * 1_000
+    second[500] = 1
+    # the summaries of the lists are the same
+    summaries = RepeatDetector("module.total")
+    add_call(summaries, 1_000, first)
+    assert add_call(summaries, 1_000, second) == 2
+    contents = RepeatDetector("module.total", content=True)
+    add_call(contents, 1_000, first)
+    assert add_call(contents, 1_000, second) == 1
+    assert add_call(contents, 1_000, first.copy()) == 2
+    # inputs that can't be hashed are compared by their summaries
+    assert add_call(contents, 1_000, [lambda: 1]) == 1
+    assert add_call(contents, 1_000, [lambda: 1]) == 2
+
+
+def test_array_likes_by_content():
+    first = pd.DataFrame({"a": np.zeros(1_000)})
+    second = first.copy()
+    second.loc[500, "a"] = 1
+    detector = RepeatDetector("module.total")
+    add_call(detector, 1_000, first)
+    # the frames have the same summary, but not the same content
+    assert add_call(detector, 1_000, second) == 1
+    assert add_call(detector, 1_000, first.copy()) == 2
+    assert add_call(detector, 1_000, np.zeros(1_000)) == 1
+    assert add_call(detector, 1_000, np.ones(1_000)) == 1
+    assert add_call(detector, 1_000, values=np.ones(1_000)) == 1
+    assert add_call(detector, 1_000, values=np.ones(1_000)) == 2
+
+
+def test_registry_ranks_by_repeated_time():
+    registry = RepeatRegistry()
+    for name, duration_ns in [("fast", 1_000), ("slow", 1_000_000)]:
+        for _ in range(3):
+            add_call(registry.get(name), duration_ns, [1])
+    add_call(registry.get("unique"), 1_000, [1])
+    assert [summary["function"] for summary in registry.snapshot()] == [
+        "slow",
+        "fast",
+    ]
+    assert "slow" in registry.render()
+    registry.reset()
+    assert registry.snapshot() == []
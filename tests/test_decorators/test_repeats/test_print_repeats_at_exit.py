@@ -0,0 +1,33 @@
+import subprocess
+import sys
+
+import pytest
+
+CODE = """
+from extra_ds_tools.decorators.func_decorators import timeit_arg_info_dec
+from extra_ds_tools.decorators.repeats import print_repeats_at_exit
+
+
+@timeit_arg_info_dec(detect_repeats=True, param_info=False, print_output=False)
+def load(path):
+    return path
+
+
+{}
+for _ in range(3):
+    load("features.csv")
+"""
+
+
+@pytest.mark.parametrize("opt_in", [False, True])
+def test_printed_only_when_asked(opt_in):
+    call = "print_repeats_at_exit()\nprint_repeats_at_exit()" if opt_in else ""
+    output = subprocess.run(
+        [sys.executable, "-c", CODE.format(call)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    header = "Functions called repeatedly with the same inputs:"
+    assert output.count(header) == int(opt_in)
+    assert ("__main__.load" in output) is opt_in
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+from extra_ds_tools.decorators.report import render_table
+from extra_ds_tools.format import args_and_kwargs_repr
+from tabulate import tabulate
+
+
+def func(number: int, text: str, lst, either: bool = True, x=0.5, **kwargs):
+    return
+
+
+@pytest.mark.parametrize(
+    "args, kwargs",
+    [
+        ((42, "Bob", list(range(100))), {"either": False, "Even": "works"}),
+        ((1, 2, 3, 4), {}),
+        ((np.ones((3, 3)), "12", [1], 1.5, 1e-7), {}),
+        ((pd.DataFrame([1]), "", None), {"x": np.ones((3, 3))}),
+    ],
+)
+def test_same_layout_as_tabulate(args, kwargs):
+    records = args_and_kwargs_repr(func, *args, **kwargs)
+    expected = tabulate(pd.DataFrame(records).fillna(""), headers="keys")
+    assert render_table(records) == expected
+
+
+@pytest.mark.parametrize(
+    "records",
+    [
+        [{"arg_value": 1.5}, {"arg_value": 100}, {"arg_value": 0.25}],
+        [{"arg_value": "1.5", "x": 1e-7}, {"arg_value": "100", "x": 3}],
+        [{"arg_value": -1.5}, {"arg_value": "12"}],
+    ],
+)
+def test_decimal_points_line_up(records):
+    expected = tabulate(pd.DataFrame(records).fillna(""), headers="keys")
+    assert render_table(records) == expected
+
+
+def test_missing_values_are_empty():
+    table = render_table([{"param": "text", "arg_len": 5}, {"param": "n"}])
+    assert table.split("\n")[-1] == " 1  n"
+
+
+def test_no_records():
+    assert render_table([]) == ""
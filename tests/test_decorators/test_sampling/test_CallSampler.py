@@ -0,0 +1,66 @@
+import pytest
+from extra_ds_tools.decorators.sampling import CallSampler
+from extra_ds_tools.decorators.stats import FunctionStats
+
+
+def test_sample_every():
+    sampler = CallSampler(FunctionStats("module.func"), sample_every=3)
+    assert [sampler.sample() for _ in range(7)] == [
+        True,
+        False,
+        False,
+        True,
+        False,
+        False,
+        True,
+    ]
+
+
+def test_sample_rate():
+    sampler = CallSampler(FunctionStats("module.func"), sample_rate=0.25)
+    n_sampled = sum(sampler.sample() for _ in range(10_000))
+    assert 2000 < n_sampled < 3000
+
+
+def test_overhead_budget():
+    stats = FunctionStats("module.func")
+    sampler = CallSampler(stats, overhead_budget=0.1)
+    assert sampler.sample()
+    stats.record(1_000)
+    sampler.add_overhead(100)
+    assert sampler.sample()
+    sampler.add_overhead(1)
+    assert not sampler.sample()
+    # the estimated wall time grows with the unsampled calls
+    stats.record_unsampled()
+    assert sampler.sample()
+
+
+def test_overhead_budget_after_reset():
+    stats = FunctionStats("module.func")
+    sampler = CallSampler(stats, overhead_budget=0.1)
+    stats.record(1_000)
+    sampler.add_overhead(1_000)
+    assert not sampler.sample()
+    stats.reset()
+    # the overhead is reset with the statistics
+    assert sampler.sample()
+    # and calls are sampled until a call is timed
+    sampler.add_overhead(1_000)
+    stats.record_unsampled()
+    assert sampler.sample()
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"sample_every": 0},
+        {"sample_rate": 0},
+        {"sample_rate": 1.5},
+        {"overhead_budget": 0},
+        {"sample_every": 2, "sample_rate": 0.5},
+    ],
+)
+def test_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        CallSampler(FunctionStats("module.func"), **kwargs)
@@ -0,0 +1,105 @@
+import pickle
+import threading
+
+import pytest
+from extra_ds_tools.decorators.report import CallReport
+from extra_ds_tools.decorators.sinks import BackgroundWriter, RingBufferSink
+
+
+def make_report(i):
+    return CallReport("func", None, 0.1, i)
+
+
+class BlockingSink:
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.results = []
+
+    def emit(self, report):
+        self.started.set()
+        self.release.wait()
+        self.results.append(report.result)
+
+
+def test_writes_to_all_sinks():
+    first, second = RingBufferSink(), RingBufferSink()
+    writer = BackgroundWriter([first, second])
+    for i in range(5):
+        writer.emit(make_report(i))
+    assert writer.flush(timeout=5)
+    assert [record["result"] for record in first.records()] == list("01234")
+    assert first.records() == second.records()
+    writer.close()
+
+
+@pytest.mark.parametrize(
+    "drop_policy, expected",
+    [("drop_newest", [0, 1, 2]), ("drop_oldest", [0, 3, 4])],
+)
+def test_drop_policy(drop_policy, expected):
+    sink = BlockingSink()
+    writer = BackgroundWriter(sink, maxsize=2, drop_policy=drop_policy)
+    writer.emit(make_report(0))
+    # the writer thread is blocked on the first report, so the queue fills
+    assert sink.started.wait(5)
+    for i in range(1, 5):
+        writer.emit(make_report(i))
+    assert writer.dropped == 2
+    sink.release.set()
+    assert writer.flush(timeout=5)
+    assert sink.results == expected
+    writer.close()
+
+
+def test_flush_timeout():
+    sink = BlockingSink()
+    writer = BackgroundWriter(sink)
+    writer.emit(make_report(0))
+    assert sink.started.wait(5)
+    threads = threading.active_count()
+    for _ in range(3):
+        assert not writer.flush(timeout=0.01)
+    # timed out flushes leave no waiting threads behind
+    assert threading.active_count() == threads
+    sink.release.set()
+    assert writer.flush(timeout=5)
+    writer.close()
+
+
+def test_failing_sink_does_not_stop_writer(caplog):
+    def fail(report):
+        raise RuntimeError("broken")
+
+    class FailingSink:
+        emit = staticmethod(fail)
+
+    buffer = RingBufferSink()
+    writer = BackgroundWriter([FailingSink(), buffer])
+    writer.emit(make_report(1))
+    writer.emit(make_report(2))
+    assert writer.flush(timeout=5)
+    assert len(buffer.records()) == 2
+    assert "failed to write a report" in caplog.text
+    writer.close()
+
+
+def test_invalid_options():
+    with pytest.raises(ValueError):
+        BackgroundWriter(RingBufferSink(), maxsize=0)
+    with pytest.raises(ValueError):
+        BackgroundWriter(RingBufferSink(), drop_policy="drop_all")
+
+
+def test_pickle():
+    writer = BackgroundWriter(RingBufferSink(), maxsize=5, drop_policy="block")
+    writer.emit(make_report(0))
+    unpickled = pickle.loads(pickle.dumps(writer))
+    assert unpickled.drop_policy == "block"
+    unpickled.emit(make_report(1))
+    assert unpickled.flush(timeout=5)
+    assert [record["result"] for record in unpickled.sinks[0].records()] == [
+        "1"
+    ]
+    writer.close()
+    unpickled.close()
@@ -0,0 +1,69 @@
+import json
+import logging
+
+from extra_ds_tools.decorators.report import CallReport
+from extra_ds_tools.decorators.sinks import (
+    CallbackSink,
+    JsonlSink,
+    LoggingSink,
+    PrintSink,
+    RingBufferSink,
+)
+from extra_ds_tools.format import args_and_kwargs_repr
+
+
+def multiply_text(text: str, n: int = 1):
+    return text * n
+
+
+def make_report():
+    records = args_and_kwargs_repr(multiply_text, "hello", n=2)
+    return CallReport("multiply_text", records, 1.0, "hellohello")
+
+
+def test_print_sink(capfd):
+    report = make_report()
+    PrintSink().emit(report)
+    out, _ = capfd.readouterr()
+    assert out == report.render() + "\n"
+
+
+def test_logging_sink(caplog):
+    logger = logging.getLogger("test_sinks")
+    with caplog.at_level(logging.INFO, logger="test_sinks"):
+        LoggingSink(logger).emit(make_report())
+    (record,) = caplog.records
+    assert "multiply_text() took 1.0 seconds to run." in record.getMessage()
+    assert record.call_report["result"] == "hellohello"
+
+
+def test_jsonl_sink(tmp_path):
+    path = tmp_path / "calls.jsonl"
+    sink = JsonlSink(str(path))
+    sink.emit(make_report())
+    sink.emit(make_report())
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    record = json.loads(lines[0])
+    assert record["function"] == "multiply_text"
+    assert record["exec_time"] == 1.0
+    assert record["params"][0]["arg_value"] == "hello"
+    assert record["params"][1]["default_value"] == 1
+    assert record["result"] == "hellohello"
+
+
+def test_ring_buffer_sink():
+    sink = RingBufferSink(maxlen=2)
+    for _ in range(3):
+        sink.emit(make_report())
+    assert len(sink.records()) == 2
+    sink.clear()
+    assert sink.records() == []
+
+
+def test_callback_sink():
+    reports = []
+    sink = CallbackSink(reports.append)
+    report = make_report()
+    sink.emit(report)
+    assert reports == [report]
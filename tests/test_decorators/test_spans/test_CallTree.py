@@ -0,0 +1,32 @@
+from extra_ds_tools.decorators.spans import CallTree
+
+
+def test_snapshot():
+    tree = CallTree()
+    tree.record(("outer",), 3_000, 1_000)
+    tree.record(("outer", "inner"), 2_000, 2_000)
+    tree.record(("outer",), 3_000, 1_000)
+    snapshot = tree.snapshot()
+    assert snapshot["outer"]["calls"] == 2
+    assert snapshot["outer"]["inclusive_s"] == 6e-6
+    assert snapshot["outer"]["exclusive_s"] == 2e-6
+    assert snapshot["outer > inner"]["depth"] == 1
+    assert snapshot["outer > inner"]["pct_of_parent"] == 100 * 2 / 6
+
+
+def test_render_orders_children_by_inclusive_time():
+    tree = CallTree()
+    tree.record(("root",), 10_000, 1_000)
+    tree.record(("root", "fast"), 1_000, 1_000)
+    tree.record(("root", "slow"), 8_000, 7_000)
+    tree.record(("root", "slow", "leaf"), 1_000, 1_000)
+    names = [line.split()[1] for line in tree.render().split("\n")[2:]]
+    assert names == ["root", "slow", "leaf", "fast"]
+    assert "    leaf" in tree.render()
+
+
+def test_reset():
+    tree = CallTree()
+    tree.record(("outer",), 3_000, 1_000)
+    tree.reset()
+    assert tree.snapshot() == {}
@@ -0,0 +1,57 @@
+import asyncio
+from time import sleep
+
+import pytest
+from extra_ds_tools.decorators.spans import CallTree, SpanProbe
+
+
+def test_nested_spans():
+    tree = CallTree()
+    outer, inner = SpanProbe("outer", tree), SpanProbe("inner", tree)
+    outer_state = outer.start()
+    sleep(0.01)
+    assert inner.stop(inner.start()) == {"call path": "outer > inner"}
+    inner_state = inner.start()
+    sleep(0.02)
+    inner.stop(inner_state)
+    assert outer.stop(outer_state) == {"call path": "outer"}
+    snapshot = tree.snapshot()
+    assert snapshot["outer > inner"]["calls"] == 2
+    outer_node = snapshot["outer"]
+    assert outer_node["exclusive_s"] >= 0.01
+    assert outer_node["inclusive_s"] == pytest.approx(
+        outer_node["exclusive_s"] + snapshot["outer > inner"]["inclusive_s"]
+    )
+
+
+def test_spans_of_concurrent_tasks():
+    tree = CallTree()
+    parent, child = SpanProbe("parent", tree), SpanProbe("child", tree)
+
+    async def run_child():
+        state = child.start()
+        await asyncio.sleep(0.01)
+        child.stop(state)
+
+    async def run_parent():
+        state = parent.start()
+        await asyncio.gather(run_child(), run_child())
+        parent.stop(state)
+
+    asyncio.run(run_parent())
+    snapshot = tree.snapshot()
+    assert set(snapshot) == {"parent", "parent > child"}
+    assert snapshot["parent > child"]["calls"] == 2
+    # the children ran concurrently, so they took longer than their parent
+    assert snapshot["parent"]["exclusive_s"] == 0
+
+
+def test_not_nesting():
+    tree = CallTree()
+    generator, other = SpanProbe("gen", tree, nests=False), SpanProbe(
+        "other", tree
+    )
+    state = generator.start()
+    other.stop(other.start())
+    generator.stop(state)
+    assert set(tree.snapshot()) == {"gen", "other"}
@@ -0,0 +1,76 @@
+import statistics
+
+import pytest
+from extra_ds_tools.decorators.stats import FunctionStats
+
+
+def test_std():
+    durations = [1_000, 2_000, 4_000, 8_000]
+    stats = FunctionStats("module.func")
+    for duration in durations:
+        stats.record(duration)
+    assert stats.std_ns() == pytest.approx(statistics.stdev(durations))
+    assert FunctionStats("module.func").std_ns() == 0.0
+
+
+def test_to_dict_round_trip():
+    stats = FunctionStats("module.func")
+    for duration in range(1_000, 100_000, 1_000):
+        stats.record(duration)
+    stats.record_unsampled()
+    stats.add_counters({"cpu_s": 0.5})
+    stats.record_error()
+    restored = FunctionStats.from_dict(stats.to_dict())
+    assert restored.summary() == stats.summary()
+    assert restored.errors == 1
+    assert restored.std_ns() == stats.std_ns()
+    assert restored.percentile_ns(99) == stats.percentile_ns(99)
+
+
+def test_merge():
+    first, second = FunctionStats("module.func"), FunctionStats("module.func")
+    combined = FunctionStats("module.func")
+    for duration in range(1_000, 50_000, 1_000):
+        first.record(duration)
+        combined.record(duration)
+    for duration in range(50_000, 100_000, 1_000):
+        second.record(duration)
+        combined.record(duration)
+    first.add_counters({"cpu_s": 0.5})
+    second.add_counters({"cpu_s": 0.25})
+    combined.add_counters({"cpu_s": 0.75})
+    second.record_unsampled()
+    combined.record_unsampled()
+    second.record_error()
+    first.add_overhead(300)
+    second.add_overhead(200)
+    first.merge(second)
+    assert first.summary() == combined.summary()
+    assert first.errors == 1
+    assert first.overhead_ns == 500
+    assert FunctionStats.from_dict(first.to_dict()).overhead_ns == 500
+    assert first.std_ns() == pytest.approx(combined.std_ns())
+
+
+def test_peek():
+    stats = FunctionStats("module.func")
+    stats.record(1_000)
+    stats.record(1_000)
+    stats.record_unsampled()
+    stats.record_error()
+    peek = stats.peek()
+    assert peek["calls"] == 3
+    assert peek["sampled_calls"] == 2
+    assert peek["errors"] == 1
+    assert peek["total_ns"] == 2_000
+    assert sum(peek["histogram"].values()) == 2
+    # a copy that isn't changed by later calls
+    stats.record(1_000)
+    assert sum(peek["histogram"].values()) == 2
+
+
+def test_summary_of_counters_without_timed_calls():
+    stats = FunctionStats("module.func")
+    stats.record_unsampled()
+    stats.add_counters({"cpu_s": 0.5})
+    assert stats.summary()["cpu_s"] == 0.5
@@ -0,0 +1,47 @@
+import hypothesis.strategies as st
+import numpy as np
+import pytest
+from extra_ds_tools.decorators.stats import LatencyHistogram
+from hypothesis import given
+
+
+@given(
+    durations=st.lists(
+        st.integers(min_value=0, max_value=10**12), min_size=1, max_size=200
+    ),
+    percentile=st.floats(min_value=1, max_value=100),
+)
+def test_relative_error(durations, percentile):
+    histogram = LatencyHistogram()
+    for duration in durations:
+        histogram.record(duration)
+    expected = np.percentile(durations, percentile, method="inverted_cdf")
+    value = histogram.value_at_percentile(percentile)
+    assert abs(value - expected) <= expected * 2**-5 + 1
+
+
+def test_bounded_memory():
+    histogram = LatencyHistogram()
+    for duration in range(0, 10**9, 997):
+        histogram.record(duration)
+    assert histogram.count == len(range(0, 10**9, 997))
+    assert len(histogram.counts) < 1000
+
+
+def test_merge():
+    histogram, other = LatencyHistogram(), LatencyHistogram()
+    histogram.record(10)
+    other.record(10, count=2)
+    other.record(1000)
+    histogram.merge(other)
+    assert histogram.count == 4
+    assert histogram.value_at_percentile(75) == 10
+
+
+def test_merge_different_precision():
+    with pytest.raises(ValueError):
+        LatencyHistogram().merge(LatencyHistogram(significant_bits=3))
+
+
+def test_empty():
+    assert LatencyHistogram().value_at_percentile(50) == 0.0
@@ -0,0 +1,61 @@
+from extra_ds_tools.decorators.func_decorators import timeit_arg_info_dec
+from extra_ds_tools.decorators.stats import (
+    StatsRegistry,
+    default_registry,
+    print_stats,
+    reset_stats,
+    snapshot_stats,
+)
+
+
+def test_snapshot():
+    registry = StatsRegistry()
+    for duration_ns in (1_000, 2_000, 3_000, 1_000_000):
+        registry.get("module.func").record(duration_ns)
+    registry.get("module.unused")
+    snapshot = registry.snapshot()
+    assert list(snapshot) == ["module.func"]
+    summary = snapshot["module.func"]
+    assert summary["calls"] == 4
+    assert summary["total_s"] == 0.001006
+    assert summary["max_s"] == 0.001
+    assert summary["p50_s"] < summary["p99_s"] <= summary["max_s"]
+
+
+def test_peek():
+    registry = StatsRegistry()
+    registry.get("module.func").record(1_000)
+    registry.get("module.failing").record_error()
+    registry.get("module.unused")
+    peeks = {peek["function"]: peek for peek in registry.peek()}
+    assert sorted(peeks) == ["module.failing", "module.func"]
+    assert peeks["module.failing"]["errors"] == 1
+
+
+def test_reset_keeps_stats_objects():
+    registry = StatsRegistry()
+    stats = registry.get("module.func")
+    stats.record(1_000)
+    registry.reset()
+    assert registry.snapshot() == {}
+    stats.record(1_000)
+    assert registry.snapshot()["module.func"]["calls"] == 1
+
+
+def test_decorated_calls_are_collected(capfd):
+    @timeit_arg_info_dec(param_info=False, print_output=False)
+    def add(a, b):
+        return a + b
+
+    reset_stats()
+    for _ in range(5):
+        add(1, 2)
+    name = f"{add.__module__}.{add.__qualname__}"
+    assert snapshot_stats()[name]["calls"] == 5
+    assert default_registry.get(name).histogram.count == 5
+
+    capfd.readouterr()
+    print_stats()
+    out, _ = capfd.readouterr()
+    assert name in out
+    assert "p99_s" in out
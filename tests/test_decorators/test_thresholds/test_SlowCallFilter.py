@@ -0,0 +1,64 @@
+import pytest
+from extra_ds_tools.decorators.stats import FunctionStats
+from extra_ds_tools.decorators.thresholds import (
+    ADAPTIVE_MIN_CALLS,
+    SlowCallFilter,
+)
+
+
+def test_fixed_threshold():
+    slow_filter = SlowCallFilter(FunctionStats("module.func"), threshold=0.5)
+    assert not slow_filter.should_report(100_000_000)
+    assert slow_filter.should_report(600_000_000)
+
+
+def test_no_threshold_reports_every_call():
+    slow_filter = SlowCallFilter(FunctionStats("module.func"))
+    assert slow_filter.should_report(0)
+
+
+def test_adaptive_threshold():
+    stats = FunctionStats("module.func")
+    slow_filter = SlowCallFilter(stats, threshold="p99")
+    for duration_ns in range(1, ADAPTIVE_MIN_CALLS):
+        assert not slow_filter.should_report(10**9)
+        stats.record(duration_ns * 1_000)
+    stats.record(ADAPTIVE_MIN_CALLS * 1_000)
+    assert not slow_filter.should_report(90_000)
+    assert slow_filter.should_report(200_000)
+
+
+def test_rate_limit(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(
+        "extra_ds_tools.decorators.thresholds.monotonic", lambda: now[0]
+    )
+    slow_filter = SlowCallFilter(
+        FunctionStats("module.func"), max_reports_per_second=2
+    )
+    # a burst of 2 reports is allowed
+    assert [slow_filter.should_report(1) for _ in range(4)] == [
+        True,
+        True,
+        False,
+        False,
+    ]
+    assert slow_filter.take_suppressed() == 2
+    assert slow_filter.take_suppressed() == 0
+    now[0] = 0.5
+    assert [slow_filter.should_report(1) for _ in range(2)] == [True, False]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"threshold": -1},
+        {"threshold": "99"},
+        {"threshold": "p100"},
+        {"threshold": "pxx"},
+        {"max_reports_per_second": 0},
+    ],
+)
+def test_invalid_options(kwargs):
+    with pytest.raises(ValueError):
+        SlowCallFilter(FunctionStats("module.func"), **kwargs)
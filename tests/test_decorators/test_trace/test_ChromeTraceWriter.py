@@ -0,0 +1,102 @@
+import json
+import os
+import pickle
+import threading
+from time import perf_counter_ns
+
+import pytest
+from extra_ds_tools.decorators.trace import (
+    ChromeTraceWriter,
+    merge_chrome_traces,
+)
+
+
+def read_events(path):
+    with open(path) as file:
+        text = file.read()
+    assert text.startswith("[\n")
+    # the viewers allow a missing closing bracket, json doesn't
+    return json.loads(text.rstrip().rstrip(",") + "]")
+
+
+def test_writes_in_batches(tmp_path):
+    path = tmp_path / "trace.json"
+    writer = ChromeTraceWriter(str(path), batch_size=3)
+    start = perf_counter_ns()
+    writer.add_call("first", "module", start, 2_000, {"a": 1})
+    assert not path.exists()
+    writer.add_call("second", "module", start + 5_000, 1_000)
+    # the thread name is an event of the first batch
+    events = read_events(path)
+    assert [event["ph"] for event in events] == ["M", "X", "X"]
+    assert events[0]["args"] == {"name": threading.current_thread().name}
+    first, second = events[1:]
+    assert first["name"] == "first"
+    assert first["dur"] == 2.0
+    assert first["args"] == {"a": 1}
+    # timestamps since the epoch in microseconds have about 0.25us precision
+    assert second["ts"] - first["ts"] == pytest.approx(5, abs=0.5)
+    assert first["pid"] == os.getpid()
+    assert first["tid"] == threading.get_ident()
+    writer.add_call("third", "module", start, 1_000)
+    writer.flush()
+    assert len(read_events(path)) == 4
+
+
+def test_threads_are_named(tmp_path):
+    path = tmp_path / "trace.json"
+    writer = ChromeTraceWriter(str(path))
+
+    def call():
+        writer.add_call("call", "module", perf_counter_ns(), 1_000)
+
+    thread = threading.Thread(target=call, name="worker")
+    thread.start()
+    thread.join()
+    call()
+    writer.flush()
+    names = {
+        event["args"]["name"]
+        for event in read_events(path)
+        if event["ph"] == "M"
+    }
+    assert names == {"worker", threading.current_thread().name}
+
+
+def test_path_per_process(tmp_path):
+    writer = ChromeTraceWriter(str(tmp_path / "trace_{pid}.json"))
+    assert writer.path == str(tmp_path / f"trace_{os.getpid()}.json")
+
+
+def test_merge_chrome_traces(tmp_path):
+    paths = []
+    for i in range(2):
+        path = str(tmp_path / f"trace_{i}.json")
+        writer = ChromeTraceWriter(path)
+        writer.add_call(f"call_{i}", "module", perf_counter_ns(), 1_000)
+        writer.flush()
+        paths.append(path)
+    output_path = tmp_path / "merged.json"
+    merge_chrome_traces(paths, str(output_path))
+    events = json.loads(output_path.read_text())
+    assert [event["name"] for event in events if event["ph"] == "X"] == [
+        "call_0",
+        "call_1",
+    ]
+
+
+def test_pickle(tmp_path):
+    path = tmp_path / "trace.json"
+    writer = ChromeTraceWriter(str(path), batch_size=5)
+    writer.add_call("first", "module", perf_counter_ns(), 1_000)
+    unpickled = pickle.loads(pickle.dumps(writer))
+    assert unpickled.path == writer.path
+    assert unpickled.batch_size == 5
+    # buffered events stay with the original writer
+    unpickled.flush()
+    assert not path.exists()
+    writer.flush()
+    assert [event["name"] for event in read_events(path)] == [
+        "thread_name",
+        "first",
+    ]
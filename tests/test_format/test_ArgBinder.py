@@ -0,0 +1,66 @@
+from inspect import getfullargspec, signature
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+from extra_ds_tools.format import ArgBinder, arg_info
+
+
+def func1(text1: str, text2: str, n: int = 1):
+    return
+
+
+def func2(text: str, *args, either: bool = True, **kwargs):
+    return
+
+
+def func3(lst: Optional[List[int]] = None, df: pd.DataFrame = ""):
+    return
+
+
+@pytest.mark.parametrize(
+    "func, args, kwargs",
+    [
+        (func1, ("arrow", "knee"), {"p": 2}),
+        (func1, ("arrow",), {"text2": "knee", "n": 3}),
+        (func2, ("perfect", 2, ["combine", "with", "decorator"]), {}),
+        (func2, ("perfect",), {"either": False, "Even": "this works!"}),
+        (func3, (list(range(100)),), {"df": pd.DataFrame([1])}),
+        (func3, (np.arange(10),), {}),
+        (func3, (), {}),
+    ],
+)
+def test_same_output_as_arg_info(func, args, kwargs):
+    sign = signature(func)
+    fullargspec = getfullargspec(func)
+    expected = [
+        arg_info(index, arg, sign, fullargspec)
+        for index, arg in enumerate(args)
+    ] + [arg_info(key, arg, sign, fullargspec) for key, arg in kwargs.items()]
+    assert ArgBinder(func)(*args, **kwargs) == expected
+
+
+def test_slots():
+    binder = ArgBinder(func2)
+    assert binder.positional == ("text",)
+    assert binder.varargs == "args"
+    assert binder.varkw == "kwargs"
+    assert binder.params["either"] == ("bool", True)
+
+
+def test_error_for_same_parameter_values():
+    with pytest.raises(TypeError):
+        ArgBinder(func1)("to param text1", text1="going to same parameter")
+
+
+def test_skip_self():
+    class Model:
+        def fit(self, X, y=None):
+            return self
+
+        def __repr__(self):
+            raise AssertionError("the instance is rendered")
+
+    records = ArgBinder(Model.fit, skip_self=True)(Model(), [1, 2], y=3)
+    assert [record["param"] for record in records] == ["X", "y"]
@@ -76,3 +76,16 @@ def test_output(func, key, arg, expected):
     fullargspec = getfullargspec(func)
     output = arg_info(key=key, arg=arg, sign=sign, fullargspec=fullargspec)
     assert output == expected
+
+
+def test_memory_info():
+    sign = signature(func1)
+    fullargspec = getfullargspec(func1)
+    output = arg_info(
+        key="n",
+        arg=np.zeros(10),
+        sign=sign,
+        fullargspec=fullargspec,
+        memory_info=True,
+    )
+    assert output["arg_bytes"] == 80
@@ -1,3 +1,4 @@
+import inspect
 from typing import List, Union
 
 import numpy as np
@@ -20,3 +21,23 @@ from extra_ds_tools.format import class_as_str_repr
 )
 def test_types(arg, type_):
     assert class_as_str_repr(arg) == type_, f"{arg}, {type_}"
+
+
+@pytest.mark.parametrize(
+    "arg, type_",
+    [
+        (inspect._empty, ""),
+        (None, "None"),
+        (int, "int"),
+        (pd.DataFrame, "pandas.core.frame.DataFrame"),
+    ],
+)
+def test_special_values(arg, type_):
+    assert class_as_str_repr(arg) == type_
+
+
+def test_cached_output_is_stable():
+    hint = Union[List[int], str]
+    for _ in range(3):
+        assert class_as_str_repr(np.arange(10)) == "numpy.ndarray"
+        assert class_as_str_repr(hint) == "Union[List[int], str]"
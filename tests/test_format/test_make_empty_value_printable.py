@@ -1,5 +1,7 @@
 import inspect
 
+import numpy as np
+import pandas as pd
 import pytest
 from extra_ds_tools.format import make_empty_value_printable
 
@@ -17,3 +19,8 @@ from extra_ds_tools.format import make_empty_value_printable
 )
 def test_diff_inputs(input, expected):
     assert make_empty_value_printable(input) == expected
+
+
+@pytest.mark.parametrize("input", [np.arange(3), pd.DataFrame([[1, 2]])])
+def test_no_elementwise_comparison(input):
+    assert make_empty_value_printable(input) is input
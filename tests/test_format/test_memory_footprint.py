@@ -0,0 +1,31 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from extra_ds_tools.format import memory_footprint
+
+
+@pytest.mark.parametrize(
+    "arg, expected",
+    [
+        (np.zeros(1000), 8000),
+        (np.zeros((10, 10), dtype=np.int32), 400),
+        ([1, 2], sys.getsizeof([1, 2])),
+        ("text", sys.getsizeof("text")),
+    ],
+)
+def test_footprint(arg, expected):
+    assert memory_footprint(arg) == expected
+
+
+def test_series_includes_index():
+    series = pd.Series([1, 2], dtype="int64")
+    assert memory_footprint(series) == series.memory_usage(deep=True)
+    assert memory_footprint(series) > series.nbytes
+
+
+def test_dataframe_is_deep():
+    df = pd.DataFrame({"a": ["x" * 1000, "y" * 1000]})
+    assert memory_footprint(df) > 2000
+    assert memory_footprint(df) == df.memory_usage(deep=True).sum()
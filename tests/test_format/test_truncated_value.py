@@ -1,6 +1,8 @@
 import inspect
+from collections import OrderedDict, deque, namedtuple
 
 import hypothesis.strategies as st
+import numpy as np
 import pytest
 from extra_ds_tools.format import truncated_value
 from hypothesis import HealthCheck, assume, given, settings
@@ -50,3 +52,114 @@ def test_long_arguments(arg, str_limit):
 def test_negative_str_limit(str_limit):
     with pytest.raises(ValueError):
         truncated_value("", str_limit=str_limit)
+
+
+@pytest.mark.parametrize(
+    "arg",
+    [
+        ["it's" * 20, {"key": ('"' * 30 + "'",)}],
+        {"a": "b'" * 30, 1: [1, 2, {"x": set(range(5))}]},
+        frozenset(range(8)),
+        (list(range(40)),),
+    ],
+)
+@pytest.mark.parametrize("str_limit", [2, 5, 20, 33])
+def test_same_as_full_str_repr(arg, str_limit):
+    str_repr = str(arg)
+    expected = (
+        f"{str_repr[:int(str_limit / 2)]} .. "
+        f"{str_repr[-int(str_limit / 2):]}"
+    )
+    assert truncated_value(arg, str_limit=str_limit) == expected
+
+
+def test_recursive_container():
+    lst = [1]
+    lst.append(lst)
+    assert truncated_value(lst) == str(lst)
+
+
+class CountRepr:
+    n_reprs = 0
+
+    def __repr__(self):
+        CountRepr.n_reprs += 1
+        return "x"
+
+
+def test_only_edges_are_represented():
+    CountRepr.n_reprs = 0
+    truncated_value([CountRepr() for _ in range(10_000)])
+    assert CountRepr.n_reprs < 50
+
+
+def test_huge_list_is_fast():
+    CountRepr.n_reprs = 0
+    output = truncated_value([CountRepr()] * 10_000_000)
+    assert CountRepr.n_reprs < 50
+    assert output == "[x, x, x,  .. , x, x, x]"
+    assert truncated_value([0] * 10_000_000) == "[0, 0, 0,  .. , 0, 0, 0]"
+
+
+class CountIter(set):
+    n_items = 0
+
+    def __iter__(self):
+        for item in super().__iter__():
+            CountIter.n_items += 1
+            yield item
+
+
+def test_huge_set_is_elided():
+    CountIter.n_items = 0
+    output = truncated_value(CountIter(range(1_000_000)))
+    assert CountIter.n_items < 50
+    assert output == "CountIter( ..  20, ...})"
+    assert truncated_value(set(range(10_000_000))) == (
+        "{0, 1, 2,  .. , 20, ...}"
+    )
+    assert truncated_value(frozenset(range(100)), str_limit=8) == (
+        "froz .. ..})"
+    )
+    assert truncated_value({1, 2, 3}) == "{1, 2, 3}"
+
+
+Point = namedtuple("Point", "x y")
+
+
+class Text(str):
+    pass
+
+
+@pytest.mark.parametrize(
+    "arg",
+    [
+        deque(range(100), maxlen=200),
+        OrderedDict((i, str(i)) for i in range(50)),
+        Point(list(range(40)), "y" * 40),
+        Text("ab" * 50),
+        type("Items", (list,), {})(range(60)),
+        type("Mapping", (dict,), {})({i: i for i in range(40)}),
+    ],
+)
+@pytest.mark.parametrize("str_limit", [5, 20, 33])
+def test_subclasses_same_as_full_str_repr(arg, str_limit):
+    test_same_as_full_str_repr(arg, str_limit)
+
+
+@pytest.mark.parametrize(
+    "container", [deque, lambda items: Point(items, None)]
+)
+def test_only_edges_of_subclasses_are_represented(container):
+    CountRepr.n_reprs = 0
+    truncated_value(container([CountRepr() for _ in range(10_000)]))
+    assert CountRepr.n_reprs < 50
+
+
+def test_few_edge_items_per_axis():
+    assert truncated_value(np.arange(500), str_limit=33) == (
+        "[  0   1   2 ... 497 498 499]"
+    )
+    assert truncated_value(np.arange(500), str_limit=5) == "[  .. 9]"
+    output = truncated_value(np.zeros((12,) * 5), str_limit=100)
+    assert output.count("0.") < 100